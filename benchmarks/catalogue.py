@@ -0,0 +1,83 @@
+"""Whole-vault filter, sort and group-by: per-note objects vs the catalogue.
+
+    python benchmarks/catalogue.py --vault PATH [--repeat 5]
+
+Loads (or refreshes) the vault index once, then times the same three
+operations over a list of metadata-only `Note` objects and over the
+columnar `Catalogue`: a type + tag filter, that filter sorted by title, and
+a count of every tag. Catalogue build time is reported separately.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable
+
+from obsidian_journal import query
+from obsidian_journal.catalogue import Catalogue, mask_and
+from obsidian_journal.config import Config
+from obsidian_journal.index import VaultIndex
+
+
+def best_of(repeat: int, fn: Callable[[], Any]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vault", type=Path, required=True)
+    parser.add_argument("--type", default="meeting")
+    parser.add_argument("--tag", default="journal/*")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    config = Config(vault_path=args.vault, anthropic_api_key="unused")
+    index = VaultIndex.load(config)
+    notes = [e.to_note() for e in index.entries]
+
+    def objects_filter() -> list:
+        return [
+            n
+            for n in notes
+            if query.value_matches(args.type, n.frontmatter.type)
+            and any(query.value_matches(args.tag, t) for t in n.frontmatter.tags)
+        ]
+
+    start = time.perf_counter()
+    catalogue = Catalogue(index)
+    build = time.perf_counter() - start
+
+    def catalogue_filter() -> list[int]:
+        mask = mask_and(catalogue.n, catalogue.type_mask(args.type), catalogue.tag_mask([args.tag]))
+        return catalogue.positions(mask)
+
+    cases = [
+        ("filter", objects_filter, catalogue_filter),
+        (
+            "filter + sort by title",
+            lambda: sorted(objects_filter(), key=lambda n: n.title),
+            lambda: catalogue.argsort("title", catalogue_filter()),
+        ),
+        (
+            "count by tag",
+            lambda: Counter(t for n in notes for t in n.frontmatter.tags),
+            lambda: catalogue.count_by("tag"),
+        ),
+    ]
+    print(f"notes: {catalogue.n}   catalogue build: {build * 1000:.1f} ms")
+    for name, objects, columns in cases:
+        before = best_of(args.repeat, objects)
+        after = best_of(args.repeat, columns)
+        print(f"{name:24} objects {before * 1000:8.2f} ms   catalogue {after * 1000:8.2f} ms   x{before / after:.1f}")
+
+
+if __name__ == "__main__":
+    main()
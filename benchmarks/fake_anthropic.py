@@ -0,0 +1,258 @@
+"""A local stand-in for the Anthropic Messages API, for benchmarks.
+
+    python benchmarks/fake_anthropic.py --port 8765 --latency 0.5 [--rate-limit-every 5]
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8765 oj journal --quick "..."
+
+The anthropic SDK reads ANTHROPIC_BASE_URL, so every call site in the
+package talks to it unchanged. `POST /v1/messages` answers with canned text
+shaped for the caller (a title for small `max_tokens`, a follow-up question
+for conversation turns, `[]` for the deep-link prompt, a markdown body
+otherwise), after:
+
+- `latency` seconds before the first token, plus `token_latency` per output
+  token (streamed as they are "generated" when the request sets `stream`);
+- a 429 `rate_limit_error` on every `rate_limit_every`-th request, with a
+  `retry-after-ms` header so the SDK's own retry path is exercised.
+
+Token counts are estimated at four characters per token. `GET /stats`
+returns the counters; `FakeAnthropic.stats()` does the same in-process.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+BODY_WORDS = (
+    "Today I focused on the roadmap and the hiring plan. The design review went "
+    "well, but the data pipeline is still blocked on a missing schema."
+).split()
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+@dataclass
+class Stats:
+    requests: int = 0
+    rate_limited: int = 0
+    streamed: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+def _request_text(payload: dict[str, Any]) -> str:
+    system = payload.get("system") or ""
+    if isinstance(system, list):
+        system = "".join(block.get("text", "") for block in system)
+    parts = [system]
+    for message in payload.get("messages", []):
+        content = message.get("content", "")
+        if isinstance(content, list):
+            content = "".join(block.get("text", "") for block in content)
+        parts.append(content)
+    return "\n".join(parts)
+
+
+def reply_for(payload: dict[str, Any], body_tokens: int) -> str:
+    system = str(payload.get("system") or "")
+    max_tokens = int(payload.get("max_tokens", 1024))
+    if "JSON array" in system:
+        return "[]"
+    if "ONLY the folder name" in system:
+        return "NONE"
+    if max_tokens <= 60:
+        return "Fake Benchmark Title"
+    if max_tokens <= 300:
+        return "What felt most important about that, and what would you do differently?"
+    words = [BODY_WORDS[i % len(BODY_WORDS)] for i in range(min(body_tokens, max_tokens))]
+    return "## Summary\n\n" + " ".join(words) + "\n\n## Takeaways\n\n- Keep going\n- Unblock the pipeline"
+
+
+class FakeAnthropic:
+    """The fake server, run on a background thread. Use as a context manager."""
+
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        token_latency: float = 0.0,
+        rate_limit_every: int = 0,
+        retry_after: float = 0.05,
+        body_tokens: int = 400,
+    ) -> None:
+        self.latency = latency
+        self.token_latency = token_latency
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.body_tokens = body_tokens
+        self._stats = Stats()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _handler(self))
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> FakeAnthropic:
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> FakeAnthropic:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return asdict(self._stats)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats = Stats()
+
+    def _admit(self, input_tokens: int, stream: bool) -> bool:
+        """Count a request; False if it should be rate limited."""
+        with self._lock:
+            self._stats.requests += 1
+            if self.rate_limit_every and self._stats.requests % self.rate_limit_every == 0:
+                self._stats.rate_limited += 1
+                return False
+            self._stats.input_tokens += input_tokens
+            self._stats.streamed += stream
+            return True
+
+    def _produced(self, output_tokens: int) -> None:
+        with self._lock:
+            self._stats.output_tokens += output_tokens
+
+
+def _handler(fake: FakeAnthropic) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+        def _send_json(self, status: int, body: dict[str, Any], headers: dict[str, str] | None = None) -> None:
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("content-type", "application/json")
+            self.send_header("content-length", str(len(data)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self) -> None:
+            if self.path.rstrip("/") == "/stats":
+                self._send_json(200, fake.stats())
+            else:
+                self._send_json(404, {"type": "error", "error": {"type": "not_found_error", "message": self.path}})
+
+        def do_POST(self) -> None:
+            payload = json.loads(self.rfile.read(int(self.headers.get("content-length", 0))) or b"{}")
+            if self.path.split("?")[0].rstrip("/") != "/v1/messages":
+                self._send_json(404, {"type": "error", "error": {"type": "not_found_error", "message": self.path}})
+                return
+            input_tokens = estimate_tokens(_request_text(payload))
+            stream = bool(payload.get("stream"))
+            if not fake._admit(input_tokens, stream):
+                self._send_json(
+                    429,
+                    {"type": "error", "error": {"type": "rate_limit_error", "message": "Injected rate limit"}},
+                    {"retry-after-ms": str(int(fake.retry_after * 1000))},
+                )
+                return
+
+            text = reply_for(payload, fake.body_tokens)
+            output_tokens = estimate_tokens(text)
+            time.sleep(fake.latency)
+            message = {
+                "id": f"msg_fake_{time.monotonic_ns()}",
+                "type": "message",
+                "role": "assistant",
+                "model": payload.get("model", "fake"),
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {"input_tokens": input_tokens, "output_tokens": output_tokens},
+            }
+            if stream:
+                self._stream(message, text)
+            else:
+                time.sleep(fake.token_latency * output_tokens)
+                self._send_json(200, message)
+            fake._produced(output_tokens)
+
+        def _stream(self, message: dict[str, Any], text: str) -> None:
+            self.send_response(200)
+            self.send_header("content-type", "text/event-stream")
+            self.send_header("cache-control", "no-cache")
+            self.send_header("connection", "close")
+            self.end_headers()
+
+            def event(name: str, data: dict[str, Any]) -> None:
+                self.wfile.write(f"event: {name}\ndata: {json.dumps(data)}\n\n".encode())
+                self.wfile.flush()
+
+            usage = message["usage"]
+            event("message_start", {"type": "message_start", "message": {**message, "content": [], "usage": {**usage, "output_tokens": 0}}})
+            event("content_block_start", {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}})
+            # ~4 characters per token, one token per delta.
+            for i in range(0, len(text), 4):
+                time.sleep(fake.token_latency)
+                event("content_block_delta", {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": text[i : i + 4]}})
+            event("content_block_stop", {"type": "content_block_stop", "index": 0})
+            event("message_delta", {"type": "message_delta", "delta": {"stop_reason": "end_turn", "stop_sequence": None}, "usage": {"output_tokens": usage["output_tokens"]}})
+            event("message_stop", {"type": "message_stop"})
+            self.close_connection = True
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before the first token")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="Seconds per output token")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="429 every Nth request (0: never)")
+    parser.add_argument("--retry-after", type=float, default=0.05, help="retry-after sent with a 429, seconds")
+    parser.add_argument("--body-tokens", type=int, default=400, help="Words in a synthesized note body")
+    args = parser.parse_args()
+    fake = FakeAnthropic(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        token_latency=args.token_latency,
+        rate_limit_every=args.rate_limit_every,
+        retry_after=args.retry_after,
+        body_tokens=args.body_tokens,
+    )
+    print(f"listening on {fake.url} (set ANTHROPIC_BASE_URL)", flush=True)
+    try:
+        fake._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""Write a deterministic synthetic Obsidian vault for benchmarks.
+
+    python benchmarks/generate_vault.py OUT_DIR --notes 10000 [--seed 0]
+
+The same `--notes` and `--seed` always produce byte-identical files. The
+mix roughly follows a real journal vault:
+
+- Journal (40%), Daily Notes (25%, one per consecutive day, `YYYY-MM-DD.md`),
+  Meetings (20%) and nested Projects/<name>/ folders (15%);
+- most notes have complete YAML frontmatter (date, type, tags including
+  nested `journal/*` tags, sometimes related links and extra keys); ~10%
+  are missing fields and ~10% have none, with an inline `Tags: #a #b`
+  line instead — the cases `organize frontmatter` fixes;
+- bodies of 50-400 words with a few existing [[wikilinks]] and a few
+  plain-text mentions of other titles — what `organize links` looks for;
+- about 1% extra notes under skip dirs (.obsidian, .trash, Templates,
+  .smtcmp_*) that every vault walk must ignore;
+- the daily note for PLAN_DATE has a `## Plan` section, so
+  `write_daily_plan` exercises the replace path.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import shutil
+from datetime import date, timedelta
+from pathlib import Path
+
+PLAN_DATE = "2026-01-15"
+
+WORDS = (
+    "the a of to and in for on with about team plan project review notes idea "
+    "progress blocked shipped design meeting follow-up roadmap hiring career "
+    "reading podcast health family weekend focus energy sleep write draft "
+    "feedback goal quarter metric launch bug fix deploy data pipeline model "
+    "customer interview budget travel garden book learned tomorrow yesterday"
+).split()
+TOPICS = (
+    "Team sync", "Project retro", "Morning thoughts", "Weekly review", "Career goals",
+    "Reading notes", "Podcast notes", "Design review", "Hiring loop", "Roadmap planning",
+    "Garden log", "Travel ideas", "Health check", "Book club", "Launch prep",
+)
+TAGS = (
+    "work", "daily", "career", "health", "family", "reading", "ideas", "meeting",
+    "journal/daily", "journal/weekly", "journal/monthly", "project/alpha", "project/beta",
+)
+TYPES = ("end-of-day", "free-form", "meeting", "end-of-project", "reading", "podcast")
+PROJECTS = ("Alpha", "Beta", "Gamma", "Delta")
+SKIP_DIRS = (".obsidian", ".trash", "Templates", ".smtcmp_cache")
+
+
+def _words(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def _plan_notes(rng: random.Random, n: int) -> list[tuple[str, str, str]]:
+    """(folder, title, date) for every note, titles unique across the vault."""
+    # One daily note per day, ending shortly after PLAN_DATE; the other notes
+    # are spread over the same span.
+    days = max(n // 4, 60)
+    start = date.fromisoformat(PLAN_DATE) + timedelta(days=30 - days)
+    out = [
+        ("Daily Notes", d, d)
+        for d in ((start + timedelta(days=i)).isoformat() for i in range(min(days, n)))
+    ]
+    seen = {t for _, t, _ in out}
+    while len(out) < n:
+        roll = rng.random()
+        if roll < 0.40 / 0.75:
+            folder = "Journal"
+        elif roll < 0.60 / 0.75:
+            folder = "Meetings"
+        else:
+            folder = f"Projects/{rng.choice(PROJECTS)}"
+        day = (start + timedelta(days=rng.randrange(days))).isoformat()
+        base = title = f"{day} {rng.choice(TOPICS)}"
+        k = 2
+        while title in seen:
+            title = f"{base} {k}"
+            k += 1
+        seen.add(title)
+        out.append((folder, title, day))
+    return out
+
+
+def _frontmatter(rng: random.Random, folder: str, day: str, titles: list[str]) -> str:
+    note_type = "daily-note" if folder == "Daily Notes" else rng.choice(TYPES)
+    tags = rng.sample(TAGS, rng.randint(1, 4))
+    lines = ["---"]
+    if rng.random() < 0.11:
+        # Incomplete: the kind of note `organize frontmatter` fills in.
+        if rng.random() < 0.5:
+            lines.append(f"date: '{day}'")
+        lines.append("tags:")
+        lines.extend(f"  - {t}" for t in tags)
+    else:
+        lines.append(f"date: '{day}'")
+        lines.append(f"type: {note_type}")
+        lines.append("tags:")
+        lines.extend(f"  - {t}" for t in tags)
+        if rng.random() < 0.3:
+            lines.append("related:")
+            lines.extend(f"  - '[[{t}]]'" for t in rng.sample(titles, 2))
+        if rng.random() < 0.2:
+            lines.append(f"mood: {rng.randint(1, 5)}")
+    lines.append("---")
+    return "\n".join(lines) + "\n"
+
+
+def _body(rng: random.Random, titles: list[str], inline_tags: bool) -> str:
+    paragraphs = []
+    for _ in range(rng.randint(2, 6)):
+        sentence = _words(rng, rng.randint(25, 65))
+        roll = rng.random()
+        if roll < 0.3:
+            sentence += f" see [[{rng.choice(titles)}]]."
+        elif roll < 0.45:
+            # Unlinked mention: a wikilink suggestion.
+            sentence += f" as discussed in {rng.choice(titles)}."
+        paragraphs.append(sentence[0].upper() + sentence[1:])
+    if inline_tags:
+        tags = " ".join(f"#{t}" for t in rng.sample(TAGS, 2))
+        paragraphs.insert(0, f"Tags: {tags}")
+    return "\n\n".join(paragraphs) + "\n"
+
+
+def generate(out: Path, notes: int, seed: int = 0) -> int:
+    """Write the vault to `out` (replacing it). Returns the files written."""
+    rng = random.Random(seed)
+    if out.exists():
+        shutil.rmtree(out)
+    plan = _plan_notes(rng, notes)
+    titles = [t for _, t, _ in plan]
+    written = 0
+    for folder, title, day in plan:
+        path = out / folder / f"{title}.md"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        roll = rng.random()
+        if title == PLAN_DATE:
+            text = (
+                f"---\ndate: '{day}'\ntype: daily-note\ntags:\n  - daily\n---\n"
+                "## Plan\n- [ ] old task\n\n## Notes\n" + _body(rng, titles, False)
+            )
+        elif roll < 0.9:
+            text = _frontmatter(rng, folder, day, titles) + _body(rng, titles, False)
+        else:
+            text = _body(rng, titles, True)
+        path.write_text(text, encoding="utf-8")
+        written += 1
+
+    for i in range(max(1, notes // 100)):
+        skip = out / SKIP_DIRS[i % len(SKIP_DIRS)]
+        skip.mkdir(exist_ok=True)
+        (skip / f"Skipped {i}.md").write_text(
+            f"---\ndate: '{PLAN_DATE}'\ntags:\n  - skipped\n---\n{_words(rng, 40)}\n",
+            encoding="utf-8",
+        )
+        written += 1
+    (out / ".obsidian" / "workspace.json").write_text("{}\n", encoding="utf-8")
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("out", type=Path)
+    parser.add_argument("--notes", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    written = generate(args.out, args.notes, args.seed)
+    print(f"wrote {written} files to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""Drive every LLM call site through the fake Messages API; report per command.
+
+    python benchmarks/llm_calls.py [--latency 0.3] [--token-latency 0.002]
+        [--rate-limit-every 0] [--inbox-notes 10] [--captures 8] [--concurrency 1 4]
+        [--output llm.json]
+
+Starts fake_anthropic.FakeAnthropic on a free port, points the SDK at it
+with ANTHROPIC_BASE_URL, and runs, against a small synthetic vault:
+
+- journal: `run_conversation` (scripted answers) + `synthesize_note`;
+- plan: `run_plan_conversation` (scripted answers) + `synthesize_plan`;
+- spec: `synthesize_spec`;
+- organize links --deep: `scan_links(deep=True)`, one call per note;
+- organize structure --deep: `scan_structure(deep=True)`, one call per
+  root-level note. `--inbox-notes` such notes are added to the vault root
+  first, since the synthetic vault keeps every note in a folder;
+- worker -c N: `run_worker` over `--captures` queued captures, per
+  `--concurrency` value.
+
+Each command reports the API calls made (429s included), rate-limited
+calls, input and output tokens as the server counted them, and wall time.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from fake_anthropic import FakeAnthropic
+from generate_vault import PLAN_DATE, generate
+
+ANSWERS = (
+    "Shipped the pipeline fix, but the hiring loop ate the afternoon.",
+    "I want to protect mornings for deep work and push meetings after lunch.",
+    "Mostly energy — I slept badly and it showed in the design review.",
+    "done",
+)
+BRIEF = "A CLI that turns meeting transcripts into action items, linked to existing project notes."
+
+
+def _script(module: Any) -> None:
+    """Silence a capture module's console and feed it ANSWERS."""
+    answers = itertools.cycle(ANSWERS)
+    module.console.quiet = True
+    module.console.input = lambda *args, **kwargs: next(answers)
+
+
+def _inbox(config: Any, notes: int) -> None:
+    """Copy the first `notes` filed notes to the vault root, as unfiled captures."""
+    vault = config.vault_path
+    filed = sorted(
+        p for p in vault.glob("*/**/*.md") if not any(part.startswith(".") for part in p.relative_to(vault).parts)
+    )
+    for i, path in enumerate(filed[:notes], 1):
+        (config.vault_path / f"Inbox {i}.md").write_text(path.read_text(encoding="utf-8"), encoding="utf-8")
+
+
+def _commands(
+    config: Any, captures: int, concurrency: list[int], inbox: int
+) -> list[tuple[str, Callable[[], None]]]:
+    from obsidian_journal import vault
+    from obsidian_journal.journal import capture
+    from obsidian_journal.journal.queue import CaptureQueue
+    from obsidian_journal.journal.synthesize import synthesize_note
+    from obsidian_journal.journal.worker import run_worker
+    from obsidian_journal.models import ConversationMessage, ReflectionType
+    from obsidian_journal.organize.links import scan_links
+    from obsidian_journal.organize.structure import scan_structure
+    from obsidian_journal.plan import capture as plan_capture
+    from obsidian_journal.plan.synthesize import synthesize_plan
+    from obsidian_journal.spec.synthesize import synthesize_spec
+
+    _script(capture)
+    _script(plan_capture)
+    titles = vault.get_all_note_titles(config)
+
+    def journal() -> None:
+        messages = capture.run_conversation(config, ReflectionType.END_OF_DAY)
+        synthesize_note(config, messages, ReflectionType.END_OF_DAY, titles)
+
+    def plan() -> None:
+        messages = plan_capture.run_plan_conversation(config)
+        synthesize_plan(config, messages, None, PLAN_DATE)
+
+    def structure() -> None:
+        # After links --deep, so that scenario still sees the vault as generated.
+        _inbox(config, inbox)
+        scan_structure(config, deep=True)
+
+    def worker(n: int) -> Callable[[], None]:
+        def run() -> None:
+            queue = CaptureQueue(config.queue_dir)
+            for i in range(captures):
+                queue.enqueue(
+                    ReflectionType.FREE_FORM,
+                    [ConversationMessage(role="user", content=ANSWERS[i % len(ANSWERS)])],
+                )
+            run_worker(config, concurrency=n, retry_delay=0.05)
+
+        return run
+
+    return [
+        ("journal", journal),
+        ("plan", plan),
+        ("spec", lambda: synthesize_spec(config, BRIEF, existing_titles=titles)),
+        ("organize links --deep", lambda: scan_links(config, deep=True)),
+        ("organize structure --deep", structure),
+        *((f"worker -c {n}", worker(n)) for n in concurrency),
+    ]
+
+
+def _commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=Path(__file__).parent,
+        )
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.3, help="Seconds before the first token")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="Seconds per output token")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="429 every Nth request (0: never)")
+    parser.add_argument("--vault-notes", type=int, default=40, help="Synthetic vault size (deep organize calls once per note)")
+    parser.add_argument("--inbox-notes", type=int, default=10, help="Root-level notes for organize structure --deep")
+    parser.add_argument("--captures", type=int, default=8, help="Queued captures per worker run")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--output", type=Path, help="Also write the JSON report here")
+    args = parser.parse_args()
+
+    from obsidian_journal.config import Config
+
+    settings = {
+        "latency": args.latency,
+        "token_latency": args.token_latency,
+        "rate_limit_every": args.rate_limit_every,
+        "vault_notes": args.vault_notes,
+        "inbox_notes": args.inbox_notes,
+        "captures": args.captures,
+    }
+    results = []
+    with tempfile.TemporaryDirectory() as tmp, FakeAnthropic(
+        latency=args.latency,
+        token_latency=args.token_latency,
+        rate_limit_every=args.rate_limit_every,
+    ) as fake:
+        os.environ["ANTHROPIC_BASE_URL"] = fake.url
+        root = Path(tmp)
+        generate(root / "vault", args.vault_notes)
+        config = Config(
+            vault_path=root / "vault",
+            anthropic_api_key="fake-key",
+            cache_dir=root / "cache",
+            data_dir=root / "data",
+        )
+        for name, run in _commands(config, args.captures, args.concurrency, args.inbox_notes):
+            fake.reset()
+            start = time.perf_counter()
+            run()
+            wall = time.perf_counter() - start
+            stats = fake.stats()
+            result = {
+                "command": name,
+                "calls": stats["requests"],
+                "rate_limited": stats["rate_limited"],
+                "input_tokens": stats["input_tokens"],
+                "output_tokens": stats["output_tokens"],
+                "wall_seconds": round(wall, 3),
+            }
+            results.append(result)
+            print(json.dumps(result), file=sys.stderr)
+
+    report = {
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": settings,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Bytes per loaded note: slotted/interned models vs the old plain dataclasses.
+
+    python benchmarks/note_memory.py [--notes 100000]
+
+Each note is built from freshly allocated strings, the way a YAML parse
+produces them, so the numbers include what interning saves. "before" uses
+a copy of the pre-slots model layout; "after" goes through the real
+`Frontmatter.from_dict` loader.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from obsidian_journal.models import Frontmatter, Note
+
+TAGS = ["work", "daily", "career", "journal/weekly", "reading", "health", "family", "ideas"]
+TYPES = ["end-of-day", "meeting", "free-form", "reading", "podcast"]
+FOLDERS = ["Journal", "Meetings", "Daily Notes", "Projects/Work"]
+
+
+@dataclass
+class LegacyFrontmatter:
+    date: str = ""
+    type: str = ""
+    tags: list[str] = field(default_factory=list)
+    related: list[str] = field(default_factory=list)
+    extra: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class LegacyNote:
+    title: str
+    body: str
+    frontmatter: LegacyFrontmatter = field(default_factory=LegacyFrontmatter)
+    folder: str = ""
+    path: str = ""
+    modified_at: str = ""
+
+
+def _fresh(s: str) -> str:
+    """An equal string that is a new object, as a parser would return."""
+    return "".join(list(s))
+
+
+def _raw(i: int) -> tuple[dict[str, Any], str, str]:
+    meta = {
+        "date": _fresh(f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}"),
+        "type": _fresh(TYPES[i % len(TYPES)]),
+        "tags": [_fresh(TAGS[(i + k) % len(TAGS)]) for k in range(3)],
+    }
+    folder = _fresh(FOLDERS[i % len(FOLDERS)])
+    return meta, folder, f"{folder}/2026 note {i}.md"
+
+
+def build_legacy(i: int) -> LegacyNote:
+    meta, folder, path = _raw(i)
+    front = LegacyFrontmatter(
+        date=str(meta.pop("date")),
+        type=str(meta.pop("type")),
+        tags=meta.pop("tags"),
+        extra=meta,
+    )
+    return LegacyNote(title=f"2026 note {i}", body="", frontmatter=front, folder=folder, path=path)
+
+
+def build_compact(i: int) -> Note:
+    meta, folder, path = _raw(i)
+    return Note(
+        title=f"2026 note {i}",
+        body="",
+        frontmatter=Frontmatter.from_dict(meta),
+        folder=sys.intern(folder),
+        path=path,
+    )
+
+
+def bytes_per_note(build: Callable[[int], Any], n: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    notes = [build(i) for i in range(n)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del notes
+    return (after - before) / n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notes", type=int, default=100_000)
+    args = parser.parse_args()
+
+    # Warm the intern table so "after" measures steady-state per-note cost.
+    build_compact(0)
+    legacy = bytes_per_note(build_legacy, args.notes)
+    compact = bytes_per_note(build_compact, args.notes)
+    print(f"notes:  {args.notes}")
+    print(f"before: {legacy:8.1f} bytes/note  (plain dataclasses, list tags)")
+    print(f"after:  {compact:8.1f} bytes/note  (slots, interned strings, tuple tags)")
+    print(f"saved:  {1 - compact / legacy:8.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Time vault operations on synthetic vaults; print JSON for comparing commits.
+
+    python benchmarks/vault_ops.py --notes 1000 10000 [--ops list_notes,search_notes]
+        [--work-dir .bench] [--timeout 600] [--output results.json]
+
+Vaults are regenerated into `--work-dir` by generate_vault.py on every run;
+the generator is deterministic, so every commit is measured on the same
+files. Each operation runs in a fresh interpreter, which keeps its numbers
+independent of the others:
+
+- `wall_seconds`: the operation alone, after imports and config;
+- `peak_rss_kb`: the process's peak resident set (VmHWM), imports included;
+- `files_read`: files opened for reading inside the vault (an audit hook
+  on `open`), re-reads counted.
+
+`search_notes` runs against a warm vault index (built before timing);
+`write_daily_plan` rewrites the plan section of one daily note, so it runs
+last. An operation that takes longer than `--timeout` is reported with
+`"error": "timeout"` — `scan_links` is quadratic in the note count.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from generate_vault import PLAN_DATE, generate
+
+OPS = ("list_notes", "search_notes", "scan_links", "scan_frontmatter", "write_daily_plan")
+
+
+def _ops(config: Any) -> dict[str, Callable[[], int]]:
+    from obsidian_journal import vault
+    from obsidian_journal.organize.frontmatter import scan_frontmatter
+    from obsidian_journal.organize.links import scan_links
+
+    def write_daily_plan() -> int:
+        vault.write_daily_plan(config, PLAN_DATE, "## Plan\n- [ ] benchmark the vault\n")
+        return 1
+
+    return {
+        "list_notes": lambda: len(vault.list_notes(config)),
+        "search_notes": lambda: len(
+            vault.search_notes(config, tags=["work"], since="2025-01-01", limit=50)
+        ),
+        "scan_links": lambda: len(scan_links(config)),
+        "scan_frontmatter": lambda: len(scan_frontmatter(config)),
+        "write_daily_plan": write_daily_plan,
+    }
+
+
+def _config(vault_path: Path, cache_dir: Path) -> Any:
+    from obsidian_journal.config import Config
+
+    return Config(vault_path=vault_path, anthropic_api_key="unused", cache_dir=cache_dir)
+
+
+def _peak_rss_kb() -> int:
+    # ru_maxrss survives exec, so a child would report the parent's peak if
+    # it was larger; VmHWM starts over with the new image.
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_child(op: str, vault_path: Path, cache_dir: Path) -> dict[str, Any]:
+    """Runs inside the child process: one operation, measured."""
+    root = str(vault_path.resolve())
+    files_read = 0
+
+    def audit(event: str, args: tuple) -> None:
+        nonlocal files_read
+        if event != "open" or not isinstance(args[0], (str, Path)):
+            return
+        path, mode, flags = args
+        reading = "r" in mode if mode else not flags & (os.O_WRONLY | os.O_RDWR)
+        if reading and os.path.abspath(path).startswith(root):
+            files_read += 1
+
+    config = _config(vault_path, cache_dir)
+    fn = _ops(config)[op]
+    sys.addaudithook(audit)
+    start = time.perf_counter()
+    items = fn()
+    wall = time.perf_counter() - start
+    return {
+        "wall_seconds": round(wall, 4),
+        "peak_rss_kb": _peak_rss_kb(),
+        "files_read": files_read,
+        "items": items,
+    }
+
+
+def run_op(op: str, vault_path: Path, cache_dir: Path, timeout: float) -> dict[str, Any]:
+    cmd = [sys.executable, __file__, "--child", op, "--vault", str(vault_path), "--cache-dir", str(cache_dir)]
+    try:
+        out = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"error": "timeout", "timeout_seconds": timeout}
+    if out.returncode != 0:
+        return {"error": out.stderr.strip().splitlines()[-1] if out.stderr.strip() else "failed"}
+    return json.loads(out.stdout)
+
+
+def _commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=Path(__file__).parent,
+        )
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notes", type=int, nargs="+", default=[1000])
+    parser.add_argument("--ops", default=",".join(OPS), help="Comma-separated, from: " + ", ".join(OPS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--work-dir", type=Path, default=Path(".bench"))
+    parser.add_argument("--timeout", type=float, default=600)
+    parser.add_argument("--output", type=Path, help="Also write the JSON report here")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--vault", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--cache-dir", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child, args.vault, args.cache_dir)))
+        return
+
+    ops = [op.strip() for op in args.ops.split(",") if op.strip()]
+    unknown = [op for op in ops if op not in OPS]
+    if unknown:
+        parser.error(f"unknown op(s): {', '.join(unknown)}")
+    # Mutating ops last, whatever order they were asked for in.
+    ops.sort(key=lambda op: op == "write_daily_plan")
+
+    results = []
+    for n in args.notes:
+        vault_path = args.work_dir / f"vault-{n}-seed{args.seed}"
+        cache_dir = args.work_dir / f"cache-{n}-seed{args.seed}"
+        # Regenerate every run: write_daily_plan edits the vault.
+        generate(vault_path, n, args.seed)
+        if "search_notes" in ops:
+            from obsidian_journal.index import VaultIndex
+
+            VaultIndex.load(_config(vault_path, cache_dir))
+        for op in ops:
+            result = {"notes": n, "op": op, **run_op(op, vault_path, cache_dir, args.timeout)}
+            results.append(result)
+            print(json.dumps(result), file=sys.stderr)
+
+    report = {
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import json
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable
+
+from obsidian_journal import vault
+from obsidian_journal.config import Config
+from obsidian_journal.models import NOTE_FIELDS, Note
+from obsidian_journal.query import QuerySyntaxError
+
+
+class BatchError(Exception):
+    def __init__(self, message: str, code: int = 2) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+def _csv_list(value: Any) -> list[str] | None:
+    if not value:
+        return None
+    if isinstance(value, str):
+        return [t.strip() for t in value.split(",") if t.strip()]
+    return [str(t) for t in value]
+
+
+class BatchSession:
+    """Answers `oj batch` requests from a single, lazily loaded vault scan.
+
+    Requests use the CLI's option names, e.g.
+    `{"id": 1, "op": "query", "args": {"type": "meeting", "limit": 5}}`;
+    the response carries the same `id` plus the payload the equivalent
+    `oj --json <op>` would emit.
+    """
+
+    def __init__(self, config: Config) -> None:
+        self.config = config
+        self._notes: list[Note] | None = None
+        self._lock = threading.Lock()
+
+    def notes(self) -> list[Note]:
+        with self._lock:
+            if self._notes is None:
+                self._notes = vault.list_notes(self.config)
+            return self._notes
+
+    def handle_line(self, line: str) -> dict[str, Any]:
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            return {"id": None, "error": f"Invalid JSON: {e.msg}", "code": 2}
+        if not isinstance(request, dict):
+            return {"id": None, "error": "Request must be a JSON object", "code": 2}
+        return self.handle(request)
+
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        request_id = request.get("id")
+        op = request.get("op")
+        args = request.get("args") or {}
+        handler = self._ops.get(op)
+        try:
+            if handler is None:
+                raise BatchError(f"Unknown op: {op!r}")
+            if not isinstance(args, dict):
+                raise BatchError("args must be a JSON object")
+            payload = handler(self, args)
+        except BatchError as e:
+            return {"id": request_id, "error": str(e), "code": e.code}
+        except Exception as e:
+            return {"id": request_id, "error": f"{type(e).__name__}: {e}", "code": 1}
+        return {"id": request_id, **payload}
+
+    def _query(self, args: dict[str, Any]) -> dict[str, Any]:
+        fields = _csv_list(args.get("fields"))
+        unknown = [f for f in fields or () if f not in NOTE_FIELDS]
+        if unknown:
+            raise BatchError(f"Unknown field(s): {', '.join(unknown)}")
+        try:
+            return self._search(args, fields)
+        except QuerySyntaxError as e:
+            raise BatchError(str(e)) from None
+
+    def _search(self, args: dict[str, Any], fields: list[str] | None) -> dict[str, Any]:
+        notes = vault.search_notes(
+            self.config,
+            where=args.get("where"),
+            folder=args.get("folder"),
+            note_type=args.get("type"),
+            tags=_csv_list(args.get("tags")),
+            since=args.get("since"),
+            until=args.get("until"),
+            text=args.get("search"),
+            limit=args.get("limit"),
+            notes=self.notes(),
+        )
+        return {"count": len(notes), "items": [n.to_dict(fields) for n in notes]}
+
+    def _get(self, args: dict[str, Any]) -> dict[str, Any]:
+        title = args.get("title")
+        if not title:
+            raise BatchError("get requires args.title")
+        match = vault.find_note(self.notes(), title)
+        if match is None:
+            raise BatchError("Note not found")
+        return match.to_dict()
+
+    def _list(self, args: dict[str, Any]) -> dict[str, Any]:
+        folder = args.get("folder", "Journal")
+        limit = args.get("limit", 10)
+        in_folder = sorted(
+            (n for n in self.notes() if n.folder == folder),
+            key=lambda n: n.path,
+            reverse=True,
+        )[:limit]
+        return {
+            "folder": folder,
+            "count": len(in_folder),
+            "items": [n.to_summary_dict() for n in in_folder],
+        }
+
+    _ops: dict[str, Callable[[BatchSession, dict[str, Any]], dict[str, Any]]] = {
+        "query": _query,
+        "get": _get,
+        "list": _list,
+    }
+
+
+def run_batch(
+    config: Config,
+    lines: Iterable[str],
+    write: Callable[[dict[str, Any]], None],
+    *,
+    concurrency: int = 1,
+) -> int:
+    """Answer each NDJSON request line via `write`. Returns the error count.
+
+    With `concurrency` > 1 requests run on a thread pool and responses are
+    written as they finish — match them up by `id`.
+    """
+    session = BatchSession(config)
+    errors = 0
+
+    def emit(response: dict[str, Any]) -> None:
+        nonlocal errors
+        if "error" in response:
+            errors += 1
+        write(response)
+
+    requests = (line for line in lines if line.strip())
+    if concurrency <= 1:
+        for line in requests:
+            emit(session.handle_line(line))
+        return errors
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        in_flight: set = set()
+        for line in requests:
+            in_flight.add(pool.submit(session.handle_line, line))
+            # Bound read-ahead so a huge stdin doesn't queue unboundedly.
+            if len(in_flight) >= concurrency * 4:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    emit(future.result())
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                emit(future.result())
+    return errors
@@ -0,0 +1,251 @@
+"""Columnar view of the vault index, for whole-vault filters, sorts and counts.
+
+One row per note, in the index's (date, path) order. Categorical fields
+(type, folder, tag) are small integer ids into a per-column dictionary, and
+numeric fields live in `array` columns, so the hot loops run in C:
+
+- a filter produces a byte mask (one 0/1 byte per row) via `bytes.translate`
+  or a date bisect, and masks combine as a big-int AND;
+- a sort is an argsort over one column;
+- a group-by is a `Counter` over an id column (plus a word-count sum).
+
+Built on demand from a loaded `VaultIndex`; nothing extra is persisted.
+"""
+
+from __future__ import annotations
+
+import operator
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import compress
+from typing import TYPE_CHECKING, Sequence
+
+from obsidian_journal import query
+
+if TYPE_CHECKING:
+    from obsidian_journal.index import VaultIndex
+
+SORT_COLUMNS = ("date", "modified", "title", "size")
+GROUP_COLUMNS = ("type", "tag", "folder", "month")
+
+# Id 0 is reserved so a masked-out row can be written as 0.
+_MASKED = 0
+
+
+class Dictionary:
+    """Value <-> small int id for one categorical column. Id 0 is never a value."""
+
+    def __init__(self) -> None:
+        self.values: list[str | None] = [None]
+        self._ids: dict[str, int] = {}
+
+    def id(self, value: str) -> int:
+        i = self._ids.get(value)
+        if i is None:
+            i = self._ids[value] = len(self.values)
+            self.values.append(value)
+        return i
+
+    def ids_of(self, values: Sequence[str]) -> list[int]:
+        return [self._ids[v] for v in values if v in self._ids]
+
+    def ids_matching(self, pattern: str) -> list[int]:
+        return [i for v, i in self._ids.items() if query.value_matches(pattern, v)]
+
+
+def _id_array(n_values: int) -> array:
+    """The narrowest unsigned array that holds ids 0..n_values-1."""
+    if n_values <= 1 << 8:
+        return array("B")
+    if n_values <= 1 << 16:
+        return array("H")
+    return array("L")  # at least 32 bits
+
+
+class Catalogue:
+    def __init__(self, index: VaultIndex) -> None:
+        self.index = index
+        entries = index.entries
+        self.n = len(entries)
+        self.dates = index.dates
+        self.titles = [e.path.rsplit("/", 1)[-1].removesuffix(".md") for e in entries]
+        self.mtimes = array("q", (e.mtime_ns for e in entries))
+        self.sizes = array("q", (e.size for e in entries))
+        self.words = array("q", (e.words for e in entries))
+
+        self.types = Dictionary()
+        self.folders = Dictionary()
+        self.months = Dictionary()
+        self.tags = Dictionary()
+        types = [self.types.id(str(e.frontmatter.get("type") or "")) for e in entries]
+        # Same as values("folder") without building a Path per row.
+        folders = [self.folders.id(e.path.rpartition("/")[0]) for e in entries]
+        months = [self.months.id(d[:7] if len(d) >= 7 else "") for d in self.dates]
+        self.type_ids = _id_array(len(self.types.values))
+        self.type_ids.extend(types)
+        self.folder_ids = _id_array(len(self.folders.values))
+        self.folder_ids.extend(folders)
+        self.month_ids = _id_array(len(self.months.values))
+        self.month_ids.extend(months)
+
+        # Multi-valued: row i's tags are tag_ids[tag_offsets[i]:tag_offsets[i + 1]];
+        # tag_words repeats the row's word count alongside each of its tags.
+        flat: list[int] = []
+        self.tag_offsets = array("l", [0])
+        self.tag_words = array("q")
+        for e in entries:
+            row_tags = [self.tags.id(t) for t in e.values("tag")]
+            flat.extend(row_tags)
+            self.tag_offsets.append(len(flat))
+            self.tag_words.extend([e.words] * len(row_tags))
+        self.tag_ids = _id_array(len(self.tags.values))
+        self.tag_ids.extend(flat)
+        self._ones = b"\1" * self.n
+
+    # --- masks ----------------------------------------------------------
+
+    def _in(self, column: array, ids: Sequence[int]) -> bytes:
+        if column.typecode == "B":
+            table = bytearray(256)
+            for i in ids:
+                table[i] = 1
+            return column.tobytes().translate(table)
+        wanted = set(ids)
+        return bytes(v in wanted for v in column)
+
+    def type_mask(self, pattern: str) -> bytes:
+        return self._in(self.type_ids, self.types.ids_matching(pattern))
+
+    def folder_mask(self, pattern: str) -> bytes:
+        return self._in(self.folder_ids, self.folders.ids_matching(pattern))
+
+    def tag_mask(self, patterns: Sequence[str]) -> bytes:
+        """Rows carrying any of the tag patterns."""
+        return self._rows_with_tags([i for p in patterns for i in self.tags.ids_matching(p)])
+
+    def _rows_with_tags(self, ids: Sequence[int]) -> bytes:
+        hits = self._in(self.tag_ids, ids)
+        out = bytearray(self.n)
+        offsets = self.tag_offsets
+        j = hits.find(1)
+        while j != -1:
+            row = bisect_left(offsets, j + 1) - 1
+            out[row] = 1
+            # Skip the rest of this row's tags.
+            j = hits.find(1, offsets[row + 1])
+        return bytes(out)
+
+    def date_mask(self, op: str, value: str) -> bytes:
+        r = query.date_range(self.dates, op, value)
+        return b"\0" * r.start + b"\1" * len(r) + b"\0" * (self.n - r.stop)
+
+    def where(
+        self,
+        *,
+        folder: str | None = None,
+        note_type: str | None = None,
+        tags: Sequence[str] | None = None,
+        since: str | None = None,
+        until: str | None = None,
+    ) -> bytes:
+        """Byte mask of rows matching the `oj query` keyword filters."""
+        masks = []
+        if since:
+            masks.append(self.date_mask(">=", query.resolve_date(since)))
+        if until:
+            masks.append(self.date_mask("<=", query.resolve_date(until)))
+        if note_type:
+            masks.append(self.type_mask(note_type))
+        if folder:
+            masks.append(self.folder_mask(folder))
+        if tags:
+            masks.append(self.tag_mask(tags))
+        return mask_and(self.n, *masks) if masks else self._ones
+
+    # --- reading masks ---------------------------------------------------
+
+    def positions(self, mask: bytes) -> list[int]:
+        out: list[int] = []
+        i = mask.find(1)
+        while i != -1:
+            out.append(i)
+            i = mask.find(1, i + 1)
+        return out
+
+    def argsort(self, column: str, rows: Sequence[int], *, reverse: bool = False) -> list[int]:
+        """`rows` ordered by a SORT_COLUMNS column, ties by position."""
+        if column == "date":
+            return sorted(rows, reverse=reverse)
+        values = {"modified": self.mtimes, "title": self.titles, "size": self.sizes}[column]
+        return sorted(rows, key=lambda i: (values[i], i), reverse=reverse)
+
+    def _column(self, column: str) -> tuple[array, Dictionary]:
+        return {
+            "type": (self.type_ids, self.types),
+            "folder": (self.folder_ids, self.folders),
+            "month": (self.month_ids, self.months),
+        }[column]
+
+    def count_by(self, column: str, mask: bytes | None = None) -> dict[str, int]:
+        """Row counts per GROUP_COLUMNS value, within `mask`, most common first."""
+        if column == "tag":
+            ids: Sequence[int] = self.tag_ids
+            if mask is not None and mask != self._ones:
+                ids = [
+                    t
+                    for row in self.positions(mask)
+                    for t in self.tag_ids[self.tag_offsets[row] : self.tag_offsets[row + 1]]
+                ]
+            dictionary = self.tags
+        else:
+            column_ids, dictionary = self._column(column)
+            ids = column_ids
+            if mask is not None and mask != self._ones:
+                # Masked-out rows become id 0 and drop out of the count.
+                ids = bytes(map(operator.mul, column_ids, mask)) if column_ids.typecode == "B" else [
+                    v for v, m in zip(column_ids, mask) if m
+                ]
+        counts = Counter(ids)
+        counts.pop(_MASKED, None)
+        return {dictionary.values[i]: c for i, c in counts.most_common()}  # type: ignore[misc]
+
+    def words_by(self, column: str, values: Sequence[str], mask: bytes | None = None) -> dict[str, int]:
+        """Summed word counts for the given GROUP_COLUMNS values, within `mask`.
+
+        One C-level `compress` pass over a words column per value, so ask
+        only for the groups you will show.
+        """
+        filtered = mask is not None and mask != self._ones
+        if column == "tag" and filtered:
+            # Tag slots don't line up with the row mask; walk the kept rows.
+            wanted = dict(zip(self.tags.ids_of(values), values))
+            out = dict.fromkeys(values, 0)
+            offsets = self.tag_offsets
+            for row in self.positions(mask):  # type: ignore[arg-type]
+                for t in self.tag_ids[offsets[row] : offsets[row + 1]]:
+                    if t in wanted:
+                        out[wanted[t]] += self.words[row]
+            return out
+        out = {}
+        for value in values:
+            if column == "tag":
+                hits = self._in(self.tag_ids, self.tags.ids_of([value]))
+                out[value] = sum(compress(self.tag_words, hits))
+                continue
+            column_ids, dictionary = self._column(column)
+            rows = self._in(column_ids, dictionary.ids_of([value]))
+            if filtered:
+                rows = mask_and(self.n, rows, mask)  # type: ignore[arg-type]
+            out[value] = sum(compress(self.words, rows))
+        return out
+
+    def total_words(self, mask: bytes | None = None) -> int:
+        return sum(self.words if mask is None else compress(self.words, mask))
+
+
+def mask_and(n: int, *masks: bytes) -> bytes:
+    acc = int.from_bytes(masks[0], "little")
+    for m in masks[1:]:
+        acc &= int.from_bytes(m, "little")
+    return acc.to_bytes(n, "little")
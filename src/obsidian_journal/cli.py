@@ -1,14 +1,14 @@
 from __future__ import annotations
 
 import sys
+from contextlib import contextmanager
+from typing import Iterator
 
 import typer
-from rich.console import Console
-from rich.markdown import Markdown
-from rich.table import Table
 
 from obsidian_journal.config import Config
 from obsidian_journal.models import ReflectionType
+from obsidian_journal import output
 from obsidian_journal.output import emit_json, emit_error
 
 app = typer.Typer(name="oj", help="Obsidian Journal — agentic capture & vault organizer")
@@ -17,17 +17,100 @@ config_app = typer.Typer(help="View and set configuration")
 app.add_typer(organize_app, name="organize")
 app.add_typer(config_app, name="config")
 
-console = Console(stderr=True)
+
+class _LazyConsole:
+    """Stderr rich Console, built on first use.
+
+    rich costs tens of milliseconds to import; agent-facing `--json` paths
+    never print through it, so they shouldn't pay for it.
+    """
+
+    _console = None
+
+    def __getattr__(self, name: str):
+        if _LazyConsole._console is None:
+            from rich.console import Console
+
+            _LazyConsole._console = Console(stderr=True)
+        return getattr(_LazyConsole._console, name)
+
+
+console = _LazyConsole()
 
 json_mode: bool = False
 
 
 @app.callback()
 def main(
+    ctx: typer.Context,
     json: bool = typer.Option(False, "--json", help="Emit JSON output for agent consumption"),
+    ndjson: bool = typer.Option(
+        False,
+        "--ndjson",
+        help="Like --json, but one compact object per line; query/list stream one line per note",
+    ),
+    startup_profile: bool = typer.Option(
+        False,
+        "--startup-profile",
+        help="Run the command in a fresh interpreter and report import-time costs to stderr",
+    ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Time vault, parsing and LLM phases; print the tree to stderr (under --json: `_oj_timings`)",
+    ),
+    memprofile: bool = typer.Option(
+        False,
+        "--memprofile",
+        help="Trace memory; report peak, bytes per note and top allocation sites to stderr (under --json: `_oj_memory`)",
+    ),
 ) -> None:
     global json_mode
-    json_mode = json
+    json_mode = json or ndjson
+    output.ndjson_mode = ndjson
+
+    if startup_profile:
+        import json as json_lib
+
+        from obsidian_journal.startup import format_profile, profile_startup
+
+        argv = [a for a in sys.argv[1:] if a != "--startup-profile"]
+        startup = profile_startup(argv)
+        if json_mode:
+            sys.stderr.write(json_lib.dumps({"_oj_startup": startup.to_dict()}) + "\n")
+        else:
+            sys.stderr.write(format_profile(startup))
+        raise typer.Exit(startup.exit_code)
+
+    if profile:
+        from obsidian_journal import profiling
+
+        profiling.enable(f"oj {ctx.invoked_subcommand}")
+        ctx.call_on_close(_finish_profile)
+
+    if memprofile:
+        from obsidian_journal import profiling
+
+        profiling.start_memory()
+        ctx.call_on_close(_finish_memprofile)
+
+
+def _finish_profile() -> None:
+    from obsidian_journal import profiling
+
+    # Under --json the tree already went out as `_oj_timings`.
+    if not json_mode:
+        sys.stderr.write(profiling.format_tree())
+    profiling.disable()
+
+
+def _finish_memprofile() -> None:
+    from obsidian_journal import profiling
+
+    # Under --json the report already went out as `_oj_memory`.
+    if not json_mode:
+        sys.stderr.write(profiling.format_memory(profiling.memory_report()))
+    profiling.stop_memory()
 
 
 def say(*args, **kwargs) -> None:
@@ -45,6 +128,9 @@ def journal(
     quick: str | None = typer.Option(
         None, "--quick", "-q", help="Quick capture — skip conversation"
     ),
+    defer: bool = typer.Option(
+        False, "--defer", help="Queue the capture and exit; `oj worker` synthesizes it later"
+    ),
 ) -> None:
     """Start an agentic journal capture session."""
     # In --json mode, --quick is required (no interactive path).
@@ -66,15 +152,14 @@ def journal(
 
     say(f"\n[bold green]Starting {type.value} reflection...[/bold green]")
 
-    from obsidian_journal.journal.capture import run_conversation
-    from obsidian_journal.journal.synthesize import synthesize_note
-    from obsidian_journal import vault
     from obsidian_journal.models import ConversationMessage
 
     # Run conversation or use quick capture
     if quick is not None:
         messages = [ConversationMessage(role="user", content=quick)]
     else:
+        from obsidian_journal.journal.capture import run_conversation
+
         messages = run_conversation(cfg, type)
 
     if not any(m.role == "user" for m in messages):
@@ -83,13 +168,26 @@ def journal(
         console.print("[yellow]No input captured. Exiting.[/yellow]")
         raise typer.Exit()
 
+    if defer:
+        from obsidian_journal.journal.queue import CaptureQueue
+
+        job = CaptureQueue(cfg.queue_dir).enqueue(type, messages)
+        if json_mode:
+            emit_json({"queued": True, "id": job.id, "type": type.value, "date": job.captured_on})
+            raise typer.Exit()
+        console.print(f"[bold green]Queued:[/bold green] {job.id} — run `oj worker` to synthesize.")
+        raise typer.Exit()
+
+    from obsidian_journal.journal.synthesize import synthesize_note
+    from obsidian_journal import vault
+
     # Synthesize note
     say("\n[dim]Synthesizing your reflection...[/dim]\n")
     existing_titles = vault.get_all_note_titles(cfg)
     note = synthesize_note(cfg, messages, type, existing_titles)
 
     if json_mode:
-        full_path = vault.write_note(cfg, note)
+        full_path = vault.write_note(cfg, note, exclusive=True)
         rel_path = str(full_path.relative_to(cfg.vault_path))
         emit_json({
             "path": rel_path,
@@ -103,6 +201,8 @@ def journal(
         })
         raise typer.Exit()
 
+    from rich.markdown import Markdown
+
     # Preview
     console.print(f"[bold]Title:[/bold] {note.title}")
     console.print(f"[bold]Folder:[/bold] {note.folder}/")
@@ -115,59 +215,110 @@ def journal(
 
     # Confirm save
     if typer.confirm("Save this note to your vault?", default=True):
-        path = vault.write_note(cfg, note)
+        path = vault.write_note(cfg, note, exclusive=True)
         console.print(f"\n[bold green]Saved:[/bold green] {path}")
     else:
         console.print("[yellow]Note discarded.[/yellow]")
 
 
+@app.command()
+def worker(
+    concurrency: int = typer.Option(4, "--concurrency", "-c", help="Jobs synthesized in parallel"),
+    max_attempts: int = typer.Option(3, "--max-attempts", help="Tries per job before leaving it queued"),
+) -> None:
+    """Synthesize and save captures queued with `oj journal --defer`."""
+    cfg = Config.load()
+    from obsidian_journal.journal.worker import run_worker
+
+    say("[dim]Draining capture queue...[/dim]")
+    report = run_worker(cfg, concurrency=concurrency, max_attempts=max_attempts)
+
+    if json_mode:
+        emit_json({
+            "processed": len(report.written),
+            "failed": len(report.failed),
+            "items": [r.to_dict() for r in report.results],
+        })
+        raise typer.Exit(1 if report.failed else 0)
+
+    if not report.results:
+        console.print("[dim]Queue is empty.[/dim]")
+        raise typer.Exit()
+
+    for r in report.written:
+        console.print(f"[bold green]Saved:[/bold green] {r.path}")
+    for r in report.failed:
+        console.print(f"[red]Still queued:[/red] {r.job_id} ({r.error})")
+    if report.failed:
+        raise typer.Exit(1)
+
+
 @app.command()
 def plan(
     quick: str | None = typer.Option(
         None, "--quick", "-q", help="Quick plan — list tasks, skip conversation"
     ),
+    day: str | None = typer.Option(
+        None, "--date", "-d", help="Day to plan: YYYY-MM-DD or 'tomorrow' (default: today)"
+    ),
 ) -> None:
-    """Create a structured daily plan for today."""
-    from datetime import date
+    """Create a structured daily plan (today unless --date is given)."""
+    from datetime import date, timedelta
 
     if json_mode and quick is None:
         emit_error("--quick is required when using --json", 2)
 
+    if day is None:
+        plan_date = date.today().isoformat()
+    elif day == "tomorrow":
+        plan_date = (date.today() + timedelta(days=1)).isoformat()
+    else:
+        try:
+            plan_date = date.fromisoformat(day).isoformat()
+        except ValueError:
+            if json_mode:
+                emit_error(f"Invalid --date: {day}", 2)
+            console.print(f"[red]Invalid --date:[/red] {day} (expected YYYY-MM-DD or 'tomorrow')")
+            raise typer.Exit(2)
+
     cfg = Config.load()
-    today = date.today().isoformat()
-    say(f"\n[bold green]Planning your day: {today}[/bold green]")
+    say(f"\n[bold green]Planning your day: {plan_date}[/bold green]")
 
-    # Fetch weather (graceful failure)
-    weather = None
-    if cfg.location_lat is not None and cfg.location_lon is not None:
-        from obsidian_journal.plan.weather import fetch_weather
+    from obsidian_journal.plan.prefetch import PlanPrefetch
 
-        say("[dim]Checking weather...[/dim]")
-        weather = fetch_weather(cfg.location_lat, cfg.location_lon)
-        if weather:
-            say(f"[dim]Weather: {weather.summary}[/dim]")
-        else:
-            say("[dim]Could not fetch weather — continuing without it.[/dim]")
+    # Weather and the existing daily note load in the background (graceful failure)
+    prefetch = PlanPrefetch(cfg, plan_date)
+    if prefetch.has_location:
+        say("[dim]Checking weather in the background...[/dim]")
     else:
         say(
             "[dim]No location set — skipping weather. "
             "Set OJ_LOCATION_LAT and OJ_LOCATION_LON for weather-aware planning.[/dim]"
         )
 
-    from obsidian_journal.plan.capture import run_plan_conversation
-    from obsidian_journal.plan.synthesize import synthesize_plan
-    from obsidian_journal import vault
     from obsidian_journal.models import ConversationMessage
 
-    # Check for existing daily note content
-    existing_note = vault.read_daily_note(cfg, today)
-    existing_content = existing_note.body if existing_note else None
-
     # Run conversation or use quick capture
     if quick is not None:
         messages = [ConversationMessage(role="user", content=quick)]
     else:
-        messages = run_plan_conversation(cfg, weather, existing_content)
+        from obsidian_journal.plan.capture import run_plan_conversation
+
+        messages = run_plan_conversation(
+            cfg,
+            existing_content=prefetch.existing_content(),
+            weather_loader=prefetch.weather,
+        )
+
+    weather = prefetch.weather()
+    if prefetch.has_location:
+        if weather:
+            say(f"[dim]Weather: {weather.summary}[/dim]")
+        else:
+            say("[dim]Could not fetch weather — continuing without it.[/dim]")
+
+    from obsidian_journal.plan.synthesize import synthesize_plan
+    from obsidian_journal import vault
 
     if not any(m.role == "user" for m in messages):
         if json_mode:
@@ -177,19 +328,19 @@ def plan(
 
     # Synthesize plan
     say("\n[dim]Building your daily plan...[/dim]\n")
-    plan_markdown = synthesize_plan(cfg, messages, weather, today)
+    plan_markdown = synthesize_plan(cfg, messages, weather, plan_date)
 
     if json_mode:
-        full_path = vault.write_daily_plan(cfg, today, plan_markdown)
+        full_path = vault.write_daily_plan(cfg, plan_date, plan_markdown)
         rel_path = str(full_path.relative_to(cfg.vault_path))
         from obsidian_journal.plan.parse import parse_blocks
 
         result: dict = {
             "path": rel_path,
             "absolute_path": str(full_path),
-            "date": today,
+            "date": plan_date,
             "frontmatter": {
-                "date": today,
+                "date": plan_date,
                 "type": "daily-note",
                 "tags": ["daily"],
             },
@@ -200,13 +351,15 @@ def plan(
         emit_json(result)
         raise typer.Exit()
 
+    from rich.markdown import Markdown
+
     # Preview
     console.print(Markdown(plan_markdown))
     console.print()
 
     # Confirm save
     if typer.confirm("Save this plan to your daily note?", default=True):
-        path = vault.write_daily_plan(cfg, today, plan_markdown)
+        path = vault.write_daily_plan(cfg, plan_date, plan_markdown)
         console.print(f"\n[bold green]Saved:[/bold green] {path}")
     else:
         console.print("[yellow]Plan discarded.[/yellow]")
@@ -317,6 +470,8 @@ def spec(
         })
         raise typer.Exit()
 
+    from rich.markdown import Markdown
+
     # Preview
     console.print(f"[bold]Title:[/bold] {spec_note.title}")
     console.print(f"[bold]Folder:[/bold] {spec_note.folder}/")
@@ -351,6 +506,10 @@ def list_notes(
 
     notes = vault.list_journal_notes(cfg, folder=folder, limit=limit)
 
+    if output.ndjson_mode:
+        output.emit_stream("list", (n.to_summary_dict() for n in notes), folder=folder)
+        raise typer.Exit()
+
     if json_mode:
         emit_json({"folder": folder, "count": len(notes), "items": [n.to_summary_dict() for n in notes]})
         raise typer.Exit()
@@ -374,21 +533,58 @@ def list_notes(
 
 @app.command()
 def query(
+    expr: str | None = typer.Argument(
+        None,
+        help='Query expression, e.g. \'tag:work AND NOT type:meeting AND date>=2026-01 AND "roadmap"\'',
+    ),
     type: str | None = typer.Option(None, "--type", "-t", help="Filter by note type"),
     tags: str | None = typer.Option(None, "--tags", help="Filter by tags (comma-separated, OR logic)"),
-    since: str | None = typer.Option(None, "--since", help="Filter notes from this date (YYYY-MM-DD)"),
-    until: str | None = typer.Option(None, "--until", help="Filter notes until this date (YYYY-MM-DD)"),
+    since: str | None = typer.Option(None, "--since", help="Filter notes from this date (YYYY-MM-DD, or today, yesterday, 7d, 2w)"),
+    until: str | None = typer.Option(None, "--until", help="Filter notes until this date (YYYY-MM-DD, or today, yesterday, 7d, 2w)"),
     folder: str | None = typer.Option(None, "--folder", "-f", help="Filter by folder"),
     search: str | None = typer.Option(None, "--search", "-s", help="Text search in title and body"),
     limit: int | None = typer.Option(None, "--limit", "-n", help="Max number of results"),
+    after: str | None = typer.Option(
+        None, "--after", help="Continue from a previous page's next_cursor"
+    ),
+    fields: str | None = typer.Option(
+        None,
+        "--fields",
+        help="JSON output fields (comma-separated), e.g. path,title,tags,date; bodies are skipped unless listed",
+    ),
+    explain: bool = typer.Option(False, "--explain", help="Show the query plan with per-step timings"),
+    sort: str = typer.Option(
+        "date", "--sort", help="Order by date, modified or size (newest/largest first) or title"
+    ),
 ) -> None:
     """Query notes with structured filters. Primary entry point for agent consumption."""
+    from obsidian_journal.catalogue import SORT_COLUMNS
+    from obsidian_journal.models import NOTE_FIELDS
+
+    if sort not in SORT_COLUMNS:
+        message = f"Invalid --sort: {sort} (expected one of {', '.join(SORT_COLUMNS)})"
+        if json_mode:
+            emit_error(message, 2)
+        console.print(f"[red]{message}[/red]")
+        raise typer.Exit(2)
+
+    field_list = _split_csv(fields) or None
+    if field_list:
+        unknown = [f for f in field_list if f not in NOTE_FIELDS]
+        if unknown:
+            message = f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(NOTE_FIELDS)}"
+            if json_mode:
+                emit_error(message, 2)
+            console.print(f"[red]{message}[/red]")
+            raise typer.Exit(2)
+
     cfg = Config.load()
-    from obsidian_journal import vault
+    from obsidian_journal.index import CursorError, VaultIndex
+    from obsidian_journal.query import QuerySyntaxError
 
     tag_list = [t.strip() for t in tags.split(",")] if tags else None
-    notes = vault.search_notes(
-        cfg,
+    filters = dict(
+        where=expr,
         folder=folder,
         note_type=type,
         tags=tag_list,
@@ -396,16 +592,51 @@ def query(
         until=until,
         text=search,
         limit=limit,
+        after=after,
+        sort=sort,
     )
+    index = VaultIndex.load(cfg)
+    # The table never shows bodies.
+    table_fields = ("date", "title", "folder", "type", "tags")
+    try:
+        page = index.search(fields=field_list if json_mode else table_fields, **filters)
+    except (CursorError, QuerySyntaxError) as e:
+        if json_mode:
+            emit_error(str(e), 2)
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(2)
+    extra = {"plan": page.plan.to_dict()} if explain else {}
+
+    if output.ndjson_mode:
+        output.emit_stream(
+            "query",
+            (n.to_dict(field_list) for n in page),
+            trailer={"next_cursor": page.next_cursor, **extra},
+        )
+        raise typer.Exit()
 
     if json_mode:
-        emit_json({"count": len(notes), "items": [n.to_dict() for n in notes]})
+        notes = list(page)
+        emit_json(
+            {
+                "count": len(notes),
+                "items": [n.to_dict(field_list) for n in notes],
+                "next_cursor": page.next_cursor,
+                **extra,
+            }
+        )
         raise typer.Exit()
 
+    notes = list(page)
+    if explain:
+        console.print(page.plan.format(), markup=False, highlight=False, soft_wrap=True)
+
     if not notes:
         console.print("[yellow]No matching notes found.[/yellow]")
         raise typer.Exit(2)
 
+    from rich.table import Table
+
     table = Table(title=f"Query results ({len(notes)} notes)")
     table.add_column("Date", style="dim")
     table.add_column("Title")
@@ -421,6 +652,147 @@ def query(
             ", ".join(note.frontmatter.tags),
         )
     console.print(table)
+    if page.next_cursor:
+        console.print(f"[dim]More results: --after {page.next_cursor}[/dim]", soft_wrap=True)
+
+
+@app.command()
+def stats(
+    by: str | None = typer.Option(
+        None, "--by", help="Dimensions to group by (comma-separated): type, tag, folder, month"
+    ),
+    type: str | None = typer.Option(None, "--type", "-t", help="Filter by note type"),
+    tags: str | None = typer.Option(None, "--tags", help="Filter by tags (comma-separated, OR logic)"),
+    since: str | None = typer.Option(None, "--since", help="Filter notes from this date (YYYY-MM-DD, or today, yesterday, 7d, 2w)"),
+    until: str | None = typer.Option(None, "--until", help="Filter notes until this date (YYYY-MM-DD, or today, yesterday, 7d, 2w)"),
+    folder: str | None = typer.Option(None, "--folder", "-f", help="Filter by folder"),
+    top: int = typer.Option(10, "--top", help="Groups to show per dimension (0 for all)"),
+) -> None:
+    """Note and word counts grouped by type, tag, folder and month, from the vault index."""
+    from obsidian_journal.catalogue import GROUP_COLUMNS
+
+    dimensions = _split_csv(by) or list(GROUP_COLUMNS)
+    unknown = [d for d in dimensions if d not in GROUP_COLUMNS]
+    if unknown:
+        message = f"Unknown dimension(s): {', '.join(unknown)}. Available: {', '.join(GROUP_COLUMNS)}"
+        if json_mode:
+            emit_error(message, 2)
+        console.print(f"[red]{message}[/red]")
+        raise typer.Exit(2)
+
+    cfg = Config.load()
+    from obsidian_journal.index import VaultIndex
+
+    catalogue = VaultIndex.load(cfg).catalogue()
+    tag_list = _split_csv(tags) or None
+    mask = catalogue.where(folder=folder, note_type=type, tags=tag_list, since=since, until=until)
+    groups = {}
+    for dimension in dimensions:
+        counts = catalogue.count_by(dimension, mask)
+        values = sorted(counts, reverse=True) if dimension == "month" else list(counts)
+        shown = values[:top] if top else values
+        words = catalogue.words_by(dimension, shown, mask)
+        groups[dimension] = {
+            "distinct": len(values),
+            "items": [{"value": v, "notes": counts[v], "words": words[v]} for v in shown],
+        }
+    total = len(catalogue.positions(mask))
+    total_words = catalogue.total_words(mask)
+
+    if json_mode:
+        emit_json({"notes": total, "words": total_words, "groups": groups})
+        raise typer.Exit()
+
+    from rich.table import Table
+
+    console.print(f"\n[bold]{total} notes, {total_words} words[/bold]\n")
+    for dimension, group in groups.items():
+        shown = len(group["items"])
+        suffix = f", top {shown} of {group['distinct']}" if shown < group["distinct"] else ""
+        table = Table(title=f"By {dimension}{suffix}")
+        table.add_column(dimension.capitalize())
+        table.add_column("Notes", justify="right")
+        table.add_column("Words", justify="right", style="dim")
+        for item in group["items"]:
+            table.add_row(item["value"] or "(none)", str(item["notes"]), str(item["words"]))
+        console.print(table)
+
+
+def _is_date(value: str) -> bool:
+    """A full or partial (YYYY, YYYY-MM) ISO date."""
+    from datetime import date
+
+    parts = value.split("-")
+    if not 1 <= len(parts) <= 3 or not all(p.isdigit() for p in parts):
+        return False
+    try:
+        date.fromisoformat("-".join(parts + ["01"] * (3 - len(parts))))
+    except ValueError:
+        return False
+    return True
+
+
+@app.command("metrics")
+def metrics_report(
+    since: str | None = typer.Option(
+        "7d", "--since", help="Only records from this date (YYYY-MM-DD, or today, yesterday, 7d, 2w); 'all' for everything"
+    ),
+    kind: str | None = typer.Option(None, "--kind", help="Only 'llm' (Claude calls) or 'scan' (vault scans)"),
+    per: str | None = typer.Option(None, "--per", help="Also split by 'day' or 'month', to see trends"),
+) -> None:
+    """Latency percentiles, tokens and scan sizes from the local metrics log."""
+    from obsidian_journal import metrics
+    from obsidian_journal.query import resolve_date
+
+    start = None if since in (None, "all") else resolve_date(since)
+    problems = []
+    if start is not None and not _is_date(start):
+        problems.append(f"Invalid --since: {since} (expected YYYY-MM-DD, today, yesterday, 7d, 2w or all)")
+    if kind is not None and kind not in metrics.KINDS:
+        problems.append(f"Invalid --kind: {kind} (expected one of {', '.join(metrics.KINDS)})")
+    if per is not None and per not in metrics.PERIODS:
+        problems.append(f"Invalid --per: {per} (expected one of {', '.join(metrics.PERIODS)})")
+    if problems:
+        if json_mode:
+            emit_error(problems[0], 2)
+        console.print(f"[red]{problems[0]}[/red]")
+        raise typer.Exit(2)
+
+    cfg = Config.load()
+    entries = (e for e in metrics.read(cfg, since=start) if kind is None or e.get("kind") == kind)
+    rows = metrics.summarize(entries, period=per)
+
+    if json_mode:
+        emit_json({"since": start, "count": len(rows), "items": rows})
+        raise typer.Exit()
+
+    if not rows:
+        console.print(f"[yellow]No metrics recorded since {start or 'the start'}.[/yellow]")
+        raise typer.Exit()
+
+    from rich.table import Table
+
+    table = Table(title=f"Metrics since {start or 'the start'}")
+    # llm call sites and scan names don't overlap, so the kind column is left out.
+    table.add_column("Name")
+    if per:
+        table.add_column(per.capitalize(), style="dim")
+    for column in ("Count", "p50 ms", "p95 ms", "Max ms", "Tokens in/out", "Cache hit", "Notes"):
+        table.add_column(column, justify="right")
+    for row in rows:
+        llm = row["kind"] == "llm"
+        table.add_row(
+            row["name"],
+            *([row[per]] if per else []),
+            f"{row['count']}" + (f" ({row['errors']} failed)" if row["errors"] else ""),
+            f"{row['p50_ms']:.0f}",
+            f"{row['p95_ms']:.0f}",
+            f"{row['max_ms']:.0f}",
+            f"{row['input_tokens']}/{row['output_tokens']}" if llm else "",
+            f"{row['cache_hit_rate']:.0%}" if llm else "",
+            "" if llm else str(row["max_notes"]),
+        )
+    console.print(table)
 
 
 @app.command()
@@ -431,14 +803,7 @@ def get(
     cfg = Config.load()
     from obsidian_journal import vault
 
-    all_notes = vault.list_notes(cfg)
-
-    # Exact match first
-    match = next((n for n in all_notes if n.title == title), None)
-    # Partial match fallback
-    if match is None:
-        title_lower = title.lower()
-        match = next((n for n in all_notes if title_lower in n.title.lower()), None)
+    match = vault.find_note(vault.iter_notes(cfg), title)
 
     if match is None:
         if json_mode:
@@ -450,6 +815,8 @@ def get(
         emit_json(match.to_dict())
         raise typer.Exit()
 
+    from rich.markdown import Markdown
+
     console.print(f"\n[bold]Title:[/bold] {match.title}")
     console.print(f"[bold]Folder:[/bold] {match.folder or '(root)'}")
     if match.frontmatter.date:
@@ -462,16 +829,109 @@ def get(
     console.print(Markdown(match.body))
 
 
+@app.command()
+def batch(
+    concurrency: int = typer.Option(
+        1, "--concurrency", "-c", help="Run independent requests in parallel (responses unordered)"
+    ),
+) -> None:
+    """Run NDJSON query/get/list requests from stdin against one loaded vault.
+
+    Each line is `{"id": ..., "op": "query"|"get"|"list", "args": {...}}`, with
+    args named like the CLI options. One NDJSON response per request is
+    streamed to stdout, echoing `id`.
+    """
+    try:
+        cfg = Config.load()
+    except ValueError as e:
+        emit_error(str(e), 1)
+    from obsidian_journal.batch import run_batch
+    from obsidian_journal.output import emit_line
+
+    run_batch(cfg, sys.stdin, emit_line, concurrency=concurrency)
+
+
+def _check_apply(cfg: Config, fsync: str) -> None:
+    """Refuse to --apply on top of an interrupted write batch, or with a bad --fsync."""
+    from obsidian_journal import writebatch
+
+    if fsync not in writebatch.FSYNC_POLICIES:
+        msg = f"--fsync must be one of: {', '.join(writebatch.FSYNC_POLICIES)}"
+        if json_mode:
+            emit_error(msg, 2)
+        console.print(f"[red]{msg}[/red]")
+        raise typer.Exit(2)
+    if writebatch.pending(cfg):
+        msg = "An interrupted organize --apply batch is pending; run `oj organize recover` (or `--rollback`) first"
+        if json_mode:
+            emit_error(msg, 1)
+        console.print(f"[red]{msg}[/red]")
+        raise typer.Exit(1)
+
+
+@contextmanager
+def _apply_errors(cfg: Config) -> Iterator[None]:
+    """Report the failures an organize --apply batch raises as an error and exit 1.
+
+    A batch that fails while staging (a move onto an existing note, a
+    missing source, a note changed by another process, a lock that wasn't
+    released in time) leaves the vault untouched. One that fails while
+    landing leaves a manifest for `oj organize recover`.
+    """
+    from obsidian_journal import locks, writebatch
+
+    try:
+        yield
+    except (FileExistsError, FileNotFoundError, writebatch.WriteConflict, locks.LockTimeout) as e:
+        if isinstance(e, FileExistsError):
+            msg = f"{e.filename or e} already exists"
+        elif isinstance(e, FileNotFoundError):
+            msg = f"{e.filename or e} no longer exists"
+        else:
+            msg = str(e)
+        if writebatch.pending(cfg):
+            msg += "; the batch was interrupted, run `oj organize recover` (or `--rollback`)"
+        else:
+            msg += "; no changes were made"
+        if json_mode:
+            emit_error(msg, 1)
+        console.print(f"[red]{msg}[/red]")
+        raise typer.Exit(1)
+
+
+@organize_app.command("recover")
+def organize_recover(
+    rollback: bool = typer.Option(False, "--rollback", help="Undo the interrupted batch instead of finishing it"),
+) -> None:
+    """Finish (or roll back) an organize --apply that was interrupted mid-write."""
+    cfg = Config.load()
+    from obsidian_journal import writebatch
+
+    results = [writebatch.recover(cfg, manifest, rollback=rollback) for manifest in writebatch.pending(cfg)]
+    if json_mode:
+        emit_json({"batches": results})
+        raise typer.Exit()
+    if not results:
+        console.print("[green]No interrupted batches.[/green]")
+    for r in results:
+        verb = "Rolled back" if rollback else "Finished"
+        console.print(f"{verb} batch {r['id']} ({r['ops']} operations).")
+
+
 @organize_app.command("links")
 def organize_links(
     apply: bool = typer.Option(False, "--apply", help="Apply changes (default: preview only)"),
     deep: bool = typer.Option(False, "--deep", help="Use Claude for semantic link suggestions (costs API)"),
+    fsync: str = typer.Option("batch", "--fsync", help="With --apply: none, batch (default) or always"),
+    workers: int = typer.Option(8, "--workers", min=1, help="With --apply: parallel file writes"),
 ) -> None:
     """Scan notes for potential wikilinks between existing notes."""
     cfg = Config.load()
+    if apply:
+        _check_apply(cfg, fsync)
     from obsidian_journal.organize.links import scan_links, preview_links, apply_links
 
-    console.print("[dim]Scanning for wikilink opportunities...[/dim]\n")
+    say("[dim]Scanning for wikilink opportunities...[/dim]\n")
     suggestions = scan_links(cfg, deep=deep)
 
     if json_mode:
@@ -480,7 +940,8 @@ def organize_links(
             for s in suggestions
         ]
         if apply and suggestions:
-            count = apply_links(cfg, suggestions)
+            with _apply_errors(cfg):
+                count = apply_links(cfg, suggestions, fsync=fsync, workers=workers)
             emit_json({"applied": count, "suggestions": data})
         else:
             emit_json({"applied": 0, "suggestions": data})
@@ -489,7 +950,8 @@ def organize_links(
     preview_links(suggestions)
 
     if apply and suggestions:
-        count = apply_links(cfg, suggestions)
+        with _apply_errors(cfg):
+            count = apply_links(cfg, suggestions, fsync=fsync, workers=workers)
         console.print(f"\n[bold green]Applied {count} wikilinks.[/bold green]")
     elif suggestions:
         console.print("\n[dim]Run with --apply to make changes.[/dim]")
@@ -498,16 +960,20 @@ def organize_links(
 @organize_app.command("frontmatter")
 def organize_frontmatter(
     apply: bool = typer.Option(False, "--apply", help="Apply changes (default: preview only)"),
+    fsync: str = typer.Option("batch", "--fsync", help="With --apply: none, batch (default) or always"),
+    workers: int = typer.Option(8, "--workers", min=1, help="With --apply: parallel file writes"),
 ) -> None:
     """Standardize YAML frontmatter across notes."""
     cfg = Config.load()
+    if apply:
+        _check_apply(cfg, fsync)
     from obsidian_journal.organize.frontmatter import (
         scan_frontmatter,
         preview_frontmatter,
         apply_frontmatter,
     )
 
-    console.print("[dim]Scanning frontmatter...[/dim]\n")
+    say("[dim]Scanning frontmatter...[/dim]\n")
     suggestions = scan_frontmatter(cfg)
 
     if json_mode:
@@ -516,17 +982,31 @@ def organize_frontmatter(
             for note, front in suggestions
         ]
         if apply and suggestions:
-            count = apply_frontmatter(cfg, suggestions)
-            emit_json({"applied": count, "suggestions": data})
+            with _apply_errors(cfg):
+                result = apply_frontmatter(cfg, suggestions, fsync=fsync, workers=workers)
+            emit_json(
+                {
+                    "applied": result.updated,
+                    "unchanged": result.unchanged,
+                    "bytes_written": result.bytes_written,
+                    "suggestions": data,
+                }
+            )
         else:
-            emit_json({"applied": 0, "suggestions": data})
+            emit_json({"applied": 0, "unchanged": 0, "bytes_written": 0, "suggestions": data})
         raise typer.Exit()
 
     preview_frontmatter(suggestions)
 
     if apply and suggestions:
-        count = apply_frontmatter(cfg, suggestions)
-        console.print(f"\n[bold green]Updated {count} notes.[/bold green]")
+        with _apply_errors(cfg):
+            result = apply_frontmatter(cfg, suggestions, fsync=fsync, workers=workers)
+        console.print(
+            f"\n[bold green]Updated {result.updated} notes "
+            f"({result.bytes_written:,} bytes written).[/bold green]"
+        )
+        if result.unchanged:
+            console.print(f"[dim]{result.unchanged} already up to date; left untouched.[/dim]")
     elif suggestions:
         console.print("\n[dim]Run with --apply to make changes.[/dim]")
 
@@ -535,16 +1015,20 @@ def organize_frontmatter(
 def organize_structure(
     apply: bool = typer.Option(False, "--apply", help="Apply changes (default: preview only)"),
     deep: bool = typer.Option(False, "--deep", help="Use Claude for classification (costs API)"),
+    fsync: str = typer.Option("batch", "--fsync", help="With --apply: none, batch (default) or always"),
+    workers: int = typer.Option(8, "--workers", min=1, help="With --apply: parallel file writes"),
 ) -> None:
     """Suggest folder reorganization for root-level notes."""
     cfg = Config.load()
+    if apply:
+        _check_apply(cfg, fsync)
     from obsidian_journal.organize.structure import (
         scan_structure,
         preview_structure,
         apply_structure,
     )
 
-    console.print("[dim]Analyzing vault structure...[/dim]\n")
+    say("[dim]Analyzing vault structure...[/dim]\n")
     suggestions = scan_structure(cfg, deep=deep)
 
     if json_mode:
@@ -558,7 +1042,8 @@ def organize_structure(
             for s in suggestions
         ]
         if apply and suggestions:
-            count = apply_structure(cfg, suggestions)
+            with _apply_errors(cfg):
+                count = apply_structure(cfg, suggestions, fsync=fsync, workers=workers)
             emit_json({"applied": count, "suggestions": data})
         else:
             emit_json({"applied": 0, "suggestions": data})
@@ -567,7 +1052,8 @@ def organize_structure(
     preview_structure(suggestions)
 
     if apply and suggestions:
-        count = apply_structure(cfg, suggestions)
+        with _apply_errors(cfg):
+            count = apply_structure(cfg, suggestions, fsync=fsync, workers=workers)
         console.print(f"\n[bold green]Moved {count} notes.[/bold green]")
     elif suggestions:
         console.print("\n[dim]Run with --apply to make changes.[/dim]")
@@ -593,6 +1079,9 @@ def config_show() -> None:
             "location_lat": cfg.location_lat,
             "location_lon": cfg.location_lon,
             "daily_notes_folder": cfg.daily_notes_folder,
+            "cache_dir": str(cfg.cache_dir),
+            "data_dir": str(cfg.data_dir),
+            "weather_cache_ttl": cfg.weather_cache_ttl,
         })
         raise typer.Exit()
 
@@ -605,6 +1094,9 @@ def config_show() -> None:
     else:
         console.print("[bold]Location:[/bold]   (not set)")
     console.print(f"[bold]Daily folder:[/bold] {cfg.daily_notes_folder}")
+    console.print(f"[bold]Cache dir:[/bold]  {cfg.cache_dir}")
+    console.print(f"[bold]Data dir:[/bold]   {cfg.data_dir}")
+    console.print(f"[bold]Weather TTL:[/bold] {cfg.weather_cache_ttl}s")
 
 
 @config_app.command("set")
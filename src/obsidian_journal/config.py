@@ -4,7 +4,15 @@ import os
 from dataclasses import dataclass, field
 from pathlib import Path
 
-from dotenv import load_dotenv
+
+def _default_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "obsidian-journal"
+
+
+def _default_data_dir() -> Path:
+    base = os.environ.get("XDG_DATA_HOME") or Path.home() / ".local" / "share"
+    return Path(base) / "obsidian-journal"
 
 
 @dataclass
@@ -16,9 +24,26 @@ class Config:
     location_lat: float | None = None
     location_lon: float | None = None
     daily_notes_folder: str = "Daily Notes"
+    cache_dir: Path = field(default_factory=_default_cache_dir)
+    data_dir: Path = field(default_factory=_default_data_dir)
+    weather_cache_ttl: int = 3600  # seconds a cached forecast counts as fresh
+    outdoor_window_hours: int = 1
+    metrics_enabled: bool = True
+
+    @property
+    def queue_dir(self) -> Path:
+        """Durable queue of deferred captures (`oj journal --defer`)."""
+        return self.data_dir / "queue"
+
+    @property
+    def metrics_path(self) -> Path:
+        """JSONL log of Claude calls and vault scans (`oj metrics`)."""
+        return self.data_dir / "metrics.jsonl"
 
     @classmethod
     def load(cls) -> Config:
+        from dotenv import load_dotenv
+
         load_dotenv()
         vault_path_str = os.environ.get("OBSIDIAN_VAULT_PATH", "")
         if not vault_path_str:
@@ -34,6 +59,8 @@ class Config:
         lon_str = os.environ.get("OJ_LOCATION_LON", "")
         location_lat = float(lat_str) if lat_str else None
         location_lon = float(lon_str) if lon_str else None
+        cache_dir_str = os.environ.get("OJ_CACHE_DIR", "")
+        data_dir_str = os.environ.get("OJ_DATA_DIR", "")
 
         return cls(
             vault_path=vault_path,
@@ -43,4 +70,9 @@ class Config:
             location_lat=location_lat,
             location_lon=location_lon,
             daily_notes_folder=os.environ.get("OJ_DAILY_NOTES_FOLDER", "Daily Notes"),
+            cache_dir=Path(cache_dir_str) if cache_dir_str else _default_cache_dir(),
+            data_dir=Path(data_dir_str) if data_dir_str else _default_data_dir(),
+            weather_cache_ttl=int(os.environ.get("OJ_WEATHER_CACHE_TTL", "3600")),
+            outdoor_window_hours=int(os.environ.get("OJ_OUTDOOR_WINDOW_HOURS", "1")),
+            metrics_enabled=os.environ.get("OJ_METRICS", "1").lower() not in ("0", "false", "no", "off"),
         )
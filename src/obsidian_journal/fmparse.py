@@ -0,0 +1,186 @@
+"""Frontmatter parsing with a fast path for flat YAML headers.
+
+`parse(text)` returns what `frontmatter.parse(text)` does — the same
+metadata (same values, same types) and the same content — but most notes
+never reach PyYAML's pure-Python loader. Their headers are a handful of
+`key: scalar` lines plus block or flow lists of scalars (`date`, `type`,
+`tags`, `related`), which `_load_flat` reads line by line. Scalars are
+still typed by PyYAML's own resolver and constructors, so `date:
+2026-03-01` is a `datetime.date` and `count: 3` an int, exactly as before.
+
+Anything outside that subset (nested mappings, multi-line or block
+scalars, anchors, tags, comments after values, odd indentation) goes to
+PyYAML's C-accelerated safe loader when libyaml is available, else the
+pure-Python one; non-YAML headers (TOML, JSON) go to python-frontmatter.
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+from typing import Any
+
+import yaml
+from yaml.constructor import SafeConstructor
+from yaml.nodes import ScalarNode
+from yaml.reader import Reader
+from yaml.resolver import Resolver
+
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# python-frontmatter's YAMLHandler delimiter, and its split.
+FM_BOUNDARY_RE = re.compile(r"^-{3,}\s*$", re.MULTILINE)
+
+# Characters PyYAML's reader rejects, plus line breaks other than "\n".
+_UNUSUAL_RE = re.compile(f"{Reader.NON_PRINTABLE.pattern}|[\r\x85\u2028\u2029]")
+_KEY_RE = re.compile(r"([A-Za-z_][A-Za-z0-9_-]*):(?: +(.*?))? *")
+_ITEM_RE = re.compile(r"( *)-(?: +(.*?))? *")
+# Characters that can't start a plain scalar, or change its meaning.
+_INDICATORS = frozenset("-?:,[]{}#&*!|>'\"%@`")
+_SCALAR_TAGS = frozenset(
+    f"tag:yaml.org,2002:{t}" for t in ("str", "int", "float", "bool", "null", "timestamp")
+)
+_STR_TAG = "tag:yaml.org,2002:str"
+
+_resolver = Resolver()
+_constructor = SafeConstructor()
+
+
+class _NotFlat(Exception):
+    """The header needs a real YAML loader."""
+
+
+@functools.lru_cache(maxsize=4096)
+def _plain(value: str, flow: bool = False) -> Any:
+    """A plain (unquoted) scalar, typed the way PyYAML's SafeLoader types it.
+
+    Cached: vaults repeat the same keys, tags and types in every header, and
+    every type a plain scalar resolves to here is immutable.
+    """
+    if (
+        value[0] in _INDICATORS
+        or ": " in value
+        or " #" in value
+        or value.endswith(":")
+        or "\t" in value
+        or (flow and any(c in value for c in ",[]{}"))
+    ):
+        raise _NotFlat
+    tag = _resolver.resolve(ScalarNode, value, (True, False))
+    if tag == _STR_TAG:
+        return value
+    if tag not in _SCALAR_TAGS:
+        raise _NotFlat
+    try:
+        return _constructor.yaml_constructors[tag](_constructor, ScalarNode(tag, value))
+    except (ValueError, yaml.YAMLError) as e:
+        raise _NotFlat from e
+
+
+def _scalar(value: str, flow: bool = False) -> Any:
+    if not value:
+        return None
+    first = value[0]
+    if first == "'":
+        inner = value[1:-1]
+        if len(value) < 2 or value[-1] != "'" or "'" in inner.replace("''", ""):
+            raise _NotFlat
+        return inner.replace("''", "'")
+    if first == '"':
+        inner = value[1:-1]
+        if len(value) < 2 or value[-1] != '"' or '"' in inner or "\\" in inner:
+            raise _NotFlat
+        return inner
+    return _plain(value, flow)
+
+
+def _value(value: str | None) -> Any:
+    if value and value[0] == "[":
+        if value[-1] != "]" or " #" in value or "'" in value or '"' in value:
+            raise _NotFlat
+        inner = value[1:-1].strip()
+        if not inner:
+            return []
+        items = [item.strip() for item in inner.split(",")]
+        if not all(items):
+            raise _NotFlat
+        return [_plain(item, flow=True) for item in items]
+    return _scalar(value or "")
+
+
+def _load_flat(source: str) -> dict[str, Any] | None:
+    """Parse a header of `key: scalar`, `key: [a, b]` and `key:` + `- item`
+    lines (None when there are none); raise `_NotFlat` for anything else."""
+    if _UNUSUAL_RE.search(source):
+        raise _NotFlat
+    data: dict[str, Any] = {}
+    bare: set[str] = set()
+    items: list[Any] | None = None
+    item_indent = -1
+    for line in source.split("\n"):
+        if not line.strip() or line[0] == "#":
+            continue
+        if "\t" in line:
+            raise _NotFlat
+        if line[0] == " " or line[0] == "-":
+            match = _ITEM_RE.fullmatch(line)
+            if match is None or items is None:
+                raise _NotFlat
+            indent = len(match.group(1))
+            if item_indent < 0:
+                item_indent = indent
+            elif indent != item_indent:
+                raise _NotFlat
+            item = match.group(2)
+            if item and (item[0] in "-[{" or item.endswith(":")):
+                raise _NotFlat
+            items.append(_scalar(item or ""))
+            continue
+        match = _KEY_RE.fullmatch(line)
+        if match is None:
+            raise _NotFlat
+        key, value = match.groups()
+        if type(_plain(key)) is not str:
+            raise _NotFlat
+        if value:
+            data[key] = _value(value)
+            items = None
+            bare.discard(key)
+        else:
+            items, item_indent = [], -1
+            data[key] = items
+            bare.add(key)
+    for key in bare:
+        # `key:` alone is null unless list items followed it.
+        if data.get(key) == []:
+            data[key] = None
+    return data or None
+
+
+def load_yaml(source: str) -> Any:
+    """`yaml.safe_load(source)`, via the flat fast path when it applies."""
+    try:
+        return _load_flat(source)
+    except _NotFlat:
+        return yaml.load(source, Loader=_SafeLoader)
+
+
+def dump_yaml(data: dict[str, Any]) -> str:
+    """`data` as block YAML, in its own key order, with python-frontmatter's
+    dumper settings; ends with a newline."""
+    return yaml.dump(data, Dumper=yaml.SafeDumper, default_flow_style=False, allow_unicode=True, sort_keys=False)
+
+
+def parse(text: str) -> tuple[dict[str, Any], str]:
+    """Metadata and content of a note's text, as `frontmatter.parse` returns them."""
+    text = text.strip()
+    if not FM_BOUNDARY_RE.match(text):
+        import frontmatter
+
+        return frontmatter.parse(text)
+    try:
+        _, header, content = FM_BOUNDARY_RE.split(text, 2)
+    except ValueError:
+        return {}, text
+    data = load_yaml(header)
+    return (data if isinstance(data, dict) else {}), content.strip()
@@ -0,0 +1,381 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import json
+import os
+import sys
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Sequence
+
+from obsidian_journal import bitmaps, metrics, profiling, query
+from obsidian_journal.config import Config
+from obsidian_journal.models import Frontmatter, Note
+from obsidian_journal.bitmaps import Postings
+from obsidian_journal.catalogue import Catalogue
+from obsidian_journal.vault import _note_entries, read_note
+
+# Bump when the on-disk layout changes; older files are rebuilt from scratch.
+INDEX_VERSION = 3
+
+# Fields with posting bitmaps; the values come from IndexEntry.values().
+INDEXED_FIELDS = ("tag", "type", "folder")
+
+# Compact (renumber slots, rebuild postings) once over half the slots are free.
+COMPACT_MIN_FREE = 64
+
+SortKey = tuple[str, str]
+
+
+class CursorError(ValueError):
+    """A `--after` cursor that is malformed or from an older index generation."""
+
+
+@dataclass
+class IndexEntry:
+    """A note's metadata, plus the stat fields used to spot changes."""
+
+    path: str
+    mtime_ns: int
+    size: int
+    modified_at: str
+    frontmatter: dict[str, Any]
+    words: int = 0
+
+    @property
+    def sort_key(self) -> SortKey:
+        """(date, path): query order is newest first, ties broken by path."""
+        return (str(self.frontmatter.get("date", "")), self.path)
+
+    def to_note(self) -> Note:
+        """Metadata-only Note (empty body), as `read_note(load_body=False)` returns."""
+        rel = Path(self.path)
+        return Note(
+            title=rel.stem,
+            body="",
+            frontmatter=Frontmatter.from_dict(self.frontmatter),
+            folder=sys.intern(str(rel.parent)) if rel.parent != Path(".") else "",
+            path=self.path,
+            modified_at=self.modified_at,
+        )
+
+    def values(self, field: str) -> list[str]:
+        """The entry's values for an indexed query field (tag, type or folder)."""
+        if field == "tag":
+            return query.tag_list(self.frontmatter.get("tags"))
+        if field == "type":
+            value = self.frontmatter.get("type")
+            return [str(value)] if value else []
+        parent = str(Path(self.path).parent)
+        return [parent if parent != "." else ""]
+
+    def to_list(self) -> list[Any]:
+        return [self.path, self.mtime_ns, self.size, self.modified_at, self.frontmatter, self.words]
+
+    @classmethod
+    def from_list(cls, row: list[Any]) -> IndexEntry:
+        return cls(*row)
+
+
+class VaultIndex:
+    """Note metadata for the whole vault, kept in date/path order.
+
+    Persisted under `cache_dir/index/` and refreshed incrementally: only
+    notes whose mtime or size changed are re-read (for frontmatter and a
+    body word count). The `generation` is a digest of every indexed path
+    and its stat fields, so it changes whenever any note is added, removed
+    or edited.
+
+    Each note keeps a stable slot in `slots` (freed slots hold None until
+    the index is compacted); the tag, type and folder posting bitmaps are
+    keyed by slot, so an edit only touches the bits of that one note.
+    `entries` is the live notes in (date, path) order — a position there is
+    what cursors and date ranges refer to; `order` maps positions to slots.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        slots: list[IndexEntry | None],
+        postings: dict[str, Postings],
+    ) -> None:
+        self.config = config
+        self.slots = slots
+        self._postings = postings
+        self._catalogue: Catalogue | None = None
+        live = [i for i, e in enumerate(slots) if e is not None]
+        self.order = sorted(live, key=lambda i: slots[i].sort_key)  # type: ignore[union-attr]
+        self.entries: list[IndexEntry] = [slots[i] for i in self.order]  # type: ignore[misc]
+        self.keys = [e.sort_key for e in self.entries]
+        self.dates = [k[0] for k in self.keys]
+        self.rank = [-1] * len(slots)
+        for position, slot in enumerate(self.order):
+            self.rank[slot] = position
+        self.live = bitmaps.from_ids(live)
+        digest = hashlib.blake2b(digest_size=8)
+        for e in sorted(self.entries, key=lambda e: e.path):
+            digest.update(f"{e.path}\0{e.mtime_ns}\0{e.size}\n".encode())
+        self.generation = digest.hexdigest()
+
+    @staticmethod
+    def cache_path(config: Config) -> Path:
+        vault_id = hashlib.blake2b(
+            str(config.vault_path.resolve()).encode(), digest_size=8
+        ).hexdigest()
+        return Path(config.cache_dir) / "index" / f"{vault_id}.json"
+
+    @classmethod
+    @profiling.profiled("index.load")
+    def load(cls, config: Config) -> VaultIndex:
+        """The current index: the cached copy, brought up to date with the vault."""
+        start = time.perf_counter()
+        path = cls.cache_path(config)
+        slots, postings = _read_cache(path)
+        by_path = {e.path: i for i, e in enumerate(slots) if e is not None}
+        changes = _Changes()
+        for key, dir_entry in _note_entries(config):
+            try:
+                st = dir_entry.stat()
+            except OSError:
+                continue
+            slot = by_path.pop(key, None)
+            old = slots[slot] if slot is not None else None
+            if old is not None and old.mtime_ns == st.st_mtime_ns and old.size == st.st_size:
+                continue
+            changes.count += 1
+            if slot is not None:
+                changes.remove(old, slot)  # type: ignore[arg-type]
+                slots[slot] = None
+            note = read_note(config, key)
+            if note is None:
+                continue
+            if slot is None:
+                slot = len(slots)
+                slots.append(None)
+            entry = IndexEntry(
+                path=key,
+                mtime_ns=st.st_mtime_ns,
+                size=st.st_size,
+                modified_at=note.modified_at,
+                frontmatter=note.frontmatter.to_dict(),
+                words=len(note.body.split()),
+            )
+            slots[slot] = entry
+            changes.add(entry, slot)
+        for slot in by_path.values():
+            changes.count += 1
+            changes.remove(slots[slot], slot)  # type: ignore[arg-type]
+            slots[slot] = None
+
+        free = sum(e is None for e in slots)
+        if free > COMPACT_MIN_FREE and free * 2 > len(slots):
+            slots = [e for e in slots if e is not None]
+            postings = {f: Postings() for f in INDEXED_FIELDS}
+            changes = _Changes(count=changes.count or 1)
+            for slot, entry in enumerate(slots):
+                changes.add(entry, slot)  # type: ignore[arg-type]
+        for f in INDEXED_FIELDS:
+            postings[f].update(changes.adds[f], changes.removes[f])
+
+        index = cls(config, slots, postings)
+        if changes.count:
+            index.save(path)
+        ms = (time.perf_counter() - start) * 1000
+        metrics.record(
+            config, "scan", "index.load", ms=round(ms, 1), notes=len(index.entries), changed=changes.count
+        )
+        profiling.memory_checkpoint(len(index.entries))
+        return index
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        payload = {
+            "version": INDEX_VERSION,
+            "vault_path": str(self.config.vault_path),
+            "slots": [e.to_list() if e is not None else None for e in self.slots],
+            "postings": {f: p.encode() for f, p in self._postings.items()},
+        }
+        tmp.write_text(json.dumps(payload, default=str), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def encode_cursor(self, entry: IndexEntry) -> str:
+        raw = json.dumps([self.generation, *entry.sort_key], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: str) -> SortKey:
+        """The sort key a cursor points at. Raises CursorError if it can't be used."""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            generation, date, path = json.loads(raw)
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+            raise CursorError("Invalid cursor") from None
+        if generation != self.generation:
+            raise CursorError(
+                "Stale cursor: the vault changed since it was issued; "
+                "rerun the query without --after"
+            )
+        return (str(date), str(path))
+
+    def postings(self, field: str, value: str) -> int:
+        """Slot bitmap of notes whose `field` (tag, type or folder) matches
+        `value`; a trailing `*` or `/*` matches a prefix or a nested tree."""
+        table = self._postings[field]
+        if not value.endswith("*"):
+            return table.get(value)
+        bits = 0
+        for v in table.values():
+            if query.value_matches(value, v):
+                bits |= table.get(v)
+        return bits
+
+    def date_range(self, op: str, value: str) -> range:
+        """Positions (not slots) of the notes matching a date term.
+
+        `dates` and `order` together are a sorted (date, slot) index, so this
+        is two binary searches and the range is already in date order.
+        """
+        return query.date_range(self.dates, op, value)
+
+    def range_bits(self, positions: range) -> int:
+        return bitmaps.from_ids(self.order[positions.start : positions.stop])
+
+    def newest_first(self, bits: int, stop: int, start: int = 0) -> Iterator[int]:
+        """Positions in `[start, stop)` whose slot is set in `bits`, newest first."""
+        count = bits.bit_count()
+        if count * 16 < stop - start:
+            # Sparse: pull out the set slots and sort just those.
+            positions = [self.rank[s] for s in bitmaps.to_ids(bits)]
+            yield from sorted((p for p in positions if start <= p < stop), reverse=True)
+            return
+        buf = bitmaps.to_bytes(bits, len(self.slots) // 8 + 1)
+        for position in range(stop - 1, start - 1, -1):
+            slot = self.order[position]
+            if buf[slot >> 3] >> (slot & 7) & 1:
+                yield position
+
+    def search(
+        self,
+        *,
+        where: str | query.Node | None = None,
+        folder: str | None = None,
+        note_type: str | None = None,
+        tags: list[str] | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        text: str | None = None,
+        limit: int | None = None,
+        after: str | None = None,
+        fields: Sequence[str] | None = None,
+        sort: str = "date",
+    ) -> SearchPage:
+        """Matching notes, newest first, starting just past the `after` cursor.
+
+        `where` is a query expression (see `obsidian_journal.query`), ANDed
+        with the keyword filters. Only ids before the cursor are considered
+        and matching stops once the page is full, so later pages never
+        revisit earlier ones. Raises QuerySyntaxError or CursorError.
+
+        Any other `sort` (see catalogue.SORT_COLUMNS) matches everything,
+        argsorts the matches on the catalogue column, then applies `limit`;
+        such pages have no cursor.
+        """
+        if sort != "date" and after:
+            raise CursorError("--after only works with the default date sort")
+        terms: list[query.Node] = []
+        if where:
+            terms.append(query.parse(where) if isinstance(where, str) else where)
+        terms.extend(query.filter_terms(
+            folder=folder, note_type=note_type, tags=tags, since=since, until=until, text=text
+        ))
+        stop = bisect_left(self.keys, self.decode_cursor(after)) if after else len(self.keys)
+        ids, more, plan = query.execute(
+            self,
+            query.all_of(terms),
+            stop=stop,
+            limit=limit if sort == "date" else None,
+            load=self._load_full,
+        )
+        if sort != "date":
+            sort_start = time.perf_counter()
+            rows = len(ids)
+            ids = self.catalogue().argsort(sort, ids, reverse=sort != "title")[:limit]
+            more = False
+            plan.steps.append(
+                query.PlanStep("sort", f"{sort} (argsort)", rows, len(ids), time.perf_counter() - sort_start)
+            )
+        matched = [self.entries[i] for i in ids]
+        next_cursor = self.encode_cursor(matched[-1]) if more else None
+        load_body = fields is None or "body" in fields
+        return SearchPage(self, matched, next_cursor, load_body, plan)
+
+    def catalogue(self) -> Catalogue:
+        """Columnar view of this index, built on first use."""
+        if self._catalogue is None:
+            self._catalogue = Catalogue(self)
+        return self._catalogue
+
+    def _load_full(self, i: int) -> Note | None:
+        return read_note(self.config, self.entries[i].path)
+
+
+@dataclass
+class SearchPage:
+    """One page of `VaultIndex.search` results. Iterating loads each note lazily."""
+
+    index: VaultIndex
+    entries: list[IndexEntry]
+    next_cursor: str | None
+    load_body: bool
+    plan: query.Plan
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[Note]:
+        for entry in self.entries:
+            if not self.load_body:
+                yield entry.to_note()
+                continue
+            note = read_note(self.index.config, entry.path)
+            if note is not None:
+                yield note
+
+
+class _Changes:
+    """Posting-bit edits collected during a refresh, applied per value at the end."""
+
+    def __init__(self, count: int = 0) -> None:
+        self.count = count
+        self.adds: dict[str, dict[str, list[int]]] = {f: {} for f in INDEXED_FIELDS}
+        self.removes: dict[str, dict[str, list[int]]] = {f: {} for f in INDEXED_FIELDS}
+
+    def add(self, entry: IndexEntry, slot: int) -> None:
+        for f in INDEXED_FIELDS:
+            for v in entry.values(f):
+                self.adds[f].setdefault(v, []).append(slot)
+
+    def remove(self, entry: IndexEntry, slot: int) -> None:
+        for f in INDEXED_FIELDS:
+            for v in entry.values(f):
+                self.removes[f].setdefault(v, []).append(slot)
+
+
+def _read_cache(path: Path) -> tuple[list[IndexEntry | None], dict[str, Postings]]:
+    empty: tuple[list[IndexEntry | None], dict[str, Postings]] = (
+        [],
+        {f: Postings() for f in INDEXED_FIELDS},
+    )
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        if payload.get("version") != INDEX_VERSION:
+            return empty
+        slots = [IndexEntry.from_list(row) if row else None for row in payload["slots"]]
+        postings = {f: Postings(payload["postings"][f]) for f in INDEXED_FIELDS}
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return empty
+    return slots, postings
@@ -4,6 +4,7 @@ from anthropic import Anthropic
 from rich.console import Console
 from rich.markdown import Markdown
 
+from obsidian_journal import metrics
 from obsidian_journal.config import Config
 from obsidian_journal.journal.prompts import OPENING_QUESTIONS, SYSTEM_PROMPT
 from obsidian_journal.models import ConversationMessage, ReflectionType
@@ -52,7 +53,10 @@ def run_conversation(
             break
 
         # Get Claude's follow-up question
-        response = client.messages.create(
+        response = metrics.create_message(
+            config,
+            client,
+            "journal.capture",
             model=config.model,
             max_tokens=300,
             system=SYSTEM_PROMPT,
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from obsidian_journal.models import ConversationMessage, ReflectionType
+
+# A job left in working/ longer than this belonged to a worker that died.
+STALE_CLAIM_SECONDS = 15 * 60
+
+
+@dataclass
+class CaptureJob:
+    """A raw capture waiting for synthesis.
+
+    `note` is filled in once synthesis succeeds and is persisted before the
+    vault write, so a retried job rewrites the same note instead of paying
+    for (and titling) a second one. `path` is the vault-relative file the
+    note was written to, persisted once the write lands.
+    """
+
+    id: str
+    reflection_type: ReflectionType
+    messages: list[ConversationMessage]
+    captured_on: str  # YYYY-MM-DD — the note date, not the synthesis date
+    created_at: str = ""
+    attempts: int = 0
+    last_error: str = ""
+    note: dict[str, Any] | None = None
+    path: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "reflection_type": self.reflection_type.value,
+            "messages": [{"role": m.role, "content": m.content} for m in self.messages],
+            "captured_on": self.captured_on,
+            "created_at": self.created_at,
+            "attempts": self.attempts,
+            "last_error": self.last_error,
+            "note": self.note,
+            "path": self.path,
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> CaptureJob:
+        return cls(
+            id=d["id"],
+            reflection_type=ReflectionType(d["reflection_type"]),
+            messages=[ConversationMessage(**m) for m in d["messages"]],
+            captured_on=d["captured_on"],
+            created_at=d.get("created_at", ""),
+            attempts=d.get("attempts", 0),
+            last_error=d.get("last_error", ""),
+            note=d.get("note"),
+            path=d.get("path", ""),
+        )
+
+
+def _write_durable(path: Path, data: dict[str, Any]) -> None:
+    """Write JSON via temp file + fsync + rename, then fsync the directory."""
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    _fsync_dir(path.parent)
+
+
+def _fsync_dir(path: Path) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@dataclass
+class CaptureQueue:
+    """Durable FIFO of capture jobs, one JSON file per job.
+
+    Jobs wait in `pending/`. A worker claims one by renaming it into
+    `working/` — rename is atomic, so concurrent workers never share a job.
+    A job file whose JSON can't be read is moved to `failed/` rather than
+    retried forever.
+    """
+
+    root: Path
+    pending_dir: Path = field(init=False)
+    working_dir: Path = field(init=False)
+    failed_dir: Path = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.root = Path(self.root)
+        self.pending_dir = self.root / "pending"
+        self.working_dir = self.root / "working"
+        self.failed_dir = self.root / "failed"
+
+    def enqueue(
+        self,
+        reflection_type: ReflectionType,
+        messages: list[ConversationMessage],
+        captured_on: str | None = None,
+    ) -> CaptureJob:
+        self.pending_dir.mkdir(parents=True, exist_ok=True)
+        now = datetime.now(timezone.utc)
+        job = CaptureJob(
+            # Timestamp prefix keeps filename order == capture order.
+            id=f"{now.strftime('%Y%m%dT%H%M%S%f')}-{uuid.uuid4().hex[:8]}",
+            reflection_type=reflection_type,
+            messages=messages,
+            captured_on=captured_on or date.today().isoformat(),
+            created_at=now.isoformat(),
+        )
+        _write_durable(self.pending_dir / f"{job.id}.json", job.to_dict())
+        return job
+
+    def pending(self) -> list[Path]:
+        if not self.pending_dir.is_dir():
+            return []
+        return sorted(self.pending_dir.glob("*.json"))
+
+    def claim(self, path: Path) -> CaptureJob | None:
+        """Move a pending job into working/. None if another worker got it first.
+
+        The file's mtime is set to now before the move, so `recover()` times a
+        claim from when it was claimed, not from when the job was queued.
+        Raises ValueError/KeyError/TypeError if the job file is corrupt (it is
+        then in working/; see `quarantine`).
+        """
+        self.working_dir.mkdir(parents=True, exist_ok=True)
+        dest = self.working_dir / path.name
+        try:
+            os.utime(path)
+            os.replace(path, dest)
+        except FileNotFoundError:
+            return None
+        return CaptureJob.from_dict(json.loads(dest.read_text(encoding="utf-8")))
+
+    def quarantine(self, name: str) -> Path:
+        """Move a claimed job file that can't be parsed into failed/."""
+        self.failed_dir.mkdir(parents=True, exist_ok=True)
+        dest = self.failed_dir / name
+        os.replace(self.working_dir / name, dest)
+        _fsync_dir(self.failed_dir)
+        return dest
+
+    def save(self, job: CaptureJob) -> None:
+        """Persist progress on a claimed job."""
+        _write_durable(self.working_dir / f"{job.id}.json", job.to_dict())
+
+    def complete(self, job: CaptureJob) -> None:
+        (self.working_dir / f"{job.id}.json").unlink(missing_ok=True)
+        _fsync_dir(self.working_dir)
+
+    def release(self, job: CaptureJob) -> None:
+        """Return a claimed job to pending/ (e.g. after exhausting retries)."""
+        self.save(job)
+        os.replace(self.working_dir / f"{job.id}.json", self.pending_dir / f"{job.id}.json")
+        _fsync_dir(self.pending_dir)
+
+    def recover(self, stale_after: float = STALE_CLAIM_SECONDS) -> int:
+        """Requeue jobs whose worker died mid-flight. Returns how many moved.
+
+        A claim is stale when its file hasn't changed for `stale_after`
+        seconds: `claim()` stamps it and every `save()` rewrites it.
+        """
+        if not self.working_dir.is_dir():
+            return 0
+        self.pending_dir.mkdir(parents=True, exist_ok=True)
+        cutoff = time.time() - stale_after
+        moved = 0
+        for path in self.working_dir.glob("*.json"):
+            try:
+                if path.stat().st_mtime > cutoff:
+                    continue
+                os.replace(path, self.pending_dir / path.name)
+            except FileNotFoundError:
+                continue
+            moved += 1
+        return moved
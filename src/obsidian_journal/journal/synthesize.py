@@ -4,6 +4,7 @@ from datetime import date
 
 from anthropic import Anthropic
 
+from obsidian_journal import metrics
 from obsidian_journal.config import Config
 from obsidian_journal.models import ConversationMessage, Frontmatter, Note, ReflectionType
 
@@ -35,9 +36,12 @@ def synthesize_note(
     messages: list[ConversationMessage],
     reflection_type: ReflectionType,
     existing_titles: list[str],
+    *,
+    date_str: str | None = None,
 ) -> Note:
+    """Synthesize a journal note; `date_str` overrides today (deferred captures)."""
     client = Anthropic(api_key=config.anthropic_api_key)
-    today = date.today().isoformat()
+    today = date_str or date.today().isoformat()
 
     # Build conversation transcript
     transcript = "\n\n".join(
@@ -48,7 +52,10 @@ def synthesize_note(
     titles_str = ", ".join(existing_titles[:200])
 
     # Generate note body
-    body_response = client.messages.create(
+    body_response = metrics.create_message(
+        config,
+        client,
+        "journal.synthesize.body",
         model=config.model,
         max_tokens=2000,
         system=SYNTHESIZE_SYSTEM,
@@ -66,7 +73,10 @@ def synthesize_note(
     body = body_response.content[0].text.strip()
 
     # Generate title
-    title_response = client.messages.create(
+    title_response = metrics.create_message(
+        config,
+        client,
+        "journal.synthesize.title",
         model=config.model,
         max_tokens=50,
         system=TITLE_SYSTEM,
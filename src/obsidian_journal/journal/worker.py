@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from obsidian_journal import vault
+from obsidian_journal.config import Config
+from obsidian_journal.journal.queue import CaptureJob, CaptureQueue
+from obsidian_journal.journal.synthesize import synthesize_note
+from obsidian_journal.models import Frontmatter, Note
+
+
+@dataclass
+class JobResult:
+    job_id: str
+    path: Path | None = None
+    error: str = ""
+
+    def to_dict(self) -> dict:
+        d: dict = {"id": self.job_id}
+        if self.path is not None:
+            d["path"] = str(self.path)
+        if self.error:
+            d["error"] = self.error
+        return d
+
+
+@dataclass
+class WorkerReport:
+    results: list[JobResult] = field(default_factory=list)
+
+    @property
+    def written(self) -> list[JobResult]:
+        return [r for r in self.results if r.path is not None]
+
+    @property
+    def failed(self) -> list[JobResult]:
+        return [r for r in self.results if r.path is None]
+
+
+def _note_record(note: Note) -> dict:
+    return {
+        "title": note.title,
+        "body": note.body,
+        "folder": note.folder,
+        "frontmatter": note.frontmatter.to_dict(),
+    }
+
+
+def _note_from_record(record: dict) -> Note:
+    return Note(
+        title=record["title"],
+        body=record["body"],
+        folder=record["folder"],
+        frontmatter=Frontmatter.from_dict(record["frontmatter"]),
+    )
+
+
+def process_job(
+    config: Config, queue: CaptureQueue, job: CaptureJob, existing_titles: list[str]
+) -> Path:
+    """Synthesize (unless already done) and write one claimed job.
+
+    The synthesized note is checkpointed on the job before the vault write,
+    and the path it lands at after it. The write is exclusive, so a note
+    that happens to get the same title as an existing one (e.g. another
+    capture from the same day) is saved as `Title-2.md` instead of replacing
+    it. A job re-run after dying between the write and its checkpoint finds
+    its own bytes already at that name, so it is never written twice.
+    """
+    if job.note is None:
+        note = synthesize_note(
+            config,
+            job.messages,
+            job.reflection_type,
+            existing_titles,
+            date_str=job.captured_on,
+        )
+        job.note = _note_record(note)
+        queue.save(job)
+    if job.path and (config.vault_path / job.path).exists():
+        path = config.vault_path / job.path
+    else:
+        path = vault.write_note(config, _note_from_record(job.note), exclusive=True)
+        job.path = path.relative_to(config.vault_path).as_posix()
+        queue.save(job)
+    queue.complete(job)
+    return path
+
+
+def _run_one(
+    config: Config,
+    queue: CaptureQueue,
+    path: Path,
+    existing_titles: list[str],
+    max_attempts: int,
+    retry_delay: float,
+) -> JobResult | None:
+    try:
+        job = queue.claim(path)
+    except (ValueError, KeyError, TypeError) as exc:
+        # Unreadable job file: retrying can't help, so set it aside.
+        queue.quarantine(path.name)
+        return JobResult(path.stem, error=f"corrupt job moved to failed/: {type(exc).__name__}: {exc}")
+    if job is None:
+        return None  # claimed by a concurrent worker
+    for attempt in range(max_attempts):
+        job.attempts += 1
+        try:
+            return JobResult(job.id, path=process_job(config, queue, job, existing_titles))
+        except Exception as exc:
+            job.last_error = f"{type(exc).__name__}: {exc}"
+            if attempt < max_attempts - 1:
+                time.sleep(retry_delay * 2**attempt)
+    # Out of retries for this run; keep the capture for the next worker.
+    queue.release(job)
+    return JobResult(job.id, error=job.last_error)
+
+
+def run_worker(
+    config: Config,
+    *,
+    concurrency: int = 4,
+    max_attempts: int = 3,
+    retry_delay: float = 2.0,
+) -> WorkerReport:
+    """Drain the capture queue once, synthesizing up to `concurrency` jobs at a time."""
+    queue = CaptureQueue(config.queue_dir)
+    queue.recover()
+    paths = queue.pending()
+    report = WorkerReport()
+    if not paths:
+        return report
+
+    existing_titles = vault.get_all_note_titles(config)
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = [
+            pool.submit(
+                _run_one, config, queue, p, existing_titles, max_attempts, retry_delay
+            )
+            for p in paths
+        ]
+        for future in futures:
+            result = future.result()
+            if result is not None:
+                report.results.append(result)
+    return report
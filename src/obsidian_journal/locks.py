@@ -0,0 +1,103 @@
+"""Advisory cross-process locks for processes writing to the same vault.
+
+Several `oj` processes (parallel agents running `oj journal -q`, `oj plan
+-q` and `oj spec -q`, the capture worker, `oj organize --apply`) may write
+to one vault at once. Two kinds of lock keep them from clobbering each other:
+
+- `note_lock(config, rel_path)`: exclusive per note. It covers one note's
+  read-modify-write, such as `write_daily_plan` replacing the `## Plan`
+  section of a daily note, or a frontmatter splice.
+- `folder_lock(config, rel_folder)`: per folder. Single-note writers hold
+  it shared, under their `note_lock`. A `WriteBatch` commit holds it
+  exclusively for every folder it touches, so no single-note write lands
+  in the middle of a batch.
+
+Locks are `flock(2)` locks on small files in `<cache dir>/locks/`, one per
+vault path, so nothing is added to the vault itself. The kernel releases
+them when the holder exits, even if it crashed. The lock files are left in
+place, because deleting a lock file another process may be waiting on
+would break the lock. Locks are advisory: Obsidian and other editors don't
+take them. On platforms without `fcntl` (Windows) they are no-ops.
+
+Name allocation (`write_spec`'s `-2`, `-3` suffixes) doesn't lock. It uses
+`writebatch.atomic_create`, which fails atomically if the name is already
+taken.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from obsidian_journal.config import Config
+
+LOCK_TIMEOUT = 30.0  # seconds to wait for a lock before giving up
+
+
+class LockTimeout(TimeoutError):
+    """Another process held a vault lock for longer than the timeout."""
+
+
+def locks_dir(config: Config) -> Path:
+    return Path(config.cache_dir) / "locks"
+
+
+def _lock_path(config: Config, kind: str, rel: Path | str) -> Path:
+    rel = Path(rel).as_posix()
+    key = hashlib.blake2b(
+        f"{config.vault_path.resolve()}\0{kind}\0{rel}".encode(), digest_size=10
+    ).hexdigest()
+    return locks_dir(config) / f"{kind}-{key}.lock"
+
+
+@contextmanager
+def _flock(path: Path, *, shared: bool, timeout: float) -> Iterator[None]:
+    if fcntl is None:  # pragma: no cover - Windows
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        mode = (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | fcntl.LOCK_NB
+        deadline = time.monotonic() + timeout
+        delay = 0.001
+        while True:
+            try:
+                fcntl.flock(fd, mode)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    raise LockTimeout(f"timed out after {timeout:g}s waiting for {path}") from None
+                time.sleep(delay)
+                delay = min(delay * 2, 0.05)
+        yield
+    finally:
+        os.close(fd)  # also releases the lock
+
+
+@contextmanager
+def folder_lock(
+    config: Config, rel_folder: Path | str, *, shared: bool = False, timeout: float = LOCK_TIMEOUT
+) -> Iterator[None]:
+    """Hold the lock on a vault folder (`"."` for the vault root)."""
+    with _flock(_lock_path(config, "folder", rel_folder), shared=shared, timeout=timeout):
+        yield
+
+
+@contextmanager
+def note_lock(config: Config, rel_path: Path | str, *, timeout: float = LOCK_TIMEOUT) -> Iterator[None]:
+    """Hold the exclusive lock on one note, and its folder's lock shared."""
+    rel = Path(rel_path)
+    with folder_lock(config, rel.parent, shared=True, timeout=timeout):
+        with _flock(_lock_path(config, "note", rel), shared=False, timeout=timeout):
+            yield
@@ -0,0 +1,162 @@
+"""Local metrics log: one JSONL record per Claude call and per vault scan.
+
+Records are appended to `Config.metrics_path` (under the data dir) and the
+file is rotated once it passes ROTATE_BYTES, keeping KEEP_FILES old copies,
+so trends survive across runs without the log growing unbounded. `oj
+metrics` aggregates them; set OJ_METRICS=0 to stop recording.
+
+    {"ts": "2026-03-01T08:00:00+00:00", "kind": "llm", "name": "journal.capture",
+     "ms": 812.4, "ok": true, "model": "...", "input_tokens": 950, "output_tokens": 61,
+     "cache_read_tokens": 0, "cache_write_tokens": 0}
+    {"ts": "...", "kind": "scan", "name": "index.load", "ms": 41.0, "notes": 10000, "changed": 3}
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+
+from obsidian_journal import profiling
+
+if TYPE_CHECKING:
+    from obsidian_journal.config import Config
+
+ROTATE_BYTES = 4 * 1024 * 1024
+KEEP_FILES = 3
+
+KINDS = ("llm", "scan")  # Claude calls, vault scans
+
+_lock = threading.Lock()
+
+
+def record(config: Config, kind: str, name: str, **fields: Any) -> None:
+    """Append one record; never raises (metrics must not break a command)."""
+    if not config.metrics_enabled:
+        return
+    entry = {
+        "ts": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "kind": kind,
+        "name": name,
+        **fields,
+    }
+    line = json.dumps(entry, default=str, separators=(",", ":")) + "\n"
+    path = config.metrics_path
+    try:
+        with _lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if path.exists() and path.stat().st_size > ROTATE_BYTES:
+                _rotate(path)
+            # One O_APPEND write per record, so concurrent oj processes interleave whole lines.
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line)
+    except OSError:
+        pass
+
+
+def _rotate(path: Path) -> None:
+    for i in range(KEEP_FILES - 1, 0, -1):
+        older = path.with_name(f"{path.name}.{i}")
+        if older.exists():
+            os.replace(older, path.with_name(f"{path.name}.{i + 1}"))
+    os.replace(path, path.with_name(f"{path.name}.1"))
+
+
+def create_message(config: Config, client: Any, site: str, **kwargs: Any) -> Any:
+    """`client.messages.create(**kwargs)`, timed as a profiling span and
+    logged as an `llm` metric tagged with the call `site`."""
+    start = time.perf_counter()
+    try:
+        with profiling.span("messages.create", site=site):
+            response = client.messages.create(**kwargs)
+    except Exception as e:
+        ms = (time.perf_counter() - start) * 1000
+        record(config, "llm", site, ms=round(ms, 1), ok=False, model=kwargs.get("model"), error=type(e).__name__)
+        raise
+    ms = (time.perf_counter() - start) * 1000
+    usage = getattr(response, "usage", None)
+    record(
+        config,
+        "llm",
+        site,
+        ms=round(ms, 1),
+        ok=True,
+        model=kwargs.get("model"),
+        input_tokens=getattr(usage, "input_tokens", 0) or 0,
+        output_tokens=getattr(usage, "output_tokens", 0) or 0,
+        cache_read_tokens=getattr(usage, "cache_read_input_tokens", 0) or 0,
+        cache_write_tokens=getattr(usage, "cache_creation_input_tokens", 0) or 0,
+    )
+    return response
+
+
+def read(config: Config, since: str | None = None) -> Iterator[dict[str, Any]]:
+    """Records oldest first, optionally only those on or after `since` (a date)."""
+    path = config.metrics_path
+    files = [path.with_name(f"{path.name}.{i}") for i in range(KEEP_FILES, 0, -1)] + [path]
+    for file in files:
+        try:
+            f = open(file, encoding="utf-8")
+        except OSError:
+            continue
+        with f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # a torn line from a crash mid-write
+                if since and str(entry.get("ts", ""))[:10] < since:
+                    continue
+                yield entry
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+
+PERIODS = {"day": 10, "month": 7}
+
+
+def summarize(entries: Iterable[dict[str, Any]], *, period: str | None = None) -> list[dict[str, Any]]:
+    """One row per (kind, name[, period]): count, errors, p50/p95/max ms and
+    token or note totals, ordered by kind, name, then period."""
+    groups: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+    for e in entries:
+        key = (e.get("kind", ""), e.get("name", ""))
+        if period:
+            key += (str(e.get("ts", ""))[: PERIODS[period]],)
+        groups.setdefault(key, []).append(e)
+
+    rows = []
+    for key in sorted(groups):
+        group = groups[key]
+        ms = sorted(float(e.get("ms", 0)) for e in group)
+        row: dict[str, Any] = {"kind": key[0], "name": key[1]}
+        if period:
+            row[period] = key[2]
+        row.update(
+            count=len(group),
+            errors=sum(1 for e in group if e.get("ok") is False),
+            p50_ms=percentile(ms, 0.5),
+            p95_ms=percentile(ms, 0.95),
+            max_ms=ms[-1],
+        )
+        if key[0] == "llm":
+            tokens_in = sum(e.get("input_tokens", 0) for e in group)
+            cache_read = sum(e.get("cache_read_tokens", 0) for e in group)
+            row.update(
+                input_tokens=tokens_in,
+                output_tokens=sum(e.get("output_tokens", 0) for e in group),
+                cache_read_tokens=cache_read,
+                cache_hit_rate=round(cache_read / (tokens_in + cache_read), 3) if tokens_in + cache_read else 0.0,
+            )
+        else:
+            row["max_notes"] = max((e.get("notes", 0) for e in group), default=0)
+        rows.append(row)
+    return rows
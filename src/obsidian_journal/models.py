@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any
+from typing import Any, Sequence
 
 
 class ReflectionType(str, Enum):
@@ -14,12 +15,26 @@ class ReflectionType(str, Enum):
     FREE_FORM = "free-form"
 
 
-@dataclass
+def _compact(values: Any) -> Any:
+    """Loaded tag/related lists as tuples of interned strings.
+
+    Vaults repeat the same few tags across thousands of notes, so interning
+    shares one string object per tag. Non-list values pass through as-is.
+    """
+    if not values:
+        return ()
+    if isinstance(values, (list, tuple)):
+        return tuple(sys.intern(v) if isinstance(v, str) else v for v in values)
+    return values
+
+
+@dataclass(slots=True)
 class Frontmatter:
     date: str = ""
     type: str = ""
-    tags: list[str] = field(default_factory=list)
-    related: list[str] = field(default_factory=list)
+    # Lists when built in code; tuples when loaded from the vault (see from_dict).
+    tags: list[str] | tuple[str, ...] = field(default_factory=list)
+    related: list[str] | tuple[str, ...] = field(default_factory=list)
     extra: dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> dict[str, Any]:
@@ -29,14 +44,47 @@ class Frontmatter:
         if self.type:
             d["type"] = self.type
         if self.tags:
-            d["tags"] = self.tags
+            d["tags"] = list(self.tags) if isinstance(self.tags, tuple) else self.tags
         if self.related:
-            d["related"] = self.related
+            d["related"] = list(self.related) if isinstance(self.related, tuple) else self.related
         d.update(self.extra)
         return d
 
-
-@dataclass
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> Frontmatter:
+        """Inverse of `to_dict`: unknown keys land in `extra`.
+
+        The result is the compact loaded form: date, type and tag strings are
+        interned and tags/related are tuples. Copy them to lists to edit.
+        """
+        rest = dict(d)
+        return cls(
+            date=sys.intern(str(rest.pop("date", "") or "")),
+            type=sys.intern(str(rest.pop("type", "") or "")),
+            tags=_compact(rest.pop("tags", None)),
+            related=_compact(rest.pop("related", None)),
+            extra=rest,
+        )
+
+
+# Names accepted by `Note.to_dict(fields=...)` / `oj query --fields`.
+# date/type/tags/related are lifted out of the frontmatter for convenience.
+NOTE_FIELDS = (
+    "path",
+    "title",
+    "folder",
+    "filename",
+    "modified_at",
+    "date",
+    "type",
+    "tags",
+    "related",
+    "frontmatter",
+    "body",
+)
+
+
+@dataclass(slots=True)
 class Note:
     title: str
     body: str
@@ -49,7 +97,10 @@ class Note:
     def filename(self) -> str:
         return f"{self.title}.md"
 
-    def to_dict(self) -> dict[str, Any]:
+    def to_dict(self, fields: Sequence[str] | None = None) -> dict[str, Any]:
+        """Full JSON shape, or only the named `fields` (see NOTE_FIELDS), in that order."""
+        if fields is not None:
+            return {f: self._field(f) for f in fields}
         d: dict[str, Any] = {
             "title": self.title,
             "folder": self.folder,
@@ -63,19 +114,33 @@ class Note:
             d["modified_at"] = self.modified_at
         return d
 
+    def _field(self, name: str) -> Any:
+        if name == "filename":
+            return self.filename
+        if name == "frontmatter":
+            return self.frontmatter.to_dict()
+        if name in ("date", "type"):
+            return getattr(self.frontmatter, name)
+        if name in ("tags", "related"):
+            from obsidian_journal.query import tag_list
+
+            # A scalar `tags: work` is one tag, as query treats it.
+            return tag_list(getattr(self.frontmatter, name))
+        return getattr(self, name)
+
     def to_summary_dict(self) -> dict[str, Any]:
         """Slim shape for `oj list --json`: path, title, modified_at, tags."""
         return {
             "path": self.path,
             "title": self.title,
             "modified_at": self.modified_at,
-            "tags": list(self.frontmatter.tags),
+            "tags": self._field("tags"),
             "date": self.frontmatter.date,
             "type": self.frontmatter.type,
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class SpecNote(Note):
     """A project-idea / feature spec written by `oj spec`.
 
@@ -88,8 +153,10 @@ class SpecNote(Note):
     status: str = ""
     source: str = ""
 
-    def to_dict(self) -> dict[str, Any]:
-        d = super().to_dict()
+    def to_dict(self, fields: Sequence[str] | None = None) -> dict[str, Any]:
+        d = super().to_dict(fields)
+        if fields is not None:
+            return d
         if self.complexity:
             d["complexity"] = self.complexity
         if self.priority:
@@ -107,6 +174,36 @@ class ConversationMessage:
     content: str
 
 
+@dataclass
+class OutdoorWindow:
+    """A scored stretch of consecutive daylight hours on one forecast day."""
+
+    date: str
+    start: str  # "HH:MM"
+    end: str  # "HH:MM"
+    score: float
+    temperature_f: float  # mean over the window
+    precipitation_chance: int  # worst hour
+    wind_speed_mph: float  # worst hour
+    condition: str  # worst hour
+
+    @property
+    def label(self) -> str:
+        return f"{self.start}-{self.end}"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "date": self.date,
+            "start": self.start,
+            "end": self.end,
+            "score": self.score,
+            "temperature_f": self.temperature_f,
+            "precipitation_chance": self.precipitation_chance,
+            "wind_speed_mph": self.wind_speed_mph,
+            "condition": self.condition,
+        }
+
+
 @dataclass
 class WeatherInfo:
     temperature_high_f: float
@@ -118,6 +215,7 @@ class WeatherInfo:
     sunset: str
     best_outdoor_window: str
     summary: str
+    outdoor_windows: list[OutdoorWindow] = field(default_factory=list)
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -130,4 +228,5 @@ class WeatherInfo:
             "sunset": self.sunset,
             "best_outdoor_window": self.best_outdoor_window,
             "summary": self.summary,
+            "outdoor_windows": [w.to_dict() for w in self.outdoor_windows],
         }
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
-from anthropic import Anthropic
-
+from obsidian_journal import metrics, profiling
 from obsidian_journal.config import Config
 
 
+@profiling.profiled("organize.analyze_content")
 def analyze_content(config: Config, prompt: str, content: str) -> str:
+    # Deferred: only --deep scans call Claude, and anthropic is slow to import.
+    from anthropic import Anthropic
+
     client = Anthropic(api_key=config.anthropic_api_key)
-    response = client.messages.create(
+    response = metrics.create_message(
+        config,
+        client,
+        "organize.analyze",
         model=config.model,
         max_tokens=1500,
         system=prompt,
@@ -1,16 +1,12 @@
 from __future__ import annotations
 
 import re
-from pathlib import Path
-
-from rich.console import Console
-from rich.table import Table
+from dataclasses import dataclass
 
 from obsidian_journal.config import Config
 from obsidian_journal.models import Frontmatter, Note
-from obsidian_journal import vault
-
-console = Console()
+from obsidian_journal import profiling, vault
+from obsidian_journal.writebatch import DEFAULT_WORKERS, WriteBatch
 
 # Match inline tags like "Tags: #tag1 #tag2" or "tags: #foo, #bar"
 INLINE_TAGS_RE = re.compile(r"^[Tt]ags?:\s*(.+)$", re.MULTILINE)
@@ -20,12 +16,15 @@ TAG_RE = re.compile(r"#([\w/\-]+)")
 DAILY_NOTE_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})")
 
 
+@profiling.profiled("organize.scan_frontmatter")
 def scan_frontmatter(config: Config) -> list[tuple[Note, Frontmatter]]:
-    """Scan notes and return list of (note, suggested_frontmatter) for notes needing updates."""
-    notes = vault.list_notes(config)
+    """Scan notes and return list of (note, suggested_frontmatter) for notes needing updates.
+
+    Notes are streamed; only those with a suggestion stay in memory.
+    """
     suggestions: list[tuple[Note, Frontmatter]] = []
 
-    for note in notes:
+    for note in vault.iter_notes(config):
         new_front = _suggest_frontmatter(note)
         if new_front:
             suggestions.append((note, new_front))
@@ -77,6 +76,10 @@ def _suggest_frontmatter(note: Note) -> Frontmatter | None:
 
 
 def preview_frontmatter(suggestions: list[tuple[Note, Frontmatter]]) -> None:
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
     if not suggestions:
         console.print("[green]All notes have complete frontmatter.[/green]")
         return
@@ -100,12 +103,39 @@ def preview_frontmatter(suggestions: list[tuple[Note, Frontmatter]]) -> None:
     console.print(table)
 
 
-def apply_frontmatter(config: Config, suggestions: list[tuple[Note, Frontmatter]]) -> int:
-    count = 0
-    for note, new_front in suggestions:
-        note.frontmatter = new_front
-        # Remove inline tags line from body if we extracted them
-        note.body = INLINE_TAGS_RE.sub("", note.body).strip()
-        vault.write_note(config, note)
-        count += 1
-    return count
+@dataclass
+class ApplyResult:
+    updated: int = 0
+    unchanged: int = 0
+    bytes_written: int = 0
+
+
+def apply_frontmatter(
+    config: Config,
+    suggestions: list[tuple[Note, Frontmatter]],
+    *,
+    fsync: str = "batch",
+    workers: int = DEFAULT_WORKERS,
+) -> ApplyResult:
+    """Write suggested frontmatter by splicing each note's header in place.
+
+    Only keys whose value changed are re-rendered; the body is copied through
+    byte for byte, minus any inline tags lines. Notes that would come out
+    identical aren't rewritten. The rewrites land as one atomic write batch
+    (see `writebatch`).
+    """
+    result = ApplyResult()
+    with WriteBatch(config, fsync=fsync, workers=workers) as batch:
+        for note, new_front in suggestions:
+            current = note.frontmatter.to_dict()
+            updates = {k: v for k, v in new_front.to_dict().items() if current.get(k) != v}
+            # Remove inline tags lines from the body; their tags are in `updates`
+            drop = [line for m in INLINE_TAGS_RE.finditer(note.body) for line in m.group(0).splitlines()]
+            written = vault.splice_frontmatter(config, note.path, updates, drop_lines=drop, batch=batch)
+            if written:
+                result.updated += 1
+                result.bytes_written += written
+            else:
+                result.unchanged += 1
+            note.frontmatter = new_front
+    return result
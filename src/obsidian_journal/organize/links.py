@@ -3,15 +3,11 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass
 
-from rich.console import Console
-from rich.table import Table
-
 from obsidian_journal.config import Config
 from obsidian_journal.models import Note
 from obsidian_journal.organize.analyze import analyze_content
-from obsidian_journal import vault
-
-console = Console()
+from obsidian_journal import profiling, vault
+from obsidian_journal.writebatch import DEFAULT_WORKERS, WriteBatch
 
 # Match existing wikilinks to avoid double-linking
 WIKILINK_RE = re.compile(r"\[\[([^\]]+)\]\]")
@@ -33,12 +29,12 @@ class LinkSuggestion:
     context: str  # The line where the mention appears
 
 
+@profiling.profiled("organize.scan_links")
 def scan_links(config: Config, deep: bool = False) -> list[LinkSuggestion]:
-    notes = vault.list_notes(config)
     all_titles = vault.get_all_note_titles(config)
     suggestions: list[LinkSuggestion] = []
 
-    for note in notes:
+    for note in vault.iter_notes(config):
         existing_links = set(WIKILINK_RE.findall(note.body))
 
         # Pass 1: exact title mentions not already linked
@@ -102,6 +98,10 @@ def scan_links(config: Config, deep: bool = False) -> list[LinkSuggestion]:
 
 
 def preview_links(suggestions: list[LinkSuggestion]) -> None:
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
     if not suggestions:
         console.print("[green]No new wikilinks to suggest.[/green]")
         return
@@ -117,7 +117,14 @@ def preview_links(suggestions: list[LinkSuggestion]) -> None:
     console.print(table)
 
 
-def apply_links(config: Config, suggestions: list[LinkSuggestion]) -> int:
+def apply_links(
+    config: Config,
+    suggestions: list[LinkSuggestion],
+    *,
+    fsync: str = "batch",
+    workers: int = DEFAULT_WORKERS,
+) -> int:
+    """Rewrite the linked notes as one atomic write batch (see `writebatch`)."""
     # Group suggestions by note
     by_note: dict[str, list[LinkSuggestion]] = {}
     for s in suggestions:
@@ -125,21 +132,22 @@ def apply_links(config: Config, suggestions: list[LinkSuggestion]) -> int:
         by_note.setdefault(key, []).append(s)
 
     count = 0
-    for _, note_suggestions in by_note.items():
-        note = note_suggestions[0].note
-        body = note.body
-        for s in note_suggestions:
-            if s.context.startswith("(semantic"):
-                # For semantic matches, append a related links section
-                if "## Related" not in body:
-                    body += "\n\n## Related\n"
-                body += f"- [[{s.title_to_link}]]\n"
-            else:
-                # Replace first exact match with wikilink
-                pattern = re.compile(r"\b" + re.escape(s.title_to_link) + r"\b")
-                body = pattern.sub(f"[[{s.title_to_link}]]", body, count=1)
-            count += 1
-        note.body = body
-        vault.write_note(config, note)
+    with WriteBatch(config, fsync=fsync, workers=workers) as batch:
+        for _, note_suggestions in by_note.items():
+            note = note_suggestions[0].note
+            body = note.body
+            for s in note_suggestions:
+                if s.context.startswith("(semantic"):
+                    # For semantic matches, append a related links section
+                    if "## Related" not in body:
+                        body += "\n\n## Related\n"
+                    body += f"- [[{s.title_to_link}]]\n"
+                else:
+                    # Replace first exact match with wikilink
+                    pattern = re.compile(r"\b" + re.escape(s.title_to_link) + r"\b")
+                    body = pattern.sub(f"[[{s.title_to_link}]]", body, count=1)
+                count += 1
+            note.body = body
+            batch.write(vault.note_rel_path(note), vault.render_note(note).encode("utf-8"))
 
     return count
@@ -4,15 +4,11 @@ import json
 from dataclasses import dataclass
 from pathlib import Path
 
-from rich.console import Console
-from rich.table import Table
-
 from obsidian_journal.config import Config
 from obsidian_journal.models import Note
 from obsidian_journal.organize.analyze import analyze_content
-from obsidian_journal import vault
-
-console = Console()
+from obsidian_journal import profiling, vault
+from obsidian_journal.writebatch import DEFAULT_WORKERS, WriteBatch
 
 # Keyword-based folder heuristics
 FOLDER_KEYWORDS: dict[str, list[str]] = {
@@ -42,18 +38,18 @@ class MoveSuggestion:
     reason: str
 
 
+@profiling.profiled("organize.scan_structure")
 def scan_structure(config: Config, deep: bool = False) -> list[MoveSuggestion]:
-    notes = vault.list_notes(config)
     suggestions: list[MoveSuggestion] = []
 
-    # Get existing folders
+    # Get existing folders; only root-level notes are kept, since only they move
     existing_folders = set()
-    for note in notes:
+    root_notes: list[Note] = []
+    for note in vault.iter_notes(config):
         if note.folder:
             existing_folders.add(note.folder.split("/")[0])
-
-    # Only look at root-level notes
-    root_notes = [n for n in notes if not n.folder]
+        else:
+            root_notes.append(note)
 
     for note in root_notes:
         if deep:
@@ -104,6 +100,10 @@ def _classify_deep(config: Config, note: Note, folders: set[str]) -> MoveSuggest
 
 
 def preview_structure(suggestions: list[MoveSuggestion]) -> None:
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
     if not suggestions:
         console.print("[green]All notes are well-organized.[/green]")
         return
@@ -120,11 +120,20 @@ def preview_structure(suggestions: list[MoveSuggestion]) -> None:
     console.print(table)
 
 
-def apply_structure(config: Config, suggestions: list[MoveSuggestion]) -> int:
+def apply_structure(
+    config: Config,
+    suggestions: list[MoveSuggestion],
+    *,
+    fsync: str = "batch",
+    workers: int = DEFAULT_WORKERS,
+) -> int:
+    """Move the notes as one atomic write batch (see `writebatch`); a move
+    onto an existing note fails the whole batch before anything moves."""
     count = 0
-    for s in suggestions:
-        src = Path(s.note.filename)
-        dest = Path(s.suggested_folder) / s.note.filename
-        vault.move_note(config, src, dest)
-        count += 1
+    with WriteBatch(config, fsync=fsync, workers=workers) as batch:
+        for s in suggestions:
+            src = Path(s.note.filename)
+            dest = Path(s.suggested_folder) / s.note.filename
+            batch.move(src, dest)
+            count += 1
     return count
@@ -2,10 +2,24 @@ from __future__ import annotations
 
 import json
 import sys
-from typing import Any
+from typing import Any, Iterable
+
+from obsidian_journal import profiling
 
 OJ_VERSION = "0.3"
 
+# Set by `oj --ndjson`: every emission is a single compact line.
+ndjson_mode: bool = False
+
+
+def _with_profiles(data: dict[str, Any]) -> dict[str, Any]:
+    """Attach the `--profile` timing tree and `--memprofile` report, when on."""
+    if profiling.enabled():
+        data = {**data, "_oj_timings": profiling.report()}
+    if profiling.memory_enabled():
+        data = {**data, "_oj_memory": profiling.memory_report()}
+    return data
+
 
 def _stamp(data: Any) -> Any:
     if isinstance(data, dict):
@@ -25,11 +39,65 @@ def emit_json(data: Any) -> None:
     Lists are wrapped as `{"_oj_version": ..., "items": [...]}` so every emission
     is a single object — agents can rely on parsing one top-level dict.
     """
-    sys.stdout.write(json.dumps(_stamp(data), indent=2, default=str))
+    data = _with_profiles(_stamp(data))
+    if ndjson_mode:
+        emit_line(data)
+        return
+    sys.stdout.write(json.dumps(data, indent=2, default=str))
+    sys.stdout.write("\n")
+    sys.stdout.flush()
+
+
+def emit_line(data: Any) -> None:
+    """Emit one compact, stamped JSON object on its own line (NDJSON)."""
+    sys.stdout.write(json.dumps(_stamp(data), default=str, separators=(",", ":")))
     sys.stdout.write("\n")
     sys.stdout.flush()
 
 
+def emit_stream(
+    command: str,
+    items: Iterable[dict[str, Any]],
+    *,
+    trailer: dict[str, Any] | None = None,
+    **header: Any,
+) -> int:
+    """Stream `items` as NDJSON between a header and a trailer record.
+
+    Each item is serialised and written as soon as it is produced, so
+    neither the results nor their JSON text are ever held in memory as a
+    whole. Header and trailer carry `_oj_record` and `_oj_version`; the
+    trailer also carries the item `count`, which is returned, plus any
+    extra `trailer` keys.
+    """
+    write = sys.stdout.write
+    write(
+        json.dumps(
+            {"_oj_version": OJ_VERSION, "_oj_record": "header", "command": command, **header},
+            default=str,
+            separators=(",", ":"),
+        )
+        + "\n"
+    )
+    count = 0
+    for item in items:
+        write(json.dumps(item, default=str, separators=(",", ":")))
+        write("\n")
+        count += 1
+    write(
+        json.dumps(
+            _with_profiles(
+                {"_oj_version": OJ_VERSION, "_oj_record": "trailer", "count": count, **(trailer or {})}
+            ),
+            default=str,
+            separators=(",", ":"),
+        )
+        + "\n"
+    )
+    sys.stdout.flush()
+    return count
+
+
 def emit_error(message: str, code: int = 1) -> None:
     """Emit a JSON error object to stdout and exit with the given code."""
     sys.stdout.write(
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
-from anthropic import Anthropic
+from typing import Callable
+
 from rich.console import Console
 from rich.markdown import Markdown
 
+from obsidian_journal import metrics
 from obsidian_journal.config import Config
 from obsidian_journal.models import ConversationMessage, WeatherInfo
+from obsidian_journal.plan.prefetch import spawn
 from obsidian_journal.plan.prompts import (
     PLAN_SYSTEM_PROMPT,
     PLAN_OPENING_QUESTION,
@@ -16,16 +19,13 @@ from obsidian_journal.plan.prompts import (
 console = Console()
 
 
-def run_plan_conversation(
-    config: Config,
-    weather: WeatherInfo | None = None,
-    existing_content: str | None = None,
-) -> list[ConversationMessage]:
-    client = Anthropic(api_key=config.anthropic_api_key)
-    messages: list[ConversationMessage] = []
-    api_messages: list[dict[str, str]] = []
+def _make_client(config: Config):
+    from anthropic import Anthropic
+
+    return Anthropic(api_key=config.anthropic_api_key)
 
-    # Build system prompt with optional weather and existing note context
+
+def _build_system(weather: WeatherInfo | None, existing_content: str | None) -> str:
     system = PLAN_SYSTEM_PROMPT
     if weather:
         system += "\n\n" + PLAN_WEATHER_CONTEXT.format(
@@ -38,6 +38,27 @@ def run_plan_conversation(
         system += "\n\n" + PLAN_EXISTING_NOTE_CONTEXT.format(
             existing_content=existing_content[:2000],
         )
+    return system
+
+
+def run_plan_conversation(
+    config: Config,
+    weather: WeatherInfo | None = None,
+    existing_content: str | None = None,
+    *,
+    weather_loader: Callable[[], WeatherInfo | None] | None = None,
+) -> list[ConversationMessage]:
+    """Run the interactive planning conversation.
+
+    `weather_loader` lets the caller hand over a forecast that is still in
+    flight: it's only consulted right before the first Claude call, so the
+    opening question never waits on the network.
+    """
+    # Importing anthropic is slow; do it while the user types their first answer.
+    client_future = spawn(_make_client, config)
+    messages: list[ConversationMessage] = []
+    api_messages: list[dict[str, str]] = []
+    system: str | None = None
 
     # Show opening question
     console.print()
@@ -68,8 +89,18 @@ def run_plan_conversation(
             console.print("[dim]Got it. Let me put your plan together...[/dim]")
             break
 
+        # Build system prompt with optional weather and existing note context
+        if system is None:
+            if weather is None and weather_loader is not None:
+                weather = weather_loader()
+            system = _build_system(weather, existing_content)
+
         # Get follow-up question from Claude
-        response = client.messages.create(
+        client = client_future.result()
+        response = metrics.create_message(
+            config,
+            client,
+            "plan.capture",
             model=config.model,
             max_tokens=300,
             system=system,
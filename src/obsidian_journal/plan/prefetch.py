@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from obsidian_journal.config import Config
+from obsidian_journal.models import WeatherInfo
+
+# How long planning will wait on a weather fetch that hasn't landed yet.
+WEATHER_BUDGET_SECONDS = 3.0
+
+
+def spawn(fn: Callable[..., Any], *args: Any) -> Future:
+    """Run `fn(*args)` on a daemon thread and return a Future for its result.
+
+    Daemon threads (rather than a ThreadPoolExecutor) so a hung request can
+    never hold the process open after the command has finished.
+    """
+    future: Future = Future()
+
+    def run() -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args))
+        except BaseException as exc:
+            future.set_exception(exc)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+
+def _fetch_weather(config: Config, date_str: str) -> WeatherInfo | None:
+    from obsidian_journal.plan.weather import fetch_weather
+
+    return fetch_weather(
+        config.location_lat,
+        config.location_lon,
+        date_str=date_str,
+        cache_dir=config.cache_dir,
+        ttl=config.weather_cache_ttl,
+        window_hours=config.outdoor_window_hours,
+    )
+
+
+def _read_daily_note(config: Config, date_str: str) -> str | None:
+    from obsidian_journal import vault
+
+    note = vault.read_daily_note(config, date_str)
+    return note.body if note else None
+
+
+class PlanPrefetch:
+    """Start the independent I/O behind `oj plan` concurrently.
+
+    Weather and the existing daily note are requested as soon as the command
+    starts; callers collect them later with a bounded wait.
+    """
+
+    def __init__(self, config: Config, date_str: str) -> None:
+        self._weather: Future | None = None
+        if config.location_lat is not None and config.location_lon is not None:
+            self._weather = spawn(_fetch_weather, config, date_str)
+        self._daily = spawn(_read_daily_note, config, date_str)
+
+    @property
+    def has_location(self) -> bool:
+        return self._weather is not None
+
+    def weather(self, timeout: float = WEATHER_BUDGET_SECONDS) -> WeatherInfo | None:
+        """Return the forecast if it arrives within `timeout` seconds, else None.
+
+        A late forecast isn't cancelled — a later call can still pick it up.
+        """
+        if self._weather is None:
+            return None
+        try:
+            return self._weather.result(timeout=timeout)
+        except Exception:
+            return None
+
+    def existing_content(self) -> str | None:
+        """Body of today's daily note, or None if there isn't one yet."""
+        try:
+            return self._daily.result()
+        except Exception:
+            return None
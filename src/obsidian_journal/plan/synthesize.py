@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from anthropic import Anthropic
 
+from obsidian_journal import metrics
 from obsidian_journal.config import Config
 from obsidian_journal.models import ConversationMessage, WeatherInfo
 
@@ -64,7 +65,7 @@ def synthesize_plan(
     weather_context = ""
     if weather:
         weather_context = (
-            f"Weather for today:\n"
+            f"Weather for {date_str}:\n"
             f"- Conditions: {weather.condition}\n"
             f"- High: {weather.temperature_high_f:.0f}F, Low: {weather.temperature_low_f:.0f}F\n"
             f"- Precipitation chance: {weather.precipitation_chance}%\n"
@@ -72,10 +73,16 @@ def synthesize_plan(
             f"- Best outdoor window: {weather.best_outdoor_window}\n"
             f"- Sunrise: {weather.sunrise}, Sunset: {weather.sunset}"
         )
+        alternatives = [w.label for w in weather.outdoor_windows[1:]]
+        if alternatives:
+            weather_context += f"\n- Other good outdoor windows: {', '.join(alternatives)}"
 
     system_prompt = PLAN_SYNTHESIZE_SYSTEM.format(weather_context=weather_context)
 
-    response = client.messages.create(
+    response = metrics.create_message(
+        config,
+        client,
+        "plan.synthesize",
         model=config.model,
         max_tokens=2000,
         system=system_prompt,
@@ -1,68 +1,237 @@
 from __future__ import annotations
 
+import json
+import math
+import os
+import time
+from datetime import date
+from itertools import accumulate
+from pathlib import Path
+
 import httpx
 
-from obsidian_journal.models import WeatherInfo
+from obsidian_journal.models import OutdoorWindow, WeatherInfo
 
 OPEN_METEO_URL = "https://api.open-meteo.com/v1/forecast"
 
+# One request covers the coming week: planning any of those days reuses the
+# cached response, and it can stand in for today when a re-fetch fails.
+FORECAST_DAYS = 7
+DEFAULT_CACHE_TTL = 3600
+# Cached responses kept per location for the offline fallback.
+CACHE_KEEP = 7
+
+# Outdoor windows must start at or after 07:00 and finish by 20:00.
+DAYLIGHT_START = 7
+DAYLIGHT_END = 20
 
-def fetch_weather(lat: float, lon: float) -> WeatherInfo | None:
-    """Fetch today's weather forecast from Open-Meteo.
 
+def fetch_weather(
+    lat: float,
+    lon: float,
+    *,
+    date_str: str | None = None,
+    cache_dir: Path | None = None,
+    ttl: int = DEFAULT_CACHE_TTL,
+    url: str = OPEN_METEO_URL,
+    window_hours: int = 1,
+    top_n: int = 3,
+) -> WeatherInfo | None:
+    """Fetch the weather forecast for `date_str` (default today) from Open-Meteo.
+
+    With `cache_dir` set, raw responses are cached on disk (see `fetch_forecast`).
     Returns None on any error so planning can proceed without weather.
     """
     try:
-        params = {
-            "latitude": lat,
-            "longitude": lon,
-            "daily": (
-                "temperature_2m_max,temperature_2m_min,"
-                "precipitation_probability_max,weathercode,"
-                "wind_speed_10m_max,sunrise,sunset"
-            ),
-            "hourly": "temperature_2m,precipitation_probability,weathercode",
-            "temperature_unit": "fahrenheit",
-            "wind_speed_unit": "mph",
-            "timezone": "auto",
-            "forecast_days": 1,
-        }
-        response = httpx.get(OPEN_METEO_URL, params=params, timeout=10.0)
-        response.raise_for_status()
-        data = response.json()
-
-        daily = data["daily"]
-        hourly = data.get("hourly", {})
-
-        temp_high = daily["temperature_2m_max"][0]
-        temp_low = daily["temperature_2m_min"][0]
-        precip_chance = daily["precipitation_probability_max"][0]
-        wind_speed = daily["wind_speed_10m_max"][0]
-        weather_code = daily["weathercode"][0]
-        sunrise = daily["sunrise"][0].split("T")[1] if daily["sunrise"][0] else ""
-        sunset = daily["sunset"][0].split("T")[1] if daily["sunset"][0] else ""
-
-        condition = _weather_code_to_condition(weather_code)
-        best_window = _find_best_outdoor_window(hourly)
-
-        summary = (
-            f"{condition}, high {temp_high:.0f}F / low {temp_low:.0f}F, "
-            f"{precip_chance}% chance of rain, wind {wind_speed:.0f} mph"
+        data = fetch_forecast(lat, lon, cache_dir=cache_dir, ttl=ttl, url=url)
+        if data is None:
+            return None
+        return parse_forecast(
+            data,
+            date_str or date.today().isoformat(),
+            window_hours=window_hours,
+            top_n=top_n,
         )
+    except Exception:
+        return None
 
-        return WeatherInfo(
-            temperature_high_f=temp_high,
-            temperature_low_f=temp_low,
-            condition=condition,
-            precipitation_chance=precip_chance,
-            wind_speed_mph=wind_speed,
-            sunrise=sunrise,
-            sunset=sunset,
-            best_outdoor_window=best_window,
-            summary=summary,
-        )
+
+def fetch_forecast(
+    lat: float,
+    lon: float,
+    *,
+    cache_dir: Path | None = None,
+    ttl: int = DEFAULT_CACHE_TTL,
+    url: str = OPEN_METEO_URL,
+    today: str | None = None,
+) -> dict | None:
+    """Return the raw Open-Meteo response, going through the on-disk cache.
+
+    - A cached response for today younger than `ttl` seconds is returned as-is.
+    - An older one is still returned immediately, and refreshed on a
+      background thread (stale-while-revalidate).
+    - With nothing cached for today, the API is called; if that fails the
+      newest cached response for the location is used instead.
+
+    Without `cache_dir` this is a plain request. Returns None when there is
+    neither a response nor a cached fallback.
+    """
+    if cache_dir is None:
+        try:
+            return _request_forecast(lat, lon, url)
+        except Exception:
+            return None
+
+    cache = ForecastCache(cache_dir)
+    today = today or date.today().isoformat()
+    entry = cache.get(lat, lon, today)
+    if entry is not None:
+        if time.time() - entry["fetched_at"] >= ttl:
+            from obsidian_journal.plan.prefetch import spawn
+
+            spawn(_revalidate, cache, lat, lon, today, url)
+        return entry["data"]
+
+    try:
+        data = _request_forecast(lat, lon, url)
     except Exception:
+        fallback = cache.latest(lat, lon)
+        return fallback["data"] if fallback else None
+    cache.put(lat, lon, today, data)
+    return data
+
+
+def _request_forecast(lat: float, lon: float, url: str = OPEN_METEO_URL) -> dict:
+    params = {
+        "latitude": lat,
+        "longitude": lon,
+        "daily": (
+            "temperature_2m_max,temperature_2m_min,"
+            "precipitation_probability_max,weathercode,"
+            "wind_speed_10m_max,sunrise,sunset"
+        ),
+        "hourly": "temperature_2m,precipitation_probability,weathercode,wind_speed_10m",
+        "temperature_unit": "fahrenheit",
+        "wind_speed_unit": "mph",
+        "timezone": "auto",
+        "forecast_days": FORECAST_DAYS,
+    }
+    response = httpx.get(url, params=params, timeout=10.0)
+    response.raise_for_status()
+    return response.json()
+
+
+def _revalidate(cache: ForecastCache, lat: float, lon: float, today: str, url: str) -> None:
+    try:
+        cache.put(lat, lon, today, _request_forecast(lat, lon, url))
+    except Exception:
+        pass  # keep serving the stale copy
+
+
+class ForecastCache:
+    """Raw forecast responses on disk, keyed by rounded lat/lon and fetch date.
+
+    Coordinates are rounded to two decimals (~1 km), so small config edits
+    still share a cache entry.
+    """
+
+    def __init__(self, cache_dir: Path) -> None:
+        self.root = Path(cache_dir) / "weather"
+
+    @staticmethod
+    def _prefix(lat: float, lon: float) -> str:
+        return f"{lat:.2f}_{lon:.2f}_"
+
+    def _path(self, lat: float, lon: float, day: str) -> Path:
+        return self.root / f"{self._prefix(lat, lon)}{day}.json"
+
+    def _load(self, path: Path) -> dict | None:
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or "data" not in entry:
+            return None
+        return entry
+
+    def get(self, lat: float, lon: float, day: str) -> dict | None:
+        return self._load(self._path(lat, lon, day))
+
+    def latest(self, lat: float, lon: float) -> dict | None:
+        """Newest readable entry for the location, regardless of date."""
+        for path in reversed(self._entries(lat, lon)):
+            entry = self._load(path)
+            if entry is not None:
+                return entry
+        return None
+
+    def put(self, lat: float, lon: float, day: str, data: dict) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        dest = self._path(lat, lon, day)
+        tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+        tmp.write_text(
+            json.dumps({"fetched_at": time.time(), "data": data}), encoding="utf-8"
+        )
+        os.replace(tmp, dest)
+        for old in self._entries(lat, lon)[:-CACHE_KEEP]:
+            old.unlink(missing_ok=True)
+
+    def _entries(self, lat: float, lon: float) -> list[Path]:
+        if not self.root.is_dir():
+            return []
+        return sorted(self.root.glob(f"{self._prefix(lat, lon)}*.json"))
+
+
+def parse_forecast(
+    data: dict, date_str: str, *, window_hours: int = 1, top_n: int = 3
+) -> WeatherInfo | None:
+    """Build a WeatherInfo for `date_str` from a raw multi-day response.
+
+    `outdoor_windows` holds that day's `top_n` best `window_hours`-long windows.
+    Returns None if the response doesn't cover that date.
+    """
+    daily = data["daily"]
+    days = daily.get("time") or []
+    if date_str not in days:
         return None
+    i = days.index(date_str)
+
+    hourly = data.get("hourly", {})
+    windows = find_outdoor_windows(hourly, hours=window_hours, top_n=top_n).get(date_str, [])
+
+    temp_high = daily["temperature_2m_max"][i]
+    temp_low = daily["temperature_2m_min"][i]
+    precip_chance = daily["precipitation_probability_max"][i]
+    wind_speed = daily["wind_speed_10m_max"][i]
+    weather_code = daily["weathercode"][i]
+    sunrise = daily["sunrise"][i].split("T")[1] if daily["sunrise"][i] else ""
+    sunset = daily["sunset"][i].split("T")[1] if daily["sunset"][i] else ""
+
+    condition = _weather_code_to_condition(weather_code)
+    if windows:
+        best_window = windows[0].label
+    elif not hourly or "time" not in hourly:
+        best_window = "midday (no hourly data available)"
+    else:
+        best_window = "midday"
+
+    summary = (
+        f"{condition}, high {temp_high:.0f}F / low {temp_low:.0f}F, "
+        f"{precip_chance}% chance of rain, wind {wind_speed:.0f} mph"
+    )
+
+    return WeatherInfo(
+        temperature_high_f=temp_high,
+        temperature_low_f=temp_low,
+        condition=condition,
+        precipitation_chance=precip_chance,
+        wind_speed_mph=wind_speed,
+        sunrise=sunrise,
+        sunset=sunset,
+        best_outdoor_window=best_window,
+        summary=summary,
+        outdoor_windows=windows,
+    )
 
 
 def _weather_code_to_condition(code: int) -> str:
@@ -93,40 +262,104 @@ def _weather_code_to_condition(code: int) -> str:
     return conditions.get(code, "unknown")
 
 
-def _find_best_outdoor_window(hourly: dict) -> str:
-    """Analyze hourly data to find the best 1-2 hour window for outdoor activity.
+def _code_penalty(code: int) -> int:
+    """Score penalty for a WMO weather code: storms > precipitation > fog."""
+    if code >= 95:
+        return 150
+    if code >= 51:
+        return 80
+    if code in (45, 48):
+        return 20
+    return 0
+
 
-    Prioritizes low precipitation probability and comfortable temperature
-    during daylight hours (7am-7pm).
+def _column(hourly: dict, key: str, n: int, default: float) -> list:
+    values = list(hourly.get(key) or [])[:n]
+    values += [default] * (n - len(values))
+    return [default if v is None else v for v in values]
+
+
+def score_hours(hourly: dict) -> list[float]:
+    """Outdoor comfort score for every hour in a (multi-day) hourly forecast.
+
+    Prefers low precipitation, comfortable temperature (around 68F), light
+    wind and benign weather codes. Hours outside daylight score NaN.
     """
-    if not hourly or "time" not in hourly:
-        return "midday (no hourly data available)"
+    times = hourly.get("time") or []
+    n = len(times)
+    temps = _column(hourly, "temperature_2m", n, 70)
+    precip = _column(hourly, "precipitation_probability", n, 50)
+    wind = _column(hourly, "wind_speed_10m", n, 0)
+    codes = _column(hourly, "weathercode", n, 0)
+    return [
+        (
+            max(0, 100 - p) * 2
+            + max(0, 50 - abs(t - 68))
+            - max(0, w - 10) * 3
+            - _code_penalty(c)
+        )
+        if DAYLIGHT_START <= int(ts[11:13]) < DAYLIGHT_END
+        else math.nan
+        for ts, t, p, w, c in zip(times, temps, precip, wind, codes)
+    ]
+
 
-    times = hourly.get("time", [])
-    temps = hourly.get("temperature_2m", [])
-    precip_probs = hourly.get("precipitation_probability", [])
+def find_outdoor_windows(
+    hourly: dict, *, hours: int = 1, top_n: int = 3
+) -> dict[str, list[OutdoorWindow]]:
+    """Best `hours`-long daylight windows for every day in an hourly forecast.
 
-    best_hour = None
-    best_score = -1
+    Hour scores are turned into prefix sums once, so every window — whatever
+    its length — is scored in constant time. Returns up to `top_n`
+    non-overlapping windows per date, best first.
+    """
+    times = hourly.get("time") or []
+    scores = score_hours(hourly)
+    n = len(scores)
+    if hours < 1 or n < hours:
+        return {}
 
-    for i, time_str in enumerate(times):
-        hour = int(time_str.split("T")[1].split(":")[0])
-        if hour < 7 or hour > 19:
-            continue
+    total = [0.0, *accumulate(0.0 if math.isnan(s) else s for s in scores)]
+    valid = [0, *accumulate(0 if math.isnan(s) else 1 for s in scores)]
 
-        temp = temps[i] if i < len(temps) else 70
-        precip = precip_probs[i] if i < len(precip_probs) else 50
+    candidates: dict[str, list[tuple[float, int]]] = {}
+    for i in range(n - hours + 1):
+        j = i + hours
+        if valid[j] - valid[i] != hours:
+            continue  # window leaves daylight
+        candidates.setdefault(times[i][:10], []).append(((total[j] - total[i]) / hours, i))
 
-        # Score: prefer low precip and comfortable temp (55-80F range)
-        precip_score = max(0, 100 - precip)
-        temp_score = max(0, 50 - abs(temp - 68))
-        score = precip_score * 2 + temp_score
+    temps = _column(hourly, "temperature_2m", n, 70)
+    precip = _column(hourly, "precipitation_probability", n, 50)
+    wind = _column(hourly, "wind_speed_10m", n, 0)
+    codes = _column(hourly, "weathercode", n, 0)
 
-        if score > best_score:
-            best_score = score
-            best_hour = hour
+    windows: dict[str, list[OutdoorWindow]] = {}
+    for day, day_candidates in candidates.items():
+        # Stable sort keeps the earliest window first among equal scores.
+        day_candidates.sort(key=lambda c: c[0], reverse=True)
+        picked: list[OutdoorWindow] = []
+        taken: list[int] = []
+        for score, i in day_candidates:
+            if len(picked) >= top_n:
+                break
+            if any(abs(i - k) < hours for k in taken):
+                continue
+            taken.append(i)
+            end_hour = int(times[i][11:13]) + hours
+            worst_code = max(codes[i : i + hours], key=_code_penalty)
+            picked.append(
+                OutdoorWindow(
+                    date=day,
+                    start=times[i][11:16],
+                    end=f"{end_hour:02d}:00",
+                    score=round(score, 1),
+                    temperature_f=round(sum(temps[i : i + hours]) / hours, 1),
+                    precipitation_chance=max(precip[i : i + hours]),
+                    wind_speed_mph=max(wind[i : i + hours]),
+                    condition=_weather_code_to_condition(worst_code),
+                )
+            )
+        windows[day] = picked
+    return windows
 
-    if best_hour is not None:
-        end_hour = best_hour + 1
-        return f"{best_hour:02d}:00-{end_hour:02d}:00"
-    return "midday"
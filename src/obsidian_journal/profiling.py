@@ -0,0 +1,227 @@
+"""Per-phase timing spans for `oj --profile`, and tracemalloc memory
+reports for `oj --memprofile`.
+
+Spans nest by call stack and are aggregated by name under their parent, so
+100k `read_note` calls inside `list_notes` show up as one node with a call
+count and total time rather than 100k entries. When profiling is off,
+`span()` returns a shared no-op context and `profiled` adds one flag check.
+
+Threads started by a pool don't inherit the caller's span; their spans
+hang off the root.
+
+tracemalloc can't say where memory was allocated at the moment of the
+peak, so the memory report takes a snapshot at each `memory_checkpoint()`
+(placed after a vault scan or index load, and before JSON output) that
+beats the previous largest, and lists the top allocation sites from that
+one.
+"""
+
+from __future__ import annotations
+
+import functools
+import linecache
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_enabled = False
+_lock = threading.Lock()
+_NULL = nullcontext()
+
+
+class Node:
+    __slots__ = ("name", "calls", "seconds", "children")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.children: dict[str, Node] = {}
+
+    def child(self, name: str) -> Node:
+        with _lock:
+            node = self.children.get(name)
+            if node is None:
+                node = self.children[name] = Node(name)
+            return node
+
+    def to_dict(self) -> dict[str, Any]:
+        out: dict[str, Any] = {"name": self.name, "calls": self.calls, "ms": round(self.seconds * 1000, 2)}
+        if self.children:
+            out["children"] = [c.to_dict() for c in self.children.values()]
+        return out
+
+
+_root = Node("oj")
+_started = 0.0
+_current: ContextVar[Node | None] = ContextVar("oj_span", default=None)
+
+
+def enable(name: str = "oj") -> None:
+    """Start recording spans under a fresh root called `name`."""
+    global _enabled, _root, _started
+    _root = Node(name)
+    _started = time.perf_counter()
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+@contextmanager
+def _span(name: str) -> Iterator[Node]:
+    node = (_current.get() or _root).child(name)
+    token = _current.set(node)
+    start = time.perf_counter()
+    try:
+        yield node
+    finally:
+        elapsed = time.perf_counter() - start
+        _current.reset(token)
+        with _lock:
+            node.calls += 1
+            node.seconds += elapsed
+
+
+def span(name: str, site: str | None = None):
+    """Time a block as `name` (or `name (site)`); a no-op unless enabled."""
+    if not _enabled:
+        return _NULL
+    return _span(f"{name} ({site})" if site else name)
+
+
+def profiled(name: str) -> Callable[[F], F]:
+    """Decorator form of `span`."""
+
+    def wrap(fn: F) -> F:
+        @functools.wraps(fn)
+        def inner(*args: Any, **kwargs: Any) -> Any:
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _span(name):
+                return fn(*args, **kwargs)
+
+        return inner  # type: ignore[return-value]
+
+    return wrap
+
+
+def report() -> dict[str, Any]:
+    """The timing tree so far; the root's time is wall time since enable()."""
+    with _lock:
+        _root.calls = 1
+        _root.seconds = time.perf_counter() - _started
+    return _root.to_dict()
+
+
+def format_tree(tree: dict[str, Any] | None = None) -> str:
+    tree = tree or report()
+    lines: list[str] = []
+
+    def walk(node: dict[str, Any], depth: int) -> None:
+        label = "  " * depth + node["name"]
+        calls = f"{node['calls']}x" if node["calls"] > 1 else ""
+        lines.append(f"{label:<48} {calls:>8} {node['ms']:>10.1f} ms")
+        for child in node.get("children", ()):
+            walk(child, depth + 1)
+
+    walk(tree, 0)
+    return "\n".join(lines) + "\n"
+
+
+# --- memory (--memprofile) -------------------------------------------------
+
+_memory_on = False
+_best_snapshot: tracemalloc.Snapshot | None = None
+_best_bytes = 0
+_max_notes = 0
+
+
+def start_memory() -> None:
+    global _memory_on, _best_snapshot, _best_bytes, _max_notes
+    _best_snapshot, _best_bytes, _max_notes = None, 0, 0
+    tracemalloc.start()
+    _memory_on = True
+
+
+def stop_memory() -> None:
+    global _memory_on, _best_snapshot
+    _memory_on = False
+    _best_snapshot = None
+    tracemalloc.stop()
+
+
+def memory_enabled() -> bool:
+    return _memory_on
+
+
+def memory_checkpoint(notes: int | None = None) -> None:
+    """Note how many notes were loaded or scanned so far; snapshot if memory
+    is at a new high."""
+    global _best_snapshot, _best_bytes, _max_notes
+    if not _memory_on:
+        return
+    if notes is not None:
+        _max_notes = max(_max_notes, notes)
+    current = tracemalloc.get_traced_memory()[0]
+    if current > _best_bytes:
+        _best_bytes = current
+        _best_snapshot = tracemalloc.take_snapshot()
+
+
+def memory_report(top: int = 10) -> dict[str, Any]:
+    """Peak traced bytes, bytes per note, and the top allocation sites at
+    the largest checkpoint."""
+    memory_checkpoint()
+    current, peak = tracemalloc.get_traced_memory()
+    sites = []
+    if _best_snapshot is not None:
+        snapshot = _best_snapshot.filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            )
+        )
+        for stat in snapshot.statistics("lineno")[:top]:
+            frame = stat.traceback[0]
+            sites.append(
+                {
+                    "site": f"{frame.filename}:{frame.lineno}",
+                    "code": linecache.getline(frame.filename, frame.lineno).strip(),
+                    "bytes": stat.size,
+                    "blocks": stat.count,
+                }
+            )
+    return {
+        "peak_bytes": peak,
+        "current_bytes": current,
+        "checkpoint_bytes": _best_bytes,
+        "notes": _max_notes,
+        "bytes_per_note": round(peak / _max_notes) if _max_notes else None,
+        "top": sites,
+    }
+
+
+def format_memory(report: dict[str, Any]) -> str:
+    mib = 1024 * 1024
+    lines = [f"peak traced memory  {report['peak_bytes'] / mib:10.1f} MiB"]
+    if report["notes"]:
+        lines.append(f"notes               {report['notes']:10d}  ({report['bytes_per_note']} bytes/note at peak)")
+    lines.append(f"top allocation sites at the largest checkpoint ({report['checkpoint_bytes'] / mib:.1f} MiB):")
+    for site in report["top"]:
+        lines.append(f"  {site['bytes'] / mib:8.1f} MiB {site['blocks']:>9} blocks  {site['site']}")
+        if site["code"]:
+            lines.append(f"  {'':>27}{site['code']}")
+    return "\n".join(lines) + "\n"
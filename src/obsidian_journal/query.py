@@ -0,0 +1,541 @@
+"""Boolean query expressions for `oj query`, and the planner that runs them.
+
+    tag:work AND NOT type:meeting AND date>=2026-01 AND "roadmap"
+
+Terms are `tag:`, `type:`, `folder:`, `date` (with `:` for a prefix match,
+or `>=`, `>`, `<=`, `<`) and free text — a bare word, a "quoted phrase" or
+`text:` — matched case-insensitively against title and body. Terms combine
+with AND (also implied by juxtaposition), OR, NOT and parentheses; NOT binds
+tightest, then AND, then OR.
+
+Date values may be partial: `date<=2026-01` includes all of January and
+`date>2026-01` starts at February.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Iterable
+
+from obsidian_journal.models import Note
+
+if TYPE_CHECKING:
+    from obsidian_journal.index import VaultIndex
+
+FIELDS = {"tag": "tag", "tags": "tag", "type": "type", "folder": "folder", "date": "date", "text": "text"}
+KEYWORDS = ("AND", "OR", "NOT")
+
+_RELATIVE_RE = re.compile(r"(\d+)([dw])")
+
+# Sorts after any character that can follow a date prefix.
+_PREFIX_END = "\uffff"
+
+_TOKEN_RE = re.compile(
+    r"""
+    \s*(?:
+        (?P<paren>[()])
+      | "(?P<quoted>[^"]*)"
+      | (?P<field>[A-Za-z]+)(?P<op>>=|<=|>|<|:|=)(?:"(?P<fquoted>[^"]*)"|(?P<fvalue>[^\s()"]+))
+      | (?P<word>[^\s()"]+)
+    )
+    """,
+    re.VERBOSE,
+)
+
+
+class QuerySyntaxError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Term:
+    field: str  # tag | type | folder | date | text
+    op: str  # ":" for everything but date comparisons
+    value: str
+
+    @property
+    def indexed(self) -> bool:
+        return self.field != "text"
+
+    def __str__(self) -> str:
+        value = f'"{self.value}"' if re.search(r'[\s()"]', self.value) or not self.value else self.value
+        if self.field == "text":
+            return value
+        return f"{self.field}{self.op}{value}"
+
+
+@dataclass(frozen=True)
+class And:
+    children: tuple[Node, ...]
+
+    @property
+    def indexed(self) -> bool:
+        return all(c.indexed for c in self.children)
+
+    def __str__(self) -> str:
+        return " AND ".join(_wrap(c, Or) for c in self.children)
+
+
+@dataclass(frozen=True)
+class Or:
+    children: tuple[Node, ...]
+
+    @property
+    def indexed(self) -> bool:
+        return all(c.indexed for c in self.children)
+
+    def __str__(self) -> str:
+        return " OR ".join(str(c) for c in self.children)
+
+
+@dataclass(frozen=True)
+class Not:
+    child: Node
+
+    @property
+    def indexed(self) -> bool:
+        return self.child.indexed
+
+    def __str__(self) -> str:
+        return f"NOT {_wrap(self.child, (And, Or))}"
+
+
+Node = Term | And | Or | Not
+
+
+def _wrap(node: Node, kinds: type | tuple[type, ...]) -> str:
+    return f"({node})" if isinstance(node, kinds) else str(node)
+
+
+def all_of(nodes: list[Node]) -> Node | None:
+    """AND the nodes together, flattening nested ANDs. None when empty."""
+    flat: list[Node] = []
+    for n in nodes:
+        flat.extend(n.children if isinstance(n, And) else (n,))
+    if not flat:
+        return None
+    return flat[0] if len(flat) == 1 else And(tuple(flat))
+
+
+def parse(expr: str) -> Node:
+    """Parse a query expression. Raises QuerySyntaxError."""
+    tokens = _tokenize(expr)
+    if not tokens:
+        raise QuerySyntaxError("Empty query")
+    parser = _Parser(tokens)
+    node = parser.parse_or()
+    if parser.pos < len(tokens):
+        raise QuerySyntaxError(f"Unexpected {_describe(tokens[parser.pos])}")
+    return node
+
+
+def _tokenize(expr: str) -> list[tuple[str, object]]:
+    tokens: list[tuple[str, object]] = []
+    pos = 0
+    expr = expr.rstrip()
+    while pos < len(expr):
+        m = _TOKEN_RE.match(expr, pos)
+        if not m or m.end() == pos:
+            raise QuerySyntaxError(f"Unterminated quote at position {pos + 1}")
+        pos = m.end()
+        if m["paren"]:
+            tokens.append((m["paren"], None))
+        elif m["quoted"] is not None:
+            tokens.append(("term", Term("text", ":", m["quoted"])))
+        elif m["field"]:
+            tokens.append(("term", _field_term(m["field"], m["op"], m["fquoted"] or m["fvalue"] or "")))
+        elif m["word"] in KEYWORDS:
+            tokens.append((m["word"], None))
+        else:
+            tokens.append(("term", Term("text", ":", m["word"])))
+    return tokens
+
+
+def _field_term(name: str, op: str, value: str) -> Term:
+    field_name = FIELDS.get(name.lower())
+    if field_name is None:
+        raise QuerySyntaxError(f"Unknown field: {name} (expected one of {', '.join(sorted(set(FIELDS.values())))})")
+    if op == "=":
+        op = ":"
+    if field_name != "date" and op != ":":
+        raise QuerySyntaxError(f"{field_name} only supports ':' (got {op!r})")
+    if not value:
+        raise QuerySyntaxError(f"Missing value for {name}{op}")
+    if field_name == "date":
+        value = resolve_date(value)
+    return Term(field_name, op, value)
+
+
+def resolve_date(value: str, today: date | None = None) -> str:
+    """Turn `today`, `yesterday`, `7d` or `2w` (that long before today) into
+    YYYY-MM-DD. Anything else — full or partial dates — passes through."""
+    today = today or date.today()
+    word = value.lower()
+    if word == "today":
+        return today.isoformat()
+    if word == "yesterday":
+        return (today - timedelta(days=1)).isoformat()
+    m = _RELATIVE_RE.fullmatch(word)
+    if m:
+        days = int(m.group(1)) * (7 if m.group(2) == "w" else 1)
+        return (today - timedelta(days=days)).isoformat()
+    return value
+
+
+def _describe(token: tuple[str, object]) -> str:
+    kind, value = token
+    return f"'{value}'" if kind == "term" else f"'{kind}'"
+
+
+class _Parser:
+    def __init__(self, tokens: list[tuple[str, object]]) -> None:
+        self.tokens = tokens
+        self.pos = 0
+
+    def _peek(self) -> str | None:
+        return self.tokens[self.pos][0] if self.pos < len(self.tokens) else None
+
+    def parse_or(self) -> Node:
+        children = [self.parse_and()]
+        while self._peek() == "OR":
+            self.pos += 1
+            children.append(self.parse_and())
+        return children[0] if len(children) == 1 else Or(tuple(children))
+
+    def parse_and(self) -> Node:
+        children = [self.parse_unary()]
+        while self._peek() in ("AND", "NOT", "(", "term"):
+            if self._peek() == "AND":
+                self.pos += 1
+            children.append(self.parse_unary())
+        return all_of(children)  # type: ignore[return-value]
+
+    def parse_unary(self) -> Node:
+        kind = self._peek()
+        if kind == "NOT":
+            self.pos += 1
+            return Not(self.parse_unary())
+        if kind == "(":
+            self.pos += 1
+            node = self.parse_or()
+            if self._peek() != ")":
+                raise QuerySyntaxError("Missing ')'")
+            self.pos += 1
+            return node
+        if kind == "term":
+            self.pos += 1
+            return self.tokens[self.pos - 1][1]  # type: ignore[return-value]
+        if kind is None:
+            raise QuerySyntaxError("Query ends unexpectedly")
+        raise QuerySyntaxError(f"Unexpected {_describe(self.tokens[self.pos])}")
+
+
+# --- per-note evaluation ---------------------------------------------------
+
+
+def date_matches(note_date: str, op: str, value: str) -> bool:
+    """`note_date <op> value` with partial-date semantics (see module docstring)."""
+    if not note_date:
+        return False
+    if op == ">=":
+        return note_date >= value
+    if op == "<":
+        return note_date < value
+    head = note_date[: len(value)]
+    if op == ">":
+        return head > value
+    if op == "<=":
+        return head <= value
+    return head == value
+
+
+def date_range(dates: list[str], op: str, value: str) -> range:
+    """Positions in the sorted `dates` list where `date_matches` holds."""
+    lo = bisect_right(dates, "")  # undated notes sort first and never match
+    hi = len(dates)
+    if op == ">=":
+        lo = max(lo, bisect_left(dates, value))
+    elif op == ">":
+        lo = max(lo, bisect_left(dates, value + _PREFIX_END))
+    elif op == "<":
+        hi = bisect_left(dates, value)
+    elif op == "<=":
+        hi = bisect_left(dates, value + _PREFIX_END)
+    else:
+        lo = max(lo, bisect_left(dates, value))
+        hi = bisect_left(dates, value + _PREFIX_END)
+    return range(lo, max(lo, hi))
+
+
+def filter_terms(
+    *,
+    folder: str | None = None,
+    note_type: str | None = None,
+    tags: list[str] | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    text: str | None = None,
+) -> list[Node]:
+    """The `oj query` keyword filters as terms; `tags` match any of the list."""
+    terms: list[Node] = []
+    if folder:
+        terms.append(Term("folder", ":", folder))
+    if note_type:
+        terms.append(Term("type", ":", note_type))
+    if tags:
+        tag_terms = tuple(Term("tag", ":", t) for t in tags)
+        terms.append(tag_terms[0] if len(tag_terms) == 1 else Or(tag_terms))
+    if since:
+        terms.append(Term("date", ">=", resolve_date(since)))
+    if until:
+        terms.append(Term("date", "<=", resolve_date(until)))
+    if text:
+        terms.append(Term("text", ":", text))
+    return terms
+
+
+def note_matches(node: Node, note: Note, body: Callable[[], str] | None = None) -> bool:
+    """Evaluate `node` against one note. `body` loads the body on demand."""
+    if isinstance(node, And):
+        return all(note_matches(c, note, body) for c in node.children)
+    if isinstance(node, Or):
+        return any(note_matches(c, note, body) for c in node.children)
+    if isinstance(node, Not):
+        return not note_matches(node.child, note, body)
+    front = note.frontmatter
+    if node.field == "tag":
+        return any(value_matches(node.value, t) for t in tag_list(front.tags))
+    if node.field == "type":
+        return bool(front.type) and value_matches(node.value, front.type)
+    if node.field == "folder":
+        return value_matches(node.value, note.folder)
+    if node.field == "date":
+        return date_matches(front.date, node.op, node.value)
+    needle = node.value.lower()
+    if needle in note.title.lower():
+        return True
+    return needle in (body() if body else note.body).lower()
+
+
+def value_matches(pattern: str, value: str) -> bool:
+    """Exact match, or `journal/*` for `journal` and its nested values, or
+    `proj*` for any value starting with `proj`."""
+    if pattern.endswith("/*"):
+        base = pattern[:-2]
+        return value == base or value.startswith(base + "/")
+    if pattern.endswith("*"):
+        return value.startswith(pattern[:-1])
+    return value == pattern
+
+
+def tag_list(tags: object) -> list[str]:
+    if isinstance(tags, str):
+        return [tags]
+    return [str(t) for t in tags or ()]
+
+
+# --- planning and execution over the vault index ---------------------------
+
+
+@dataclass
+class PlanStep:
+    strategy: str  # index | range | scan
+    predicate: str
+    rows_in: int
+    rows_out: int
+    seconds: float
+    depth: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "strategy": self.strategy,
+            "predicate": self.predicate,
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "ms": round(self.seconds * 1000, 3),
+            "depth": self.depth,
+        }
+
+
+@dataclass
+class Plan:
+    expr: str
+    steps: list[PlanStep] = field(default_factory=list)
+    seconds: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "expr": self.expr,
+            "steps": [s.to_dict() for s in self.steps],
+            "ms": round(self.seconds * 1000, 3),
+        }
+
+    def format(self) -> str:
+        lines = [f"plan: {self.expr or '(all notes)'}  [{self.seconds * 1000:.2f} ms]"]
+        for s in self.steps:
+            lines.append(
+                f"{'  ' * (s.depth + 1)}{s.strategy:<5} {s.predicate}  "
+                f"{s.rows_in} -> {s.rows_out} rows, {s.seconds * 1000:.2f} ms"
+            )
+        return "\n".join(lines)
+
+
+class _Executor:
+    """Evaluates index-backed subtrees as slot bitmaps, most selective first."""
+
+    def __init__(self, index: VaultIndex, plan: Plan) -> None:
+        self.index = index
+        self.plan = plan
+        self.depth = 0
+        self.total = len(index.entries)
+
+    def estimate(self, node: Node) -> int:
+        if isinstance(node, Term):
+            if node.field == "date":
+                return len(self.index.date_range(node.op, node.value))
+            return self.index.postings(node.field, node.value).bit_count()
+        if isinstance(node, Not):
+            return self.total - self.estimate(node.child)
+        sizes = [self.estimate(c) for c in node.children]
+        return min(sizes) if isinstance(node, And) else min(self.total, sum(sizes))
+
+    def bits(self, node: Node, domain: int) -> int:
+        start = time.perf_counter()
+        if isinstance(node, Term):
+            if node.field == "date":
+                strategy = "range"
+                matched = self.index.range_bits(self.index.date_range(node.op, node.value))
+            else:
+                strategy = "index"
+                matched = self.index.postings(node.field, node.value)
+            result = domain & matched
+            self._step(strategy, str(node), domain, result, start)
+            return result
+        self.depth += 1
+        step_at = len(self.plan.steps)
+        if isinstance(node, Not):
+            result = domain & ~self.bits(node.child, domain)
+        elif isinstance(node, And):
+            result = domain
+            for child in sorted(node.children, key=self.estimate):
+                result = self.bits(child, result)
+                if not result:
+                    break
+        else:
+            result = 0
+            for child in node.children:
+                result |= self.bits(child, domain & ~result)
+        self.depth -= 1
+        self._step("combine", _label(node), domain, result, start, at=step_at)
+        return result
+
+    def _step(self, strategy, predicate, rows_in, rows_out, start, at=None) -> None:
+        step = PlanStep(
+            strategy,
+            predicate,
+            rows_in.bit_count(),
+            rows_out.bit_count(),
+            time.perf_counter() - start,
+            self.depth,
+        )
+        if at is None:
+            self.plan.steps.append(step)
+        else:
+            self.plan.steps.insert(at, step)
+
+
+def _label(node: Node) -> str:
+    if isinstance(node, Not):
+        return "NOT"
+    return f"{type(node).__name__.upper()}({len(node.children)})"
+
+
+def execute(
+    index: VaultIndex,
+    node: Node | None,
+    *,
+    stop: int,
+    limit: int | None = None,
+    load: Callable[[int], Note | None],
+) -> tuple[list[int], bool, Plan]:
+    """Run `node` over index positions `[0, stop)`, newest first.
+
+    Top-level date terms become a position range (two binary searches over
+    the date-sorted index). Other conjuncts that only touch indexed fields
+    are answered as bitmaps, smallest estimate first, and walked within that
+    range in date order. The rest (anything involving
+    text) are checked note by note over those candidates, newest first,
+    stopping once `limit` + 1 matches are found. Returns the matching
+    positions (at most `limit`), whether more follow, and the executed plan.
+    """
+    plan = Plan(str(node) if node else "")
+    start = time.perf_counter()
+    conjuncts = list(node.children) if isinstance(node, And) else [node] if node else []
+    dated = [c for c in conjuncts if isinstance(c, Term) and c.field == "date"]
+    indexed = all_of([c for c in conjuncts if c.indexed and c not in dated])
+    residual = all_of([c for c in conjuncts if not c.indexed])
+
+    # Top-level date terms narrow the walk to one contiguous, date-ordered
+    # run of positions; no bitmap is built for them.
+    lo = 0
+    if dated:
+        range_start = time.perf_counter()
+        for term in dated:
+            r = index.date_range(term.op, term.value)
+            lo, stop = max(lo, r.start), min(stop, r.stop)
+        stop = max(lo, stop)
+        plan.steps.append(
+            PlanStep(
+                "range",
+                str(all_of(dated)),
+                len(index.entries),
+                stop - lo,
+                time.perf_counter() - range_start,
+            )
+        )
+
+    candidates: Iterable[int]
+    if indexed is not None:
+        bits = _Executor(index, plan).bits(indexed, index.live)
+        candidates = index.newest_first(bits, stop, lo)
+    else:
+        candidates = range(stop - 1, lo - 1, -1)
+
+    matched: list[int] = []
+    more = False
+    scan_start = time.perf_counter()
+    examined = 0
+    for i in candidates:
+        if residual is not None:
+            examined += 1
+            note = index.entries[i].to_note()
+            body = _BodyLoader(load, i)
+            if not note_matches(residual, note, body):
+                continue
+        if limit and len(matched) == limit:
+            more = True
+            break
+        matched.append(i)
+    if residual is not None:
+        plan.steps.append(
+            PlanStep("scan", str(residual), examined, len(matched) + more, time.perf_counter() - scan_start)
+        )
+    plan.seconds = time.perf_counter() - start
+    return matched, more, plan
+
+
+class _BodyLoader:
+    def __init__(self, load: Callable[[int], Note | None], i: int) -> None:
+        self.load = load
+        self.i = i
+        self.body: str | None = None
+
+    def __call__(self) -> str:
+        if self.body is None:
+            note = self.load(self.i)
+            self.body = note.body if note else ""
+        return self.body
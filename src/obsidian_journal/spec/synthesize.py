@@ -5,6 +5,7 @@ from datetime import date
 
 from anthropic import Anthropic
 
+from obsidian_journal import metrics
 from obsidian_journal.config import Config
 from obsidian_journal.models import Frontmatter, SpecNote
 from obsidian_journal.spec.prompt import SPEC_SYSTEM, TITLE_FALLBACK_SYSTEM
@@ -58,7 +59,10 @@ def synthesize_spec(
     titles = existing_titles or []
     titles_str = ", ".join(titles[:200])
 
-    body_response = client.messages.create(
+    body_response = metrics.create_message(
+        config,
+        client,
+        "spec.synthesize.body",
         model=config.model,
         max_tokens=2500,
         system=SPEC_SYSTEM,
@@ -82,7 +86,10 @@ def synthesize_spec(
     elif h1_title:
         title = h1_title
     else:
-        title_response = client.messages.create(
+        title_response = metrics.create_message(
+            config,
+            client,
+            "spec.synthesize.title",
             model=config.model,
             max_tokens=50,
             system=TITLE_FALLBACK_SYSTEM,
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import codecs
+import os
+import re
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from typing import TextIO
+
+# "import time:       485 |      44616 |   typer.main"
+_IMPORTTIME_RE = re.compile(r"^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|( *)(\S+)\s*$")
+_IMPORTTIME_PREFIX = "import time:"
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class StartupProfile:
+    imports: list[ImportRecord]
+    wall_seconds: float
+    exit_code: int
+
+    @property
+    def total_import_us(self) -> int:
+        return sum(r.self_us for r in self.imports)
+
+    def by_package(self) -> list[tuple[str, int]]:
+        """Self time summed per top-level package, slowest first."""
+        totals: dict[str, int] = {}
+        for r in self.imports:
+            root = r.module.split(".")[0]
+            totals[root] = totals.get(root, 0) + r.self_us
+        return sorted(totals.items(), key=lambda kv: kv[1], reverse=True)
+
+    def slowest(self, n: int = 15) -> list[ImportRecord]:
+        """Modules with the largest cumulative time, importtime-style."""
+        return sorted(self.imports, key=lambda r: r.cumulative_us, reverse=True)[:n]
+
+    def to_dict(self, top: int = 15) -> dict:
+        return {
+            "wall_ms": round(self.wall_seconds * 1000, 1),
+            "import_ms": round(self.total_import_us / 1000, 1),
+            "exit_code": self.exit_code,
+            "packages": [
+                {"package": name, "self_ms": round(us / 1000, 1)}
+                for name, us in self.by_package()[:top]
+            ],
+            "slowest": [
+                {
+                    "module": r.module,
+                    "self_ms": round(r.self_us / 1000, 1),
+                    "cumulative_ms": round(r.cumulative_us / 1000, 1),
+                }
+                for r in self.slowest(top)
+            ],
+        }
+
+
+def parse_importtime(stderr: str) -> tuple[list[ImportRecord], str]:
+    """Split `-X importtime` output into records and the remaining stderr text."""
+    records: list[ImportRecord] = []
+    passthrough: list[str] = []
+    for line in stderr.splitlines(keepends=True):
+        m = _IMPORTTIME_RE.match(line)
+        if m:
+            records.append(
+                ImportRecord(
+                    module=m.group(4),
+                    self_us=int(m.group(1)),
+                    cumulative_us=int(m.group(2)),
+                    depth=len(m.group(3)) // 2,
+                )
+            )
+        elif not line.startswith("import time:"):
+            passthrough.append(line)
+    return records, "".join(passthrough)
+
+
+def relay_stderr(fd: int, out: TextIO) -> str:
+    """Copy a child's stderr from `fd` to `out` as it arrives, keeping back
+    only `-X importtime` lines, which are returned.
+
+    Text is forwarded chunk by chunk rather than line by line, so a prompt
+    with no trailing newline (a rich `Prompt.ask` on stderr) shows up
+    before the child waits for input. Only a partial line that could still
+    turn into an importtime line is held until the rest of it arrives.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")("replace")
+    imports: list[str] = []
+    pending = ""
+    while True:
+        chunk = os.read(fd, 65536)
+        lines = (pending + decoder.decode(chunk, final=not chunk)).split("\n")
+        pending = lines.pop()
+        for line in lines:
+            if line.startswith(_IMPORTTIME_PREFIX):
+                imports.append(line + "\n")
+            else:
+                out.write(line + "\n")
+        if pending and not (
+            chunk and (_IMPORTTIME_PREFIX.startswith(pending) or pending.startswith(_IMPORTTIME_PREFIX))
+        ):
+            out.write(pending)
+            pending = ""
+        out.flush()
+        if not chunk:
+            return "".join(imports)
+
+
+def profile_startup(argv: list[str]) -> StartupProfile:
+    """Run `oj <argv>` in a fresh interpreter under `-X importtime`.
+
+    The child's stdout and stdin are its own, so the command's output and
+    any interactive prompts work as usual; its non-importtime stderr is
+    relayed live (see `relay_stderr`).
+    """
+    cmd = [sys.executable, "-X", "importtime", "-m", "obsidian_journal.cli", *argv]
+    env = None
+    if sys.stderr.isatty():
+        # The child's stderr is a pipe; keep rich's colours as they'd be.
+        env = dict(os.environ, FORCE_COLOR="1")
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, stderr=subprocess.PIPE, env=env)
+    with proc.stderr:  # type: ignore[union-attr]
+        imports = relay_stderr(proc.stderr.fileno(), sys.stderr)  # type: ignore[union-attr]
+    exit_code = proc.wait()
+    wall = time.perf_counter() - start
+    records, _ = parse_importtime(imports)
+    return StartupProfile(imports=records, wall_seconds=wall, exit_code=exit_code)
+
+
+def format_profile(profile: StartupProfile, top: int = 15) -> str:
+    lines = [
+        f"startup: {profile.wall_seconds * 1000:.1f} ms wall, "
+        f"{profile.total_import_us / 1000:.1f} ms in imports "
+        f"({len(profile.imports)} modules)",
+        "",
+        "self [ms] | package",
+    ]
+    for name, us in profile.by_package()[:top]:
+        lines.append(f"{us / 1000:9.1f} | {name}")
+    lines += ["", "self [ms] | cumulative [ms] | module"]
+    for r in profile.slowest(top):
+        lines.append(
+            f"{r.self_us / 1000:9.1f} | {r.cumulative_us / 1000:15.1f} | "
+            f"{'  ' * r.depth}{r.module}"
+        )
+    return "\n".join(lines) + "\n"
@@ -1,39 +1,131 @@
 from __future__ import annotations
 
+import os
 import re
 import shutil
+import sys
+import time
+from contextlib import nullcontext
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, Iterable, Iterator, Sequence
 
 import frontmatter as fm
 
+from obsidian_journal import fmparse, locks, metrics, profiling, query, writebatch
 from obsidian_journal.config import Config
 from obsidian_journal.models import Frontmatter, Note, SpecNote
 
+if TYPE_CHECKING:
+    from obsidian_journal.writebatch import WriteBatch
+
 SKIP_DIRS = {".obsidian", ".trash", "Templates"}
 SKIP_PREFIXES = (".smtcmp_",)
 
+FM_BOUNDARY_RE = fmparse.FM_BOUNDARY_RE
 
-def _should_skip(path: Path) -> bool:
-    parts = path.parts
-    for part in parts:
-        if part in SKIP_DIRS or any(part.startswith(p) for p in SKIP_PREFIXES):
-            return True
-    return False
 
+def _skipped(name: str) -> bool:
+    return name in SKIP_DIRS or name.startswith(SKIP_PREFIXES)
 
-def list_notes(config: Config) -> list[Note]:
-    notes: list[Note] = []
-    for md_file in sorted(config.vault_path.rglob("*.md")):
-        rel = md_file.relative_to(config.vault_path)
-        if _should_skip(rel):
-            continue
-        note = read_note(config, rel)
+
+def _note_entries(config: Config) -> Iterator[tuple[str, os.DirEntry[str]]]:
+    """(vault-relative path, DirEntry) of every non-skipped note, in path order.
+
+    An os.scandir walk that prunes skipped folders instead of descending
+    into them; siblings are visited by name, which yields the same order
+    as sorting every path by its parts.
+    """
+
+    def walk(directory: str, prefix: str) -> Iterator[tuple[str, os.DirEntry[str]]]:
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            return
+        for entry in entries:
+            if _skipped(entry.name):
+                continue
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if is_dir:
+                yield from walk(entry.path, f"{prefix}{entry.name}/")
+            elif entry.name.endswith(".md"):
+                yield f"{prefix}{entry.name}", entry
+
+    return walk(str(config.vault_path), "")
+
+
+def _note_paths(config: Config) -> Iterator[str]:
+    """Vault-relative paths of every non-skipped note, in path order."""
+    for rel, _ in _note_entries(config):
+        yield rel
+
+
+def _read_notes(config: Config, load_body: bool) -> Iterator[Note]:
+    for rel in _note_paths(config):
+        note = read_note(config, rel, load_body=load_body)
         if note:
-            notes.append(note)
+            yield note
+
+
+def iter_notes(config: Config, *, load_body: bool = True) -> Iterator[Note]:
+    """Yield every note in path order, reading one file at a time.
+
+    Unlike `list_notes`, nothing is kept once the caller moves on, so peak
+    memory doesn't grow with the vault. With `load_body=False` only
+    frontmatter blocks are read (see `read_note`).
+    """
+    start = time.perf_counter()
+    count = 0
+    for note in _read_notes(config, load_body):
+        count += 1
+        yield note
+    ms = (time.perf_counter() - start) * 1000
+    metrics.record(config, "scan", "iter_notes", ms=round(ms, 1), notes=count, bodies=load_body)
+    profiling.memory_checkpoint(count)
+
+
+@profiling.profiled("vault.list_notes")
+def list_notes(config: Config, *, load_body: bool = True) -> list[Note]:
+    """Every note in path order, as a list. Prefer `iter_notes` when notes
+    are handled one at a time."""
+    start = time.perf_counter()
+    notes = list(_read_notes(config, load_body))
+    ms = (time.perf_counter() - start) * 1000
+    metrics.record(config, "scan", "list_notes", ms=round(ms, 1), notes=len(notes), bodies=load_body)
+    profiling.memory_checkpoint(len(notes))
     return notes
 
 
-def read_note(config: Config, rel_path: Path | str) -> Note | None:
+def _read_header(full_path: Path) -> str | None:
+    """Read just the `---` frontmatter block, stopping at its closing line.
+
+    Returns None when the file doesn't open with a YAML block, so the caller
+    can fall back to a full parse (TOML/JSON frontmatter, or none).
+    """
+    with open(full_path, encoding="utf-8") as f:
+        first = f.readline()
+        if not FM_BOUNDARY_RE.match(first):
+            return None
+        lines = [first]
+        for line in f:
+            lines.append(line)
+            if FM_BOUNDARY_RE.match(line):
+                return "".join(lines)
+    return None
+
+
+@profiling.profiled("vault.read_note")
+def read_note(
+    config: Config, rel_path: Path | str, *, load_body: bool = True
+) -> Note | None:
+    """Read and parse one note.
+
+    With `load_body=False` only the frontmatter block is read from disk and
+    `body` is left empty — for metadata-only callers on large vaults.
+    """
     from datetime import datetime, timezone
 
     rel_path = Path(rel_path)
@@ -41,23 +133,19 @@ def read_note(config: Config, rel_path: Path | str) -> Note | None:
     if not full_path.exists():
         return None
     try:
-        post = fm.load(full_path)
+        header = None if load_body else _read_header(full_path)
+        text = header if header is not None else full_path.read_text(encoding="utf-8")
+        with profiling.span("frontmatter.parse"):
+            metadata, content = fmparse.parse(text)
     except Exception:
         return None
-    meta = dict(post.metadata) if post.metadata else {}
-    front = Frontmatter(
-        date=str(meta.pop("date", "")),
-        type=str(meta.pop("type", "")),
-        tags=meta.pop("tags", []) or [],
-        related=meta.pop("related", []) or [],
-        extra=meta,
-    )
-    folder = str(rel_path.parent) if rel_path.parent != Path(".") else ""
+    front = Frontmatter.from_dict(metadata)
+    folder = sys.intern(str(rel_path.parent)) if rel_path.parent != Path(".") else ""
     title = rel_path.stem
     mtime = datetime.fromtimestamp(full_path.stat().st_mtime, tz=timezone.utc)
     return Note(
         title=title,
-        body=post.content,
+        body=content if load_body else "",
         frontmatter=front,
         folder=folder,
         path=str(rel_path),
@@ -65,13 +153,182 @@ def read_note(config: Config, rel_path: Path | str) -> Note | None:
     )
 
 
-def write_note(config: Config, note: Note) -> Path:
-    folder = config.vault_path / note.folder if note.folder else config.vault_path
-    folder.mkdir(parents=True, exist_ok=True)
-    dest = folder / note.filename
+def note_rel_path(note: Note) -> Path:
+    """Where `write_note` puts `note`, relative to the vault."""
+    return Path(note.folder) / note.filename if note.folder else Path(note.filename)
+
+
+def render_note(note: Note) -> str:
+    """`note` as file text: YAML frontmatter block, blank line, body."""
     post = fm.Post(note.body, **note.frontmatter.to_dict())
-    dest.write_text(fm.dumps(post), encoding="utf-8")
-    return dest
+    return fm.dumps(post)
+
+
+@profiling.profiled("vault.write_note")
+def write_note(config: Config, note: Note, *, exclusive: bool = False) -> Path:
+    """Write `note` and return its path.
+
+    By default a note of the same name is replaced, under its note lock, via
+    a temp file + rename so readers never see a partial note. With
+    `exclusive`, an existing note is never replaced: if `Title.md` is taken,
+    `Title-2.md`, `Title-3.md`, ... are tried, each claimed with an atomic
+    exclusive create (as `write_spec` does), so concurrent writers of the
+    same title each keep their note. A name that already holds exactly
+    these bytes counts as written, which keeps a retried write idempotent.
+    """
+    rel_path = note_rel_path(note)
+    dest = config.vault_path / rel_path
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    data = render_note(note).encode("utf-8")
+    if not exclusive:
+        with locks.note_lock(config, rel_path):
+            writebatch.atomic_write(dest, data)
+        return dest
+    stem, n = dest.stem, 2
+    while True:
+        try:
+            writebatch.atomic_create(dest, data)
+            return dest
+        except FileExistsError:
+            try:
+                if dest.read_bytes() == data:
+                    return dest
+            except FileNotFoundError:
+                continue  # removed meanwhile: try the same name again
+            dest = dest.with_name(f"{stem}-{n}.md")
+            n += 1
+
+
+# A top-level `key:` line of a YAML header; other lines (indented values,
+# list items, comments, blanks) belong to the key above them.
+_TOP_KEY_RE = re.compile(r"([^\s#'\"\-?:,\[\]{}][^:\n]*?):(?:[ \t]|$)")
+
+
+def _header_segments(header: str) -> list[tuple[str | None, str]] | None:
+    """Split a YAML header into (top-level key, its lines) segments, or None
+    when a top-level line isn't a simple `key:` (flow mappings, quoted or
+    complex keys)."""
+    segments: list[tuple[str | None, str]] = []
+    key: str | None = None
+    lines: list[str] = []
+    for line in header.splitlines(keepends=True):
+        if line.strip() and line[0] not in " \t#-":
+            match = _TOP_KEY_RE.match(line)
+            if match is None:
+                return None
+            if lines:
+                segments.append((key, "".join(lines)))
+            key, lines = match.group(1), []
+        lines.append(line)
+    if lines:
+        segments.append((key, "".join(lines)))
+    return segments
+
+
+def _splice_header(header: str, updates: dict[str, Any]) -> str:
+    """`header` with `updates` applied: changed keys are re-rendered in place,
+    new keys appended, and every other line left as it was."""
+    segments = _header_segments(header)
+    keys = [k for k, _ in segments or () if k is not None]
+    if segments is None or len(keys) != len(set(keys)):
+        # Not line-addressable (or has duplicate keys): re-render it all, in file order.
+        metadata = fmparse.load_yaml(header)
+        metadata = dict(metadata) if isinstance(metadata, dict) else {}
+        metadata.update(updates)
+        return fmparse.dump_yaml(metadata) if metadata else ""
+    pending = dict(updates)
+    out = []
+    for key, text in segments:
+        if key is not None and key in pending:
+            text = fmparse.dump_yaml({key: pending.pop(key)})
+        out.append(text)
+    if pending:
+        if out and not out[-1].endswith("\n"):
+            out.append("\n")
+        out.append(fmparse.dump_yaml(pending))
+    return "".join(out)
+
+
+@profiling.profiled("vault.splice_frontmatter")
+def splice_frontmatter(
+    config: Config,
+    rel_path: Path | str,
+    updates: dict[str, Any],
+    *,
+    drop_lines: Iterable[str] = (),
+    batch: WriteBatch | None = None,
+) -> int:
+    """Rewrite just a note's frontmatter block, copying the body through.
+
+    `updates` sets top-level keys: a key already in the header is re-rendered
+    where it is, a new key goes at the end, and every other header line keeps
+    its exact bytes (no key reordering, no re-quoting). Body bytes are
+    streamed to the new file unchanged, except for body lines equal to one
+    of `drop_lines` (compared without their line ending), which are removed.
+
+    Nothing is written when the result would be identical. Otherwise the
+    file is replaced atomically under its note lock, or staged in `batch`
+    when one is given (the batch checks for concurrent changes on commit).
+    Returns the bytes (to be) written, 0 when the file is left alone.
+    """
+    with locks.note_lock(config, rel_path) if batch is None else nullcontext():
+        return _splice_frontmatter(config, rel_path, updates, drop_lines, batch)
+
+
+def _splice_frontmatter(
+    config: Config,
+    rel_path: Path | str,
+    updates: dict[str, Any],
+    drop_lines: Iterable[str],
+    batch: WriteBatch | None,
+) -> int:
+    full_path = config.vault_path / Path(rel_path)
+    drop = {line.encode("utf-8") for line in drop_lines}
+    with open(full_path, "rb") as src:
+        prefix = b""
+        line = src.readline()
+        while line and not line.strip():
+            prefix += line
+            line = src.readline()
+        opening = closing = b""
+        header_lines: list[bytes] = []
+        if FM_BOUNDARY_RE.match(line.decode("utf-8")):
+            opening = line
+            for line in src:
+                if FM_BOUNDARY_RE.match(line.decode("utf-8")):
+                    closing = line
+                    break
+                header_lines.append(line)
+        if closing:
+            old_header = b"".join(header_lines)
+            header = _splice_header(old_header.decode("utf-8"), updates).encode("utf-8")
+            new_head = prefix + opening + header + closing
+            old_head = prefix + opening + old_header + closing
+        else:
+            # No (terminated) frontmatter: the whole file is body.
+            src.seek(0)
+            old_head = b""
+            new_head = b"---\n" + fmparse.dump_yaml(updates).encode("utf-8") + b"---\n\n" if updates else b""
+        body_start = src.tell()
+        dropped = sum(len(l) for l in src if l.rstrip(b"\r\n") in drop) if drop else 0
+        if new_head == old_head and not dropped:
+            return 0
+        size = os.fstat(src.fileno()).st_size
+
+    def write(dst: BinaryIO) -> None:
+        dst.write(new_head)
+        with open(full_path, "rb") as body:
+            body.seek(body_start)
+            if drop:
+                dst.writelines(l for l in body if l.rstrip(b"\r\n") not in drop)
+            else:
+                shutil.copyfileobj(body, dst)
+
+    if batch is not None:
+        batch.write(rel_path, write)
+    else:
+        writebatch.atomic_write(full_path, write)
+    return len(new_head) + size - body_start - dropped
 
 
 def move_note(config: Config, src_rel: Path | str, dest_rel: Path | str) -> Path:
@@ -98,13 +355,12 @@ def list_journal_notes(
     return notes
 
 
+@profiling.profiled("vault.get_all_note_titles")
 def get_all_note_titles(config: Config) -> list[str]:
-    titles: list[str] = []
-    for md_file in sorted(config.vault_path.rglob("*.md")):
-        rel = md_file.relative_to(config.vault_path)
-        if _should_skip(rel):
-            continue
-        titles.append(md_file.stem)
+    start = time.perf_counter()
+    titles = [rel.rpartition("/")[2][:-3] for rel in _note_paths(config)]
+    ms = (time.perf_counter() - start) * 1000
+    metrics.record(config, "scan", "get_all_note_titles", ms=round(ms, 1), notes=len(titles))
     return titles
 
 
@@ -118,49 +374,122 @@ def search_notes(
     until: str | None = None,
     text: str | None = None,
     limit: int | None = None,
+    notes: list[Note] | None = None,
+    fields: Sequence[str] | None = None,
+    where: str | None = None,
 ) -> list[Note]:
-    notes = list_notes(config)
-    if folder:
-        notes = [n for n in notes if n.folder == folder]
-    if note_type:
-        notes = [n for n in notes if n.frontmatter.type == note_type]
-    if tags:
-        notes = [n for n in notes if any(t in n.frontmatter.tags for t in tags)]
-    if since:
-        notes = [n for n in notes if n.frontmatter.date >= since]
-    if until:
-        notes = [n for n in notes if n.frontmatter.date and n.frontmatter.date <= until]
-    if text:
-        text_lower = text.lower()
-        notes = [
-            n for n in notes
-            if text_lower in n.title.lower() or text_lower in n.body.lower()
-        ]
+    """Filter notes, newest first (ties by path). Pass `notes` to search an
+    already-loaded vault; otherwise the persistent vault index is used.
+
+    `where` is a query expression (see `obsidian_journal.query`), ANDed with
+    the keyword filters. `fields` names the output fields the caller will
+    use; when it leaves out `body` (and there's no text filter) note bodies
+    are never read.
+    """
+    if notes is None:
+        return list(
+            iter_search_notes(
+                config,
+                where=where,
+                folder=folder,
+                note_type=note_type,
+                tags=tags,
+                since=since,
+                until=until,
+                text=text,
+                limit=limit,
+                fields=fields,
+            )
+        )
+    terms = [query.parse(where)] if where else []
+    terms.extend(
+        query.filter_terms(
+            folder=folder, note_type=note_type, tags=tags, since=since, until=until, text=text
+        )
+    )
+    node = query.all_of(terms)
+    if node is not None:
+        notes = [n for n in notes if query.note_matches(node, n)]
     # Sort by date descending (notes without dates sort last)
-    notes.sort(key=lambda n: n.frontmatter.date or "", reverse=True)
+    # A new list: `notes` may be the caller's (e.g. a batch session's cache).
+    notes = sorted(notes, key=lambda n: (n.frontmatter.date or "", n.path), reverse=True)
     if limit:
         notes = notes[:limit]
     return notes
 
 
+def iter_search_notes(
+    config: Config,
+    *,
+    folder: str | None = None,
+    note_type: str | None = None,
+    tags: list[str] | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    text: str | None = None,
+    limit: int | None = None,
+    fields: Sequence[str] | None = None,
+    where: str | None = None,
+) -> Iterator[Note]:
+    """`search_notes`, yielding one note at a time with flat memory.
+
+    Matching runs against the vault index's metadata; matches are read as
+    they are yielded, so no more than one body is alive at once. Same
+    results and order as `search_notes`.
+    """
+    from obsidian_journal.index import VaultIndex
+
+    yield from VaultIndex.load(config).search(
+        where=where,
+        folder=folder,
+        note_type=note_type,
+        tags=tags,
+        since=since,
+        until=until,
+        text=text,
+        limit=limit,
+        fields=fields,
+    )
+
+
+def find_note(notes: Iterable[Note], title: str) -> Note | None:
+    """Exact title match first, then case-insensitive partial match.
+
+    One pass, so `notes` may be an `iter_notes` generator; only the first
+    partial match is held while looking for an exact one.
+    """
+    title_lower = title.lower()
+    partial = None
+    for note in notes:
+        if note.title == title:
+            return note
+        if partial is None and title_lower in note.title.lower():
+            partial = note
+    return partial
+
+
+@profiling.profiled("vault.write_spec")
 def write_spec(config: Config, spec: SpecNote, slug: str) -> Path:
     """Write a SpecNote to its folder using the given slug.
 
     If `{slug}.md` already exists, append `-2`, `-3`, ... until a free name is
-    found (matches `oj journal` collision behavior).
+    found (matches `oj journal` collision behavior). Each name is claimed with
+    an atomic exclusive create, so concurrent writers get distinct files.
     """
     folder = config.vault_path / spec.folder if spec.folder else config.vault_path
     folder.mkdir(parents=True, exist_ok=True)
 
+    post = fm.Post(spec.body, **spec.frontmatter.to_dict())
+    data = fm.dumps(post).encode("utf-8")
     candidate = folder / f"{slug}.md"
     n = 2
-    while candidate.exists():
-        candidate = folder / f"{slug}-{n}.md"
-        n += 1
-
-    post = fm.Post(spec.body, **spec.frontmatter.to_dict())
-    candidate.write_text(fm.dumps(post), encoding="utf-8")
-    return candidate
+    while True:
+        try:
+            writebatch.atomic_create(candidate, data)
+            return candidate
+        except FileExistsError:
+            candidate = folder / f"{slug}-{n}.md"
+            n += 1
 
 
 def read_daily_note(config: Config, date_str: str) -> Note | None:
@@ -169,34 +498,37 @@ def read_daily_note(config: Config, date_str: str) -> Note | None:
     return read_note(config, rel_path)
 
 
+@profiling.profiled("vault.write_daily_plan")
 def write_daily_plan(config: Config, date_str: str, plan_markdown: str) -> Path:
     """Create or append a daily plan section to today's daily note.
 
     If the file doesn't exist, create it with frontmatter and the plan body.
     If it exists without a ## Plan section, append the plan.
     If it exists with a ## Plan section, replace that section.
+
+    The read-modify-write holds the note's lock and lands with a temp file +
+    rename, so concurrent writers never lose each other's changes or see a
+    half-written note.
     """
-    folder_path = config.vault_path / config.daily_notes_folder
-    folder_path.mkdir(parents=True, exist_ok=True)
-    dest = folder_path / f"{date_str}.md"
-
-    if dest.exists():
-        existing_content = dest.read_text(encoding="utf-8")
-        if "## Plan" in existing_content:
-            # Replace existing plan section (from ## Plan to next ## or EOF)
-            pattern = r"## Plan\n.*?(?=\n## |\Z)"
-            updated = re.sub(pattern, plan_markdown, existing_content, count=1, flags=re.DOTALL)
-            dest.write_text(updated, encoding="utf-8")
+    rel_path = Path(config.daily_notes_folder) / f"{date_str}.md"
+    dest = config.vault_path / rel_path
+    dest.parent.mkdir(parents=True, exist_ok=True)
+
+    with locks.note_lock(config, rel_path):
+        if dest.exists():
+            existing_content = dest.read_text(encoding="utf-8")
+            if "## Plan" in existing_content:
+                # Replace existing plan section (from ## Plan to next ## or EOF)
+                pattern = r"## Plan\n.*?(?=\n## |\Z)"
+                updated = re.sub(pattern, plan_markdown, existing_content, count=1, flags=re.DOTALL)
+            else:
+                updated = existing_content.rstrip() + "\n\n" + plan_markdown + "\n"
         else:
-            dest.write_text(
-                existing_content.rstrip() + "\n\n" + plan_markdown + "\n",
-                encoding="utf-8",
-            )
-    else:
-        post = fm.Post(plan_markdown)
-        post["date"] = date_str
-        post["type"] = "daily-note"
-        post["tags"] = ["daily"]
-        dest.write_text(fm.dumps(post), encoding="utf-8")
+            post = fm.Post(plan_markdown)
+            post["date"] = date_str
+            post["type"] = "daily-note"
+            post["tags"] = ["daily"]
+            updated = fm.dumps(post)
+        writebatch.atomic_write(dest, updated.encode("utf-8"))
 
     return dest
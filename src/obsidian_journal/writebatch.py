@@ -0,0 +1,422 @@
+"""Atomic, parallel batches of vault writes and moves (`oj organize --apply`).
+
+A `WriteBatch` runs in two phases, so a crash never leaves a half-applied vault
+behind without a record of it:
+
+1. Staging. Each write goes to a hidden temp file next to its target
+   (`.Note.md.<batch>.tmp`) on a bounded I/O thread pool. Moves are checked
+   up front: the source must exist and the destination must not. Nothing in
+   the vault has changed yet. Any failure here deletes the temp files and
+   raises.
+2. Commit. A manifest listing every operation is written durably to
+   `<data dir>/batches/<batch>.json`. Then each existing target is
+   hard-linked to a backup (`.Note.md.<batch>.bak`), its temp file is
+   renamed over it, and each move is done. Once every operation has landed,
+   the backups and the manifest are deleted.
+
+If a manifest is left behind, the batch was interrupted mid-commit.
+`recover()` either finishes it (`resume`) or restores every target from
+its backup (`rollback`). Both are idempotent: an operation's state is read
+from the files on disk, not from the manifest.
+
+The commit holds an exclusive `locks.folder_lock` on every folder it touches,
+so single-note writers in other processes (`write_note`, `write_daily_plan`)
+wait for it, and it waits for them. Under those locks each write target is
+checked against the size and mtime it had when it was staged. If another
+process changed a target since then, the whole batch is discarded with
+`WriteConflict` rather than overwriting that change. The same goes for a
+move whose source is gone, or whose destination now exists.
+
+`fsync` policy: `none` leaves flushing to the OS. `batch` (the default)
+fsyncs every staged file before the commit and each touched folder once
+after it. `always` also fsyncs each folder after every rename.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable
+
+from obsidian_journal import locks
+
+if TYPE_CHECKING:
+    from obsidian_journal.config import Config
+
+FSYNC_POLICIES = ("none", "batch", "always")
+DEFAULT_WORKERS = 8
+
+Writer = Callable[[BinaryIO], None]
+
+
+class WriteConflict(RuntimeError):
+    """A batch target was changed by another process after it was staged."""
+
+    def __init__(self, paths: list[str]) -> None:
+        super().__init__(f"changed by another process since staging: {', '.join(paths)}")
+        self.paths = paths
+
+
+@dataclass
+class Op:
+    op: str  # "write" or "move"
+    path: str  # write target, or move destination (vault-relative)
+    src: str | None = None  # move source
+    tmp: str | None = None  # staged temp file (vault-relative)
+    backup: str | None = None  # where the replaced target is kept until the batch lands
+    expect: list[int] | None = None  # the target's [mtime_ns, size] when staged
+
+
+def batches_dir(config: Config) -> Path:
+    return config.data_dir / "batches"
+
+
+def pending(config: Config) -> list[Path]:
+    """Manifests of interrupted batches for this vault, oldest first."""
+    vault = str(config.vault_path)
+    found = []
+    for path in sorted(batches_dir(config).glob("*.json"), key=lambda p: p.stat().st_mtime):
+        try:
+            manifest = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if manifest.get("vault") == vault:
+            found.append(path)
+    return found
+
+
+def _fsync_dir(path: Path) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _backup(target: Path, backup: Path) -> None:
+    """Keep `target`'s current contents at `backup`: a hard link where the
+    filesystem has them, else a copy."""
+    if backup.exists():
+        return
+    try:
+        os.link(target, backup)
+    except OSError:
+        shutil.copy2(target, backup)
+
+
+def _move(src: Path, dest: Path) -> None:
+    """Rename without clobbering an existing `dest`."""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(src, dest)
+    except FileExistsError:
+        raise
+    except OSError:
+        # No hard links (or another filesystem): check, then move.
+        if dest.exists():
+            raise FileExistsError(str(dest)) from None
+        shutil.move(str(src), str(dest))
+        return
+    os.unlink(src)
+
+
+def _write_file(tmp: Path, target: Path, data: bytes | Writer, fsync: bool) -> int:
+    """Write `data` to `tmp` with `target`'s permissions; returns its size."""
+    with open(tmp, "wb") as f:
+        if isinstance(data, bytes):
+            f.write(data)
+        else:
+            data(f)
+        size = f.tell()
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    if target.exists():
+        shutil.copymode(target, tmp)
+    return size
+
+
+def atomic_write(path: Path, data: bytes | Writer, *, fsync: bool = False) -> int:
+    """Replace one file via a temp file + rename; returns the bytes written."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        size = _write_file(tmp, path, data, fsync)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    if fsync:
+        _fsync_dir(path.parent)
+    return size
+
+
+def atomic_create(path: Path, data: bytes | Writer, *, fsync: bool = False) -> int:
+    """Create `path` with its full contents in one step; raise
+    `FileExistsError` (and leave the existing file alone) if it exists.
+
+    The data goes to a temp file that is then hard-linked to `path`, which
+    fails atomically if the name is taken, so two processes can't claim the
+    same name and no reader sees a half-written file. Where the filesystem
+    has no hard links, an exclusive create (`O_EXCL`) is written in place.
+    """
+    tmp = path.with_name(f".{path.name}.{os.getpid()}-{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        size = _write_file(tmp, path, data, fsync)
+        try:
+            os.link(tmp, path)
+        except FileExistsError:
+            raise
+        except OSError:
+            with open(path, "xb") as f, open(tmp, "rb") as src:
+                shutil.copyfileobj(src, f)
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+    finally:
+        tmp.unlink(missing_ok=True)
+    if fsync:
+        _fsync_dir(path.parent)
+    return size
+
+
+def _stat_key(path: Path) -> list[int] | None:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _changed(vault: Path, op: Op) -> bool:
+    """Whether another process got to `op`'s files since it was staged."""
+    if op.op == "move":
+        return not (vault / op.src).exists() or (vault / op.path).exists()  # type: ignore[operator]
+    return _stat_key(vault / op.path) != op.expect
+
+
+def _lock_folders(config: Config, ops: list[Op], stack: ExitStack) -> None:
+    """Take the folder lock of every folder `ops` touch, in sorted order (so
+    two batches can't deadlock)."""
+    folders = {Path(op.path).parent.as_posix() for op in ops}
+    folders.update(Path(op.src).parent.as_posix() for op in ops if op.src)
+    for folder in sorted(folders):
+        stack.enter_context(locks.folder_lock(config, folder))
+
+
+class WriteBatch:
+    """Stage writes and moves, then `commit()` them as one recoverable batch.
+
+        with WriteBatch(config) as batch:
+            batch.write("Journal/a.md", data)
+            batch.move("b.md", "Projects/b.md")
+        # committed on a clean exit, discarded if the block raised
+    """
+
+    def __init__(self, config: Config, *, fsync: str = "batch", workers: int = DEFAULT_WORKERS) -> None:
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {', '.join(FSYNC_POLICIES)}")
+        self.config = config
+        self.fsync = fsync
+        self.workers = max(1, workers)
+        self.id = f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.ops: list[Op] = []
+        self.bytes_written = 0
+        self._targets: set[str] = set()
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="oj-write")
+        self._futures: list[Future[int]] = []
+        self._done = False
+
+    def __enter__(self) -> WriteBatch:
+        return self
+
+    def __exit__(self, exc_type: object, *exc: object) -> None:
+        if exc_type is None and not self._done:
+            self.commit()
+        else:
+            self.discard()
+
+    def _claim(self, rel: str) -> None:
+        if rel in self._targets:
+            raise ValueError(f"{rel} is already part of this batch")
+        self._targets.add(rel)
+
+    def write(self, rel_path: Path | str, data: bytes | Writer) -> None:
+        """Stage the full new contents of `rel_path`: bytes, or a function
+        that writes them to the open temp file (for streaming)."""
+        rel = Path(rel_path).as_posix()
+        self._claim(rel)
+        target = self.config.vault_path / rel
+        tmp = target.with_name(f".{target.name}.{self.id}.tmp")
+        expect = _stat_key(target)
+        backup = target.with_name(f".{target.name}.{self.id}.bak") if expect else None
+        vault = self.config.vault_path
+        self.ops.append(
+            Op(
+                "write",
+                rel,
+                tmp=tmp.relative_to(vault).as_posix(),
+                backup=backup.relative_to(vault).as_posix() if backup else None,
+                expect=expect,
+            )
+        )
+        self._futures.append(self._pool.submit(self._stage, target, tmp, data))
+
+    def _stage(self, target: Path, tmp: Path, data: bytes | Writer) -> int:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        return _write_file(tmp, target, data, self.fsync != "none")
+
+    def move(self, src_rel: Path | str, dest_rel: Path | str) -> None:
+        src, dest = Path(src_rel).as_posix(), Path(dest_rel).as_posix()
+        self._claim(src)
+        self._claim(dest)
+        if not (self.config.vault_path / src).exists():
+            raise FileNotFoundError(src)
+        if (self.config.vault_path / dest).exists():
+            raise FileExistsError(dest)
+        self.ops.append(Op("move", dest, src=src))
+
+    def discard(self) -> None:
+        """Drop everything staged; the vault is left as it was."""
+        for future in self._futures:
+            future.exception()  # wait
+        self._pool.shutdown()
+        for op in self.ops:
+            if op.tmp:
+                (self.config.vault_path / op.tmp).unlink(missing_ok=True)
+        self._done = True
+
+    def commit(self) -> None:
+        try:
+            self.bytes_written = sum(f.result() for f in self._futures)
+        except BaseException:
+            self.discard()
+            raise
+        self._pool.shutdown()
+        self._done = True
+        if not self.ops:
+            return
+        with ExitStack() as stack:
+            try:
+                _lock_folders(self.config, self.ops, stack)
+                vault = self.config.vault_path
+                changed = [op.path for op in self.ops if _changed(vault, op)]
+                if changed:
+                    raise WriteConflict(changed)
+            except BaseException:
+                self.discard()
+                raise
+            manifest = batches_dir(self.config) / f"{self.id}.json"
+            _write_manifest(manifest, self)
+            _apply(self.config, self.ops, self.fsync, self.workers)
+            _cleanup(self.config, self.ops)
+            manifest.unlink()
+        if self.fsync != "none":
+            _fsync_dir(manifest.parent)
+
+
+def _write_manifest(path: Path, batch: WriteBatch) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "id": batch.id,
+                "vault": str(batch.config.vault_path),
+                "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "fsync": batch.fsync,
+                "ops": [asdict(op) for op in batch.ops],
+            },
+            f,
+        )
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    _fsync_dir(path.parent)
+
+
+def _apply(config: Config, ops: list[Op], fsync: str, workers: int = DEFAULT_WORKERS) -> None:
+    """Land every op that hasn't landed yet (renames run on the I/O pool)."""
+    vault = config.vault_path
+
+    def land(op: Op) -> Path:
+        target = vault / op.path
+        if op.op == "move":
+            src = vault / op.src  # type: ignore[operator]
+            if src.exists() and not target.exists():
+                _move(src, target)
+                if fsync == "always":
+                    _fsync_dir(src.parent)
+        else:
+            tmp = vault / op.tmp  # type: ignore[operator]
+            if tmp.exists():
+                if op.backup and target.exists():
+                    _backup(target, vault / op.backup)
+                os.replace(tmp, target)
+        if fsync == "always":
+            _fsync_dir(target.parent)
+        return target.parent
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="oj-write") as pool:
+        folders = set(pool.map(land, ops))
+    if fsync == "batch":
+        folders.update((vault / op.src).parent for op in ops if op.src)
+        for folder in folders:
+            _fsync_dir(folder)
+
+
+def _cleanup(config: Config, ops: list[Op]) -> None:
+    for op in ops:
+        if op.backup:
+            (config.vault_path / op.backup).unlink(missing_ok=True)
+
+
+def _rollback(config: Config, ops: list[Op]) -> None:
+    vault = config.vault_path
+    for op in reversed(ops):
+        target = vault / op.path
+        if op.op == "move":
+            src = vault / op.src  # type: ignore[operator]
+            if target.exists() and not src.exists():
+                _move(target, src)
+            continue
+        tmp = vault / op.tmp  # type: ignore[operator]
+        if tmp.exists():
+            # Never landed; a backup may already have been linked.
+            tmp.unlink()
+            if op.backup:
+                (vault / op.backup).unlink(missing_ok=True)
+        elif op.backup:
+            if (vault / op.backup).exists():
+                os.replace(vault / op.backup, target)
+        else:
+            target.unlink(missing_ok=True)  # the batch created it
+    for folder in {(vault / op.path).parent for op in ops}:
+        _fsync_dir(folder)
+
+
+def recover(config: Config, manifest: Path, *, rollback: bool = False) -> dict[str, Any]:
+    """Finish (default) or undo an interrupted batch, then drop its manifest."""
+    data = json.loads(manifest.read_text(encoding="utf-8"))
+    ops = [Op(**op) for op in data["ops"]]
+    with ExitStack() as stack:
+        _lock_folders(config, ops, stack)
+        if rollback:
+            _rollback(config, ops)
+        else:
+            _apply(config, ops, data.get("fsync", "batch"))
+            _cleanup(config, ops)
+        manifest.unlink()
+    _fsync_dir(manifest.parent)
+    return {"id": data["id"], "action": "rollback" if rollback else "resume", "ops": len(ops)}
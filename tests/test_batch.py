@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from obsidian_journal import cli, vault
+from obsidian_journal.batch import run_batch
+from obsidian_journal.config import Config
+
+
+@pytest.fixture
+def vault_path(tmp_path: Path) -> Path:
+    journal = tmp_path / "Journal"
+    journal.mkdir()
+    (journal / "2026-04-25 First note.md").write_text(
+        "---\ndate: '2026-04-25'\ntype: end-of-day\ntags:\n  - daily\n---\nFirst body.\n"
+    )
+    (journal / "2026-04-26 Second note.md").write_text(
+        "---\ndate: '2026-04-26'\ntype: meeting\ntags:\n  - work\n---\nSecond body.\n"
+    )
+    return tmp_path
+
+
+@pytest.fixture
+def config(vault_path: Path) -> Config:
+    return Config(vault_path=vault_path, anthropic_api_key="test-key")
+
+
+def _run(config: Config, requests: list, concurrency: int = 1) -> list[dict]:
+    out: list[dict] = []
+    lines = [r if isinstance(r, str) else json.dumps(r) for r in requests]
+    run_batch(config, lines, out.append, concurrency=concurrency)
+    return out
+
+
+def test_query_get_list_share_one_scan(config, monkeypatch):
+    calls = []
+    real = vault.list_notes
+    monkeypatch.setattr(vault, "list_notes", lambda cfg: calls.append(1) or real(cfg))
+
+    out = _run(
+        config,
+        [
+            {"id": 1, "op": "query", "args": {"type": "meeting"}},
+            {"id": 2, "op": "get", "args": {"title": "First note"}},
+            {"id": "three", "op": "list", "args": {"folder": "Journal", "limit": 1}},
+            {"id": 4, "op": "query", "args": {"tags": "daily,work"}},
+        ],
+    )
+
+    assert len(calls) == 1
+    assert [r["id"] for r in out] == [1, 2, "three", 4]
+    assert out[0]["count"] == 1
+    assert out[0]["items"][0]["frontmatter"]["type"] == "meeting"
+    assert out[1]["title"] == "2026-04-25 First note"
+    assert out[2]["count"] == 1
+    assert out[2]["items"][0]["path"].endswith("Second note.md")
+    assert out[3]["count"] == 2
+
+
+def test_unfiltered_query_leaves_the_session_order_alone(config):
+    out = _run(
+        config,
+        [
+            {"id": 1, "op": "get", "args": {"title": "note"}},
+            {"id": 2, "op": "query", "args": {}},
+            {"id": 3, "op": "get", "args": {"title": "note"}},
+        ],
+    )
+    assert out[1]["count"] == 2
+    assert out[0]["title"] == out[2]["title"] == "2026-04-25 First note"
+
+
+def test_errors_are_per_request(config):
+    out = _run(
+        config,
+        [
+            "not json",
+            {"id": 1, "op": "delete"},
+            {"id": 2, "op": "get", "args": {"title": "nope"}},
+            {"id": 3, "op": "query"},
+        ],
+    )
+    assert out[0]["id"] is None and out[0]["code"] == 2
+    assert out[1] == {"id": 1, "error": "Unknown op: 'delete'", "code": 2}
+    assert out[2]["error"] == "Note not found"
+    assert out[3]["count"] == 2
+
+
+def test_concurrent_mode_answers_every_request(config):
+    requests = [
+        {"id": i, "op": "query", "args": {"limit": 1 + i % 2}} for i in range(40)
+    ]
+    out = _run(config, requests, concurrency=4)
+    assert sorted(r["id"] for r in out) == list(range(40))
+    assert all(r["count"] == 1 + r["id"] % 2 for r in out)
+
+
+def test_cli_batch_streams_stamped_ndjson(vault_path, monkeypatch):
+    monkeypatch.setenv("OBSIDIAN_VAULT_PATH", str(vault_path))
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    cli.json_mode = False
+
+    stdin = "\n".join(
+        json.dumps(r)
+        for r in [
+            {"id": 1, "op": "query", "args": {"since": "2026-04-26"}},
+            {"id": 2, "op": "get", "args": {"title": "Second"}},
+        ]
+    )
+    result = CliRunner().invoke(cli.app, ["batch"], input=stdin + "\n\n")
+    assert result.exit_code == 0, result.stdout
+    lines = result.stdout.splitlines()
+    assert len(lines) == 2
+    first, second = (json.loads(line) for line in lines)
+    assert first["_oj_version"] == "0.3"
+    assert first["id"] == 1 and first["count"] == 1
+    assert second["body"].startswith("Second body")
+
+
+def test_query_fields_projection(config):
+    out = _run(
+        config,
+        [
+            {"id": 1, "op": "query", "args": {"fields": ["title", "date"], "limit": 1}},
+            {"id": 2, "op": "query", "args": {"fields": "title,nope"}},
+        ],
+    )
+    assert out[0]["items"] == [{"title": "2026-04-26 Second note", "date": "2026-04-26"}]
+    assert out[1]["code"] == 2 and "nope" in out[1]["error"]
+
+
+def test_query_where_expression(config):
+    out = _run(
+        config,
+        [
+            {"id": 1, "op": "query", "args": {"where": "tag:work OR type:end-of-day", "limit": 5}},
+            {"id": 2, "op": "query", "args": {"where": "NOT tag:work AND body"}},
+            {"id": 3, "op": "query", "args": {"where": "tag:work AND"}},
+        ],
+    )
+    assert out[0]["count"] == 2
+    assert [i["title"] for i in out[1]["items"]] == ["2026-04-25 First note"]
+    assert out[2]["code"] == 2
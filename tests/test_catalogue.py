@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import json
+import os
+
+import pytest
+from typer.testing import CliRunner
+
+from obsidian_journal import cli, vault
+from obsidian_journal.catalogue import Catalogue, _id_array, mask_and
+from obsidian_journal.config import Config
+from obsidian_journal.index import CursorError, VaultIndex
+
+
+@pytest.fixture
+def config(tmp_path):
+    vault_path = tmp_path / "vault"
+    journal = vault_path / "Journal"
+    meetings = vault_path / "Meetings"
+    journal.mkdir(parents=True)
+    meetings.mkdir()
+    notes = [
+        (journal, "2026-01-10 Morning", "end-of-day", ["daily", "work"], "x" * 10),
+        (journal, "2026-02-01 Retro", "end-of-project", ["work", "journal/weekly"], "x" * 300),
+        (journal, "2026-02-15 Free", "free-form", [], "x"),
+        (meetings, "2026-02-10 Sync", "meeting", ["work", "career"], "x" * 50),
+        (meetings, "2026-03-01 Planning", "meeting", ["career"], "x" * 20),
+    ]
+    for mtime, (folder, title, note_type, tags, body) in enumerate(notes):
+        tag_lines = "".join(f"  - {t}\n" for t in tags)
+        path = folder / f"{title}.md"
+        path.write_text(
+            f"---\ndate: '{title[:10]}'\ntype: {note_type}\ntags:\n{tag_lines}---\n{body}\n"
+        )
+        # Modified order is the reverse of date order.
+        os.utime(path, ns=(0, (10 - mtime) * 10**9))
+    return Config(vault_path=vault_path, anthropic_api_key="test-key", cache_dir=tmp_path / "cache")
+
+
+def _titles(catalogue: Catalogue, rows) -> list[str]:
+    return [catalogue.titles[i] for i in rows]
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"note_type": "meeting"},
+        {"folder": "Journal"},
+        {"tags": ["work"]},
+        {"tags": ["journal/*", "career"]},
+        {"since": "2026-02", "until": "2026-02-28"},
+        {"folder": "Meetings", "tags": ["work"]},
+    ],
+)
+def test_masks_match_search_notes(config, filters):
+    catalogue = Catalogue(VaultIndex.load(config))
+    expected = {n.title for n in vault.search_notes(config, **filters)}
+    assert set(_titles(catalogue, catalogue.positions(catalogue.where(**filters)))) == expected
+
+
+def test_mask_and(config):
+    catalogue = Catalogue(VaultIndex.load(config))
+    meeting = catalogue.type_mask("meeting")
+    work = catalogue.tag_mask(["work"])
+    assert _titles(catalogue, catalogue.positions(mask_and(catalogue.n, meeting, work))) == [
+        "2026-02-10 Sync"
+    ]
+
+
+@pytest.mark.parametrize(
+    "n_values, typecode",
+    [(256, "B"), (257, "H"), (65536, "H"), (65537, "L"), (70000, "L")],
+)
+def test_id_array_widens_with_the_dictionary(n_values, typecode):
+    ids = _id_array(n_values)
+    assert ids.typecode == typecode
+    ids.extend([0, n_values - 1])  # the largest id fits
+    assert ids[-1] == n_values - 1
+
+
+def test_count_by_and_argsort(config):
+    catalogue = Catalogue(VaultIndex.load(config))
+    assert catalogue.count_by("type") == {
+        "meeting": 2,
+        "end-of-day": 1,
+        "end-of-project": 1,
+        "free-form": 1,
+    }
+    assert catalogue.count_by("folder", catalogue.tag_mask(["work"])) == {"Journal": 2, "Meetings": 1}
+    assert catalogue.count_by("tag", catalogue.folder_mask("Meetings")) == {"career": 2, "work": 1}
+
+    rows = catalogue.positions(catalogue.where())
+    assert _titles(catalogue, catalogue.argsort("size", rows, reverse=True))[0] == "2026-02-01 Retro"
+    assert _titles(catalogue, catalogue.argsort("modified", rows, reverse=True))[0] == "2026-01-10 Morning"
+    assert _titles(catalogue, catalogue.argsort("title", rows))[-1] == "2026-03-01 Planning"
+
+
+def test_words_by_matches_bodies(config):
+    catalogue = Catalogue(VaultIndex.load(config))
+    # Bodies are one word each; tag:work rows are Morning, Retro and Sync.
+    assert catalogue.total_words() == 5
+    assert catalogue.words_by("tag", ["work", "career"]) == {"work": 3, "career": 2}
+    meetings = catalogue.folder_mask("Meetings")
+    assert catalogue.words_by("tag", ["work"], meetings) == {"work": 1}
+    assert catalogue.words_by("month", ["2026-02"], meetings) == {"2026-02": 1}
+    assert catalogue.count_by("month") == {"2026-02": 3, "2026-01": 1, "2026-03": 1}
+
+
+def test_cli_stats(config, monkeypatch):
+    monkeypatch.setenv("OBSIDIAN_VAULT_PATH", str(config.vault_path))
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setenv("OJ_CACHE_DIR", str(config.cache_dir))
+    (config.vault_path / "Journal" / "2026-02-15 Free.md").write_text(
+        "---\ndate: '2026-02-15'\ntype: free-form\n---\nthree more words\n"
+    )
+    cli.json_mode = False
+    runner = CliRunner()
+
+    result = runner.invoke(cli.app, ["--json", "stats", "--by", "type,month", "--top", "1"])
+    data = json.loads(result.stdout)
+    assert (data["notes"], data["words"]) == (5, 7)
+    assert data["groups"]["type"] == {
+        "distinct": 4,
+        "items": [{"value": "meeting", "notes": 2, "words": 2}],
+    }
+    # Months are listed newest first rather than by count.
+    assert data["groups"]["month"]["items"] == [{"value": "2026-03", "notes": 1, "words": 1}]
+
+    data = json.loads(runner.invoke(cli.app, ["--json", "stats", "--folder", "Journal"]).stdout)
+    assert data["notes"] == 3
+    assert data["groups"]["tag"]["items"][0] == {"value": "work", "notes": 2, "words": 2}
+
+    result = runner.invoke(cli.app, ["--json", "stats", "--by", "colour"])
+    assert result.exit_code == 2
+
+    result = runner.invoke(cli.app, ["stats", "--by", "folder"])
+    assert result.exit_code == 0
+    assert "By folder" in result.output
+
+
+def test_cli_query_sort(config, monkeypatch):
+    monkeypatch.setenv("OBSIDIAN_VAULT_PATH", str(config.vault_path))
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setenv("OJ_CACHE_DIR", str(config.cache_dir))
+    cli.json_mode = False
+    runner = CliRunner()
+
+    result = runner.invoke(cli.app, ["--json", "query", "--sort", "size", "-n", "2", "--type", "meeting"])
+    data = json.loads(result.stdout)
+    assert [i["title"] for i in data["items"]] == ["2026-02-10 Sync", "2026-03-01 Planning"]
+    assert data["next_cursor"] is None
+
+    result = runner.invoke(cli.app, ["--json", "query", "--sort", "colour"])
+    assert result.exit_code == 2
+    assert "Invalid --sort" in json.loads(result.stdout)["error"]
+
+    with pytest.raises(CursorError):
+        VaultIndex.load(config).search(sort="title", after="anything")
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import datetime
+
+import frontmatter as fm
+import pytest
+
+from obsidian_journal import fmparse
+
+FLAT = [
+    "---\ndate: 2026-03-01\ntype: meeting\ntags:\n  - work\n  - q1\nrelated:\n- Alpha\n---\nBody.\n",
+    "---\ndate: '2026-03-01'\ntype: \"journal\"\ntags: [work, ideas/ai, c#]\n---\n\n# Title\n\nText.",
+    "---\ntitle: It''s fine\nquote: 'It''s fine'\nempty: ''\nnothing:\nnull_word: null\ntilde: ~\n---\nx",
+    "---\ncount: 3\nratio: 0.5\nhex: 0x1F\nduration: 1:30\ndone: yes\nflag: Off\nstamp: 2026-03-01 10:15:00\n---\n",
+    "---\nurl: https://example.com/a?b=c\ntags: []\nlist:\n-\n- 2\n# comment\n\ntags: [again]\n---\nbody --- not a boundary\n",
+    "---\n---\nNo metadata at all.\n",
+    "  \n---\ndate: 2026-01-02\n---  \nLeading blank line, trailing spaces on the boundary.\n",
+]
+
+FALLBACK = [
+    "---\nnested:\n  key: value\n---\nx",
+    "---\nsummary: >\n  folded\n  text\n---\nx",
+    "---\ntitle: a long\n  continued line\n---\nx",
+    "---\nbase: &b one\ncopy: *b\n---\nx",
+    "---\ntags: ['a, b', \"c\"]\n---\nx",
+    "---\nnote: value # trailing comment\n---\nx",
+    "---\nyes: key is a bool\n---\nx",
+    "---\nescaped: \"tab\\there\"\n---\nx",
+    "---\nitems:\n  - a\n   - b\n---\nx",
+    "---\njust a scalar\n---\nx",
+    "No frontmatter.\n",
+    "+++\ntitle = \"toml\"\n+++\nx",
+]
+
+
+def _typed(value):
+    """Values with their types, so 3 != 3.0 != '3' and date != str."""
+    if isinstance(value, dict):
+        return {k: _typed(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_typed(v) for v in value]
+    return (type(value).__name__, value)
+
+
+def _dumps(content, metadata):
+    post = fm.Post(content)
+    post.metadata.update(metadata)
+    return fm.dumps(post)
+
+
+@pytest.mark.parametrize("text", FLAT + FALLBACK)
+def test_parse_matches_python_frontmatter(text):
+    metadata, content = fmparse.parse(text)
+    expected_metadata, expected_content = fm.parse(text)
+    assert _typed(metadata) == _typed(expected_metadata)
+    assert content == expected_content
+    # Round trip: re-serialising either result gives the same bytes.
+    assert _dumps(content, metadata) == _dumps(expected_content, expected_metadata)
+
+
+@pytest.mark.parametrize("text", FLAT)
+def test_flat_headers_take_the_fast_path(text, monkeypatch):
+    def no_yaml(*args, **kwargs):
+        raise AssertionError("fell back to PyYAML")
+
+    monkeypatch.setattr(fmparse.yaml, "load", no_yaml)
+    fmparse.parse(text)
+
+
+@pytest.mark.parametrize("text", FALLBACK[:-2])
+def test_other_yaml_falls_back(text):
+    header = fmparse.FM_BOUNDARY_RE.split(text.strip(), 2)[1]
+    with pytest.raises(fmparse._NotFlat):
+        fmparse._load_flat(header)
+
+
+def test_scalars_keep_yaml_types():
+    metadata, _ = fmparse.parse(FLAT[3])
+    assert metadata["count"] == 3 and metadata["hex"] == 31 and metadata["duration"] == 90
+    assert metadata["done"] is True and metadata["flag"] is False
+    assert metadata["stamp"] == datetime.datetime(2026, 3, 1, 10, 15)
+    assert fmparse.parse(FLAT[0])[0]["date"] == datetime.date(2026, 3, 1)
+
+
+def test_invalid_yaml_still_raises():
+    with pytest.raises(Exception):
+        fmparse.parse("---\ndate: 2026-13-45\n---\nx")
+    with pytest.raises(Exception):
+        fmparse.parse("---\nbad: [unclosed\n---\nx")
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from obsidian_journal import bitmaps, cli, vault
+from obsidian_journal.bitmaps import Postings
+from obsidian_journal.config import Config
+from obsidian_journal.index import CursorError, VaultIndex
+
+
+@pytest.fixture
+def config(tmp_path: Path) -> Config:
+    vault_path = tmp_path / "vault"
+    journal = vault_path / "Journal"
+    journal.mkdir(parents=True)
+    for day in range(1, 8):
+        tag = "work" if day % 2 else "home"
+        (journal / f"2026-03-0{day} Note {day}.md").write_text(
+            f"---\ndate: '2026-03-0{day}'\ntags:\n  - {tag}\n---\nBody {day}.\n"
+        )
+    # Same date as Note 3: order between them is by path.
+    (journal / "2026-03-03 Another.md").write_text(
+        "---\ndate: '2026-03-03'\ntags:\n  - work\n---\nTie.\n"
+    )
+    return Config(vault_path=vault_path, anthropic_api_key="test-key", cache_dir=tmp_path / "cache")
+
+
+def _pages(index: VaultIndex, limit: int, **filters) -> list[list[str]]:
+    pages, after = [], None
+    while True:
+        page = index.search(limit=limit, after=after, **filters)
+        pages.append([n.title for n in page])
+        after = page.next_cursor
+        if after is None:
+            return pages
+
+
+def test_pages_cover_results_once_in_order(config):
+    index = VaultIndex.load(config)
+    expected = [n.title for n in index.search()]
+    assert expected[:4] == [
+        "2026-03-07 Note 7",
+        "2026-03-06 Note 6",
+        "2026-03-05 Note 5",
+        "2026-03-04 Note 4",
+    ]
+    assert expected.index("2026-03-03 Note 3") < expected.index("2026-03-03 Another")
+
+    pages = _pages(index, 3)
+    assert [len(p) for p in pages] == [3, 3, 2]
+    assert sum(pages, []) == expected
+
+    work = _pages(index, 2, tags=["work"])
+    assert sum(work, []) == [n.title for n in index.search(tags=["work"])]
+    # The last page is exactly full, but nothing follows it: no cursor.
+    assert [len(p) for p in work] == [2, 2, 1]
+
+
+def test_stale_and_malformed_cursors_are_rejected(config):
+    page = VaultIndex.load(config).search(limit=2)
+    assert page.next_cursor
+
+    with pytest.raises(CursorError, match="Invalid"):
+        VaultIndex.load(config).search(after="not-a-cursor")
+
+    (config.vault_path / "Journal" / "2026-03-08 New.md").write_text(
+        "---\ndate: '2026-03-08'\n---\nNew.\n"
+    )
+    with pytest.raises(CursorError, match="Stale"):
+        VaultIndex.load(config).search(after=page.next_cursor)
+
+
+def test_index_is_persisted_and_refreshed_incrementally(config, monkeypatch):
+    first = VaultIndex.load(config)
+    assert VaultIndex.cache_path(config).exists()
+
+    reads = []
+    real = vault.read_note
+    monkeypatch.setattr(
+        "obsidian_journal.index.read_note",
+        lambda cfg, rel, **kw: reads.append(str(rel)) or real(cfg, rel, **kw),
+    )
+    again = VaultIndex.load(config)
+    assert reads == []
+    assert again.generation == first.generation
+
+    edited = config.vault_path / "Journal" / "2026-03-01 Note 1.md"
+    edited.write_text("---\ndate: '2026-03-01'\ntype: meeting\n---\nEdited.\n")
+    os.utime(edited, ns=(0, 10**18))
+    (config.vault_path / "Journal" / "2026-03-02 Note 2.md").unlink()
+    refreshed = VaultIndex.load(config)
+    assert reads == ["Journal/2026-03-01 Note 1.md"]
+    assert refreshed.generation != first.generation
+    assert [n.title for n in refreshed.search(note_type="meeting")] == ["2026-03-01 Note 1"]
+    assert len(refreshed.entries) == 7
+
+
+def test_cli_query_after_continues_and_rejects_stale(config, monkeypatch):
+    monkeypatch.setenv("OBSIDIAN_VAULT_PATH", str(config.vault_path))
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setenv("OJ_CACHE_DIR", str(config.cache_dir))
+    cli.json_mode = False
+    runner = CliRunner()
+
+    first = json.loads(runner.invoke(cli.app, ["--json", "query", "-n", "5"]).stdout)
+    assert first["count"] == 5
+    second = json.loads(
+        runner.invoke(cli.app, ["--json", "query", "-n", "5", "--after", first["next_cursor"]]).stdout
+    )
+    assert second["count"] == 3 and second["next_cursor"] is None
+    assert second["items"][0]["title"] == "2026-03-03 Another"
+
+    (config.vault_path / "Journal" / "2026-03-02 Note 2.md").unlink()
+    result = runner.invoke(cli.app, ["--json", "query", "--after", first["next_cursor"]])
+    assert result.exit_code == 2
+    assert json.loads(result.stdout)["error"].startswith("Stale cursor")
+
+
+def test_bitmaps_round_trip_and_postings_update():
+    ids = [0, 3, 9, 64, 1000]
+    bits = bitmaps.from_ids(ids)
+    assert bitmaps.to_ids(bits) == ids
+    assert bitmaps.decode(bitmaps.encode(bits)) == bits
+    assert bitmaps.from_ids([]) == 0 and bitmaps.to_ids(0) == []
+
+    postings = Postings({"work": bitmaps.encode(bits)})
+    postings.update({"work": [5], "home": [2]}, {"work": [1000, 3]})
+    assert bitmaps.to_ids(postings.get("work")) == [0, 5, 9, 64]
+    postings.update({}, {"home": [2]})
+    assert postings.values() == ["work"]
+    reloaded = Postings(postings.encode())
+    assert reloaded.get("work") == postings.get("work")
+
+
+def _tag_sets(index: VaultIndex) -> dict[str, set[str]]:
+    return {
+        tag: {index.slots[s].path for s in bitmaps.to_ids(index.postings("tag", tag))}
+        for tag in index._postings["tag"].values()
+    }
+
+
+def test_postings_follow_edits_and_match_a_fresh_build(config, tmp_path):
+    VaultIndex.load(config)
+    journal = config.vault_path / "Journal"
+    (journal / "2026-03-01 Note 1.md").write_text(
+        "---\ndate: '2026-03-01'\ntags:\n  - journal/daily\n---\nRetagged.\n"
+    )
+    (journal / "2026-03-02 Note 2.md").unlink()
+    (journal / "2026-03-09 Nested.md").write_text(
+        "---\ndate: '2026-03-09'\ntags:\n  - journal/weekly\n  - journal\n---\nNew.\n"
+    )
+    updated = VaultIndex.load(config)
+    fresh = VaultIndex.load(Config(**{**config.__dict__, "cache_dir": tmp_path / "fresh"}))
+    assert _tag_sets(updated) == _tag_sets(fresh)
+    assert updated.generation == fresh.generation
+
+    titles = lambda where: [n.title for n in updated.search(where=where)]  # noqa: E731
+    assert titles("tag:journal/*") == ["2026-03-09 Nested", "2026-03-01 Note 1"]
+    assert titles("tag:journal/w*") == ["2026-03-09 Nested"]
+    assert titles("tag:journal/* AND NOT tag:journal") == ["2026-03-01 Note 1"]
+    assert len(titles("tag:work OR tag:home")) == 6
+
+
+def test_index_compacts_when_most_slots_are_free(config, monkeypatch):
+    monkeypatch.setattr("obsidian_journal.index.COMPACT_MIN_FREE", 2)
+    assert len(VaultIndex.load(config).slots) == 8
+    for path in sorted((config.vault_path / "Journal").glob("*.md"))[:5]:
+        path.unlink()
+    index = VaultIndex.load(config)
+    assert len(index.slots) == 3 and None not in index.slots
+    assert sorted(s for t in _tag_sets(index).values() for s in t) == sorted(
+        e.path for e in index.entries
+    )
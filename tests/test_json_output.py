@@ -69,6 +69,39 @@ def test_query_json_filters_and_versions(runner: CliRunner):
     assert payload["items"][0]["frontmatter"]["type"] == "meeting"
 
 
+def test_query_json_fields_projects_items(runner: CliRunner):
+    result = runner.invoke(cli.app, ["--json", "query", "--fields", "path,title,tags"])
+    assert result.exit_code == 0, result.stdout
+    items = json.loads(result.stdout)["items"]
+    assert [list(i) for i in items] == [["path", "title", "tags"]] * 2
+    assert items[0]["path"].endswith("Second note.md")
+
+
+def test_query_json_unknown_field_exits_2(runner: CliRunner):
+    result = runner.invoke(cli.app, ["--json", "query", "--fields", "title,bogus"])
+    assert result.exit_code == 2
+    assert "bogus" in json.loads(result.stdout)["error"]
+
+
+def test_query_json_expression_with_explain(runner: CliRunner):
+    result = runner.invoke(
+        cli.app, ["--json", "query", "NOT type:meeting AND body", "--explain"]
+    )
+    assert result.exit_code == 0, result.stdout
+    payload = json.loads(result.stdout)
+    assert [i["title"] for i in payload["items"]] == ["2026-04-25 First note"]
+    plan = payload["plan"]
+    assert plan["expr"] == "NOT type:meeting AND body"
+    assert [s["strategy"] for s in plan["steps"]][-1] == "scan"
+    assert all("ms" in s for s in plan["steps"])
+
+
+def test_query_json_bad_expression_exits_2(runner: CliRunner):
+    result = runner.invoke(cli.app, ["--json", "query", "tag:work AND ("])
+    assert result.exit_code == 2
+    assert json.loads(result.stdout)["error"] == "Query ends unexpectedly"
+
+
 def test_get_json_returns_full_note(runner: CliRunner):
     result = runner.invoke(cli.app, ["--json", "get", "First note"])
     assert result.exit_code == 0, result.stdout
@@ -143,6 +176,13 @@ def test_plan_json_no_quick_exits_2(runner: CliRunner):
     assert payload["_oj_version"] == "0.3"
 
 
+def test_plan_json_invalid_date_exits_2(runner: CliRunner):
+    result = runner.invoke(cli.app, ["--json", "plan", "-q", "x", "--date", "next week"])
+    assert result.exit_code == 2
+    payload = json.loads(result.stdout)
+    assert payload["error"] == "Invalid --date: next week"
+
+
 def test_plan_json_quick_emits_spec_keys(runner: CliRunner, monkeypatch):
     plan_md = (
         "## Plan\n\n"
@@ -188,3 +228,37 @@ def test_organize_links_json(runner: CliRunner):
     assert payload["_oj_version"] == "0.3"
     assert "applied" in payload
     assert "suggestions" in payload
+
+
+def test_query_ndjson_streams_header_items_trailer(runner: CliRunner):
+    result = runner.invoke(cli.app, ["--ndjson", "query"])
+    assert result.exit_code == 0, result.stdout
+    lines = [json.loads(line) for line in result.stdout.splitlines()]
+    header, *items, trailer = lines
+    assert header == {"_oj_version": "0.3", "_oj_record": "header", "command": "query"}
+    assert trailer == {
+        "_oj_version": "0.3",
+        "_oj_record": "trailer",
+        "count": 2,
+        "next_cursor": None,
+    }
+    # Newest first, same item shape as --json query.
+    assert [i["title"] for i in items] == ["2026-04-26 Second note", "2026-04-25 First note"]
+    assert items[0]["body"].startswith("Second body")
+    assert result.stderr == ""
+
+
+def test_list_ndjson_streams_summaries(runner: CliRunner):
+    result = runner.invoke(cli.app, ["--ndjson", "list", "-n", "1"])
+    assert result.exit_code == 0, result.stdout
+    header, item, trailer = (json.loads(line) for line in result.stdout.splitlines())
+    assert header["folder"] == "Journal"
+    assert set(item) == {"path", "title", "modified_at", "tags", "date", "type"}
+    assert trailer["count"] == 1
+
+
+def test_ndjson_single_object_commands_emit_one_line(runner: CliRunner):
+    result = runner.invoke(cli.app, ["--ndjson", "get", "First note"])
+    assert result.exit_code == 0, result.stdout
+    (line,) = result.stdout.splitlines()
+    assert json.loads(line)["title"] == "2026-04-25 First note"
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import frontmatter as fm
+import pytest
+
+from obsidian_journal import locks, vault, writebatch
+from obsidian_journal.config import Config
+from obsidian_journal.models import Frontmatter, Note, SpecNote
+from obsidian_journal.writebatch import WriteBatch, WriteConflict
+
+WORKERS = 8
+ROUNDS = 15
+DATE = "2026-03-01"
+
+
+@pytest.fixture
+def config(tmp_path):
+    (tmp_path / "vault").mkdir()
+    return Config(
+        vault_path=tmp_path / "vault",
+        anthropic_api_key="test-key",
+        cache_dir=tmp_path / "cache",
+        data_dir=tmp_path / "data",
+    )
+
+
+def _pool():
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+    return ProcessPoolExecutor(max_workers=WORKERS, mp_context=context)
+
+
+def _plan(worker, i):
+    return f"## Plan\n- worker {worker} round {i}\n"
+
+
+def _hammer_daily_plan(config, worker):
+    for i in range(ROUNDS):
+        vault.write_daily_plan(config, DATE, _plan(worker, i))
+
+
+def _increment(config, worker):
+    path = config.vault_path / "counter.md"
+    for _ in range(ROUNDS):
+        with locks.note_lock(config, "counter.md"):
+            path.write_text(str(int(path.read_text()) + 1))
+
+
+def _write_spec(config, worker):
+    spec = SpecNote(title="Spec", body=f"Body from worker {worker}.\n", frontmatter=Frontmatter(type="spec"))
+    return vault.write_spec(config, spec, "same-slug").name
+
+
+def _write_journal_note(config, worker):
+    note = Note(title=f"{DATE} Same title", body=f"Body from worker {worker}.", folder="Journal")
+    return vault.write_note(config, note, exclusive=True).name
+
+
+def _leftovers(config):
+    return [p.name for p in config.vault_path.rglob(".*")]
+
+
+def test_processes_hammering_one_daily_note(config):
+    daily = config.vault_path / config.daily_notes_folder / f"{DATE}.md"
+    daily.parent.mkdir(parents=True)
+    daily.write_text("---\ndate: '2026-03-01'\ntype: daily-note\n---\n\n## Notes\nkeep me\n")
+
+    with _pool() as pool:
+        list(pool.map(_hammer_daily_plan, [config] * WORKERS, range(WORKERS)))
+
+    text = daily.read_text()
+    post = fm.loads(text)
+    assert post["type"] == "daily-note"
+    assert "## Notes\nkeep me" in post.content
+    assert text.count("## Plan") == 1
+    assert any(_plan(w, ROUNDS - 1).strip() in text for w in range(WORKERS))
+    assert _leftovers(config) == []
+
+
+def test_note_lock_serialises_read_modify_write(config):
+    (config.vault_path / "counter.md").write_text("0")
+    with _pool() as pool:
+        list(pool.map(_increment, [config] * WORKERS, range(WORKERS)))
+    assert (config.vault_path / "counter.md").read_text() == str(WORKERS * ROUNDS)
+
+
+def test_concurrent_specs_get_distinct_names(config):
+    with _pool() as pool:
+        names = list(pool.map(_write_spec, [config] * WORKERS, range(WORKERS)))
+    assert sorted(names) == sorted(["same-slug.md"] + [f"same-slug-{n}.md" for n in range(2, WORKERS + 1)])
+    bodies = sorted(fm.load(config.vault_path / name).content for name in names)
+    assert bodies == sorted(f"Body from worker {w}." for w in range(WORKERS))
+    assert _leftovers(config) == []
+
+
+def test_concurrent_journal_notes_with_one_title_all_survive(config):
+    with _pool() as pool:
+        names = list(pool.map(_write_journal_note, [config] * WORKERS, range(WORKERS)))
+    assert len(set(names)) == WORKERS
+    bodies = sorted(fm.load(config.vault_path / "Journal" / name).content for name in names)
+    assert bodies == sorted(f"Body from worker {w}." for w in range(WORKERS))
+
+
+def test_atomic_create_never_replaces(config):
+    path = config.vault_path / "a.md"
+    writebatch.atomic_create(path, b"first\n")
+    with pytest.raises(FileExistsError):
+        writebatch.atomic_create(path, b"second\n")
+    assert path.read_text() == "first\n"
+    assert _leftovers(config) == []
+
+
+def test_lock_times_out_while_held(config):
+    with locks.note_lock(config, "Daily Notes/a.md"):
+        with pytest.raises(locks.LockTimeout):
+            with locks.note_lock(config, "Daily Notes/a.md", timeout=0.05):
+                pass
+        # A batch needs the folder exclusively; single-note writers hold it shared.
+        with pytest.raises(locks.LockTimeout):
+            with locks.folder_lock(config, "Daily Notes", timeout=0.05):
+                pass
+        with locks.note_lock(config, "Daily Notes/b.md", timeout=0.05):
+            pass
+
+
+def test_batch_refuses_to_overwrite_a_concurrent_change(config):
+    note = config.vault_path / "a.md"
+    note.write_text("old\n")
+    with pytest.raises(WriteConflict) as excinfo:
+        with WriteBatch(config) as batch:
+            batch.write("a.md", b"from the batch\n")
+            batch.write("b.md", b"new note\n")
+            note.write_text("written by another process meanwhile\n")
+    assert excinfo.value.paths == ["a.md"]
+    assert note.read_text() == "written by another process meanwhile\n"
+    assert not (config.vault_path / "b.md").exists()
+    assert _leftovers(config) == [] and writebatch.pending(config) == []
+
+
+def test_batch_refuses_a_move_onto_a_note_created_meanwhile(config):
+    vault_path = config.vault_path
+    (vault_path / "a.md").write_text("a\n")
+    with pytest.raises(WriteConflict) as excinfo:
+        with WriteBatch(config) as batch:
+            batch.move("a.md", "Projects/a.md")
+            (vault_path / "Projects").mkdir()
+            (vault_path / "Projects" / "a.md").write_text("created by another process\n")
+    assert excinfo.value.paths == ["Projects/a.md"]
+    assert (vault_path / "a.md").read_text() == "a\n"
+    assert (vault_path / "Projects" / "a.md").read_text() == "created by another process\n"
+    assert writebatch.pending(config) == []
+
+
+def test_batch_refuses_a_move_whose_source_went_away(config):
+    (config.vault_path / "a.md").write_text("a\n")
+    with pytest.raises(WriteConflict):
+        with WriteBatch(config) as batch:
+            batch.move("a.md", "Projects/a.md")
+            (config.vault_path / "a.md").unlink()
+    assert not (config.vault_path / "Projects" / "a.md").exists()
+    assert writebatch.pending(config) == []
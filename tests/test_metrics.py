@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from typer.testing import CliRunner
+
+from obsidian_journal import cli, metrics, vault
+from obsidian_journal.config import Config
+
+
+@pytest.fixture
+def config(tmp_path):
+    (tmp_path / "vault").mkdir()
+    (tmp_path / "vault" / "A.md").write_text("---\ndate: '2026-03-01'\n---\nBody.\n")
+    return Config(vault_path=tmp_path / "vault", anthropic_api_key="test-key", data_dir=tmp_path / "data")
+
+
+class FakeMessages:
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+
+    def create(self, **kwargs):
+        if self.fail:
+            raise RuntimeError("boom")
+        usage = SimpleNamespace(
+            input_tokens=100, output_tokens=20, cache_read_input_tokens=300, cache_creation_input_tokens=None
+        )
+        return SimpleNamespace(content=[SimpleNamespace(text="ok")], usage=usage)
+
+
+def test_create_message_logs_usage_and_failures(config):
+    client = SimpleNamespace(messages=FakeMessages())
+    response = metrics.create_message(config, client, "test.site", model="m", max_tokens=10, messages=[])
+    assert response.content[0].text == "ok"
+    client.messages.fail = True
+    with pytest.raises(RuntimeError):
+        metrics.create_message(config, client, "test.site", model="m", max_tokens=10, messages=[])
+
+    ok, failed = list(metrics.read(config))
+    assert ok["kind"] == "llm" and ok["name"] == "test.site" and ok["ok"] is True
+    assert (ok["input_tokens"], ok["output_tokens"], ok["cache_read_tokens"], ok["cache_write_tokens"]) == (
+        100,
+        20,
+        300,
+        0,
+    )
+    assert failed["ok"] is False and failed["error"] == "RuntimeError"
+
+
+def test_scans_are_recorded_unless_disabled(config):
+    vault.list_notes(config)
+    vault.get_all_note_titles(config)
+    assert [(e["name"], e["notes"]) for e in metrics.read(config)] == [
+        ("list_notes", 1),
+        ("get_all_note_titles", 1),
+    ]
+    config.metrics_enabled = False
+    vault.list_notes(config)
+    assert len(list(metrics.read(config))) == 2
+
+
+def test_log_rotates_and_reads_across_files(config, monkeypatch):
+    monkeypatch.setattr(metrics, "ROTATE_BYTES", 200)
+    for i in range(20):
+        metrics.record(config, "scan", "list_notes", ms=i, notes=i)
+    rotated = sorted(p.name for p in config.metrics_path.parent.iterdir())
+    assert rotated == ["metrics.jsonl", "metrics.jsonl.1", "metrics.jsonl.2", "metrics.jsonl.3"]
+    ms = [e["ms"] for e in metrics.read(config)]
+    # Oldest records fell off the end; the rest come back in order.
+    assert ms == sorted(ms) and ms[-1] == 19 and 0 < len(ms) < 20
+
+
+def test_summarize_percentiles_and_cache_rate():
+    entries = [
+        {"ts": f"2026-03-0{1 + i % 2}T00:00:00", "kind": "llm", "name": "s", "ms": float(ms), "ok": True,
+         "input_tokens": 10, "output_tokens": 1, "cache_read_tokens": 30 if i == 0 else 0}
+        for i, ms in enumerate(range(10, 110, 10))
+    ]
+    [row] = metrics.summarize(entries)
+    assert (row["count"], row["p50_ms"], row["p95_ms"], row["max_ms"]) == (10, 50.0, 100.0, 100.0)
+    assert row["input_tokens"] == 100 and row["cache_hit_rate"] == round(30 / 130, 3)
+    by_day = metrics.summarize(entries, period="day")
+    assert [(r["day"], r["count"]) for r in by_day] == [("2026-03-01", 5), ("2026-03-02", 5)]
+
+
+def test_cli_metrics(config, monkeypatch):
+    monkeypatch.setenv("OBSIDIAN_VAULT_PATH", str(config.vault_path))
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setenv("OJ_DATA_DIR", str(config.data_dir))
+    cli.json_mode = False
+    runner = CliRunner()
+
+    runner.invoke(cli.app, ["--json", "query"])
+    data = json.loads(runner.invoke(cli.app, ["--json", "metrics", "--kind", "scan"]).stdout)
+    assert [(r["name"], r["count"], r["max_notes"]) for r in data["items"]] == [("index.load", 1, 1)]
+
+    result = runner.invoke(cli.app, ["metrics", "--per", "day"])
+    assert result.exit_code == 0 and "Metrics since" in result.output
+    assert runner.invoke(cli.app, ["--json", "metrics", "--per", "hour"]).exit_code == 2
+
+
+@pytest.mark.parametrize(
+    "args",
+    [["--since", "garbage"], ["--since", "2026-13-01"], ["--since", "7x"], ["--kind", "bogus"]],
+)
+def test_cli_metrics_rejects_bad_filters(config, monkeypatch, args):
+    monkeypatch.setenv("OBSIDIAN_VAULT_PATH", str(config.vault_path))
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setenv("OJ_DATA_DIR", str(config.data_dir))
+    cli.json_mode = False
+    result = CliRunner().invoke(cli.app, ["--json", "metrics", *args])
+    assert result.exit_code == 2
+    assert f"Invalid {args[0]}: {args[1]}" in json.loads(result.stdout)["error"]
+
+
+@pytest.mark.parametrize("since", ["2026-03-01", "2026-03", "2026", "today", "2w", "all"])
+def test_cli_metrics_accepts_dates(config, monkeypatch, since):
+    monkeypatch.setenv("OBSIDIAN_VAULT_PATH", str(config.vault_path))
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setenv("OJ_DATA_DIR", str(config.data_dir))
+    cli.json_mode = False
+    result = CliRunner().invoke(cli.app, ["--json", "metrics", "--since", since, "--kind", "llm"])
+    assert result.exit_code == 0, result.stdout
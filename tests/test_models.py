@@ -63,6 +63,13 @@ def test_note_to_dict_empty():
     assert d["frontmatter"] == {}
 
 
+
+def test_note_fields_keep_a_scalar_tag_whole():
+    n = Note(title="Scalar", body="", frontmatter=Frontmatter.from_dict({"tags": "work", "related": "Alpha"}))
+    assert n.to_dict()["frontmatter"]["tags"] == "work"
+    assert n.to_dict(["tags", "related"]) == {"tags": ["work"], "related": ["Alpha"]}
+    assert n.to_summary_dict()["tags"] == ["work"]
+
 def test_weather_info_to_dict():
     w = WeatherInfo(
         temperature_high_f=75.0,
@@ -85,3 +92,18 @@ def test_weather_info_to_dict():
     assert d["sunset"] == "7:45 PM"
     assert d["best_outdoor_window"] == "10 AM - 2 PM"
     assert d["summary"] == "Clear skies all day"
+
+
+def test_loaded_frontmatter_is_compact_but_dumps_the_same():
+    raw = {"date": "2026-01-15", "type": "meeting", "tags": ["work", "q1"], "related": ["[[A]]"], "x": 1}
+    a = Frontmatter.from_dict(dict(raw))
+    b = Frontmatter.from_dict({**raw, "tags": ["".join(["wo", "rk"]), "q1"]})
+    assert a.tags == ("work", "q1")
+    assert a.tags[0] is b.tags[0]
+    assert a.to_dict() == raw
+    assert isinstance(a.to_dict()["tags"], list)
+
+    note = Note(title="T", body="", frontmatter=a)
+    assert not hasattr(note, "__dict__") and not hasattr(a, "__dict__")
+    assert note.to_dict(["tags", "related"]) == {"tags": ["work", "q1"], "related": ["[[A]]"]}
+    assert note.to_summary_dict()["tags"] == ["work", "q1"]
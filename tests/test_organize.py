@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from obsidian_journal import cli
+from obsidian_journal.config import Config
+from obsidian_journal.organize.frontmatter import apply_frontmatter, scan_frontmatter
+
+
+@pytest.fixture
+def vault(tmp_path, monkeypatch):
+    daily = tmp_path / "Daily Notes"
+    daily.mkdir()
+    (daily / "2026-03-01.md").write_text("---\ntags: [work]\ncustom: keep\n---\nNotes.\nTags: #ideas #work\n")
+    (daily / "2026-03-02.md").write_text("---\ndate: 2026-03-02\ntype: daily\n---\nDone.\n")
+    monkeypatch.setenv("OBSIDIAN_VAULT_PATH", str(tmp_path))
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setenv("OJ_METRICS", "0")
+    cli.json_mode = False
+    return tmp_path
+
+
+def test_apply_frontmatter_splices_headers(vault):
+    config = Config(vault_path=vault, anthropic_api_key="test-key")
+    untouched = (vault / "Daily Notes" / "2026-03-02.md").stat().st_mtime_ns
+    suggestions = scan_frontmatter(config)
+    assert [n.title for n, _ in suggestions] == ["2026-03-01"]
+
+    result = apply_frontmatter(config, suggestions)
+    text = (vault / "Daily Notes" / "2026-03-01.md").read_text()
+    assert (result.updated, result.unchanged) == (1, 0)
+    assert result.bytes_written == len(text.encode())
+    # Existing keys keep their place and style; the body keeps everything but the tags line.
+    assert text == (
+        "---\ntags:\n- work\n- ideas\ncustom: keep\ndate: '2026-03-01'\ntype: daily\n---\nNotes.\n"
+    )
+    assert (vault / "Daily Notes" / "2026-03-02.md").stat().st_mtime_ns == untouched
+
+    # A second run finds nothing to do.
+    assert scan_frontmatter(config) == []
+
+
+def test_cli_reports_bytes_written(vault):
+    result = CliRunner().invoke(cli.app, ["--json", "organize", "frontmatter", "--apply"])
+    data = json.loads(result.stdout)
+    assert data["applied"] == 1 and data["unchanged"] == 0
+    assert data["bytes_written"] == (vault / "Daily Notes" / "2026-03-01.md").stat().st_size
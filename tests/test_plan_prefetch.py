@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from obsidian_journal.config import Config
+from obsidian_journal.models import WeatherInfo
+from obsidian_journal.plan import prefetch as prefetch_mod
+from obsidian_journal.plan.prefetch import PlanPrefetch
+
+
+def _weather() -> WeatherInfo:
+    return WeatherInfo(
+        temperature_high_f=70.0,
+        temperature_low_f=50.0,
+        condition="clear sky",
+        precipitation_chance=0,
+        wind_speed_mph=4.0,
+        sunrise="07:00",
+        sunset="18:30",
+        best_outdoor_window="12:00-13:00",
+        summary="clear sky, high 70F / low 50F",
+    )
+
+
+@pytest.fixture
+def located_config(tmp_path) -> Config:
+    daily = tmp_path / "Daily Notes"
+    daily.mkdir()
+    (daily / "2026-03-01.md").write_text("---\ntype: daily-note\n---\n- dentist at 3\n")
+    return Config(
+        vault_path=tmp_path,
+        anthropic_api_key="test-key",
+        location_lat=41.88,
+        location_lon=-87.63,
+    )
+
+
+def test_prefetch_reads_daily_note(located_config, monkeypatch):
+    monkeypatch.setattr(prefetch_mod, "_fetch_weather", lambda cfg, day: None)
+    pf = PlanPrefetch(located_config, "2026-03-01")
+    assert "dentist at 3" in pf.existing_content()
+
+
+def test_prefetch_missing_daily_note(located_config, monkeypatch):
+    monkeypatch.setattr(prefetch_mod, "_fetch_weather", lambda cfg, day: None)
+    pf = PlanPrefetch(located_config, "2026-03-02")
+    assert pf.existing_content() is None
+
+
+def test_prefetch_without_location_skips_weather(tmp_path):
+    cfg = Config(vault_path=tmp_path, anthropic_api_key="test-key")
+    pf = PlanPrefetch(cfg, "2026-03-01")
+    assert not pf.has_location
+    assert pf.weather() is None
+
+
+def test_slow_weather_respects_budget_and_arrives_later(located_config, monkeypatch):
+    release = threading.Event()
+
+    def slow_fetch(cfg, day):
+        release.wait(5)
+        return _weather()
+
+    monkeypatch.setattr(prefetch_mod, "_fetch_weather", slow_fetch)
+    pf = PlanPrefetch(located_config, "2026-03-01")
+
+    start = time.perf_counter()
+    assert pf.weather(timeout=0.05) is None
+    assert time.perf_counter() - start < 1.0
+
+    release.set()
+    assert pf.weather(timeout=5).condition == "clear sky"
+
+
+def test_weather_errors_degrade_to_none(located_config, monkeypatch):
+    def broken_fetch(cfg, day):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(prefetch_mod, "_fetch_weather", broken_fetch)
+    pf = PlanPrefetch(located_config, "2026-03-01")
+    assert pf.weather() is None
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from obsidian_journal import cli, profiling
+
+
+@pytest.fixture
+def profiler():
+    profiling.enable("test")
+    yield profiling
+    profiling.disable()
+
+
+def test_spans_nest_and_aggregate(profiler):
+    @profiling.profiled("outer")
+    def outer() -> None:
+        for _ in range(3):
+            with profiling.span("inner", site="a"):
+                pass
+
+    outer()
+    outer()
+    tree = profiling.report()
+    assert tree["name"] == "test"
+    [node] = tree["children"]
+    assert (node["name"], node["calls"]) == ("outer", 2)
+    assert node["children"] == [{"name": "inner (a)", "calls": 6, "ms": node["children"][0]["ms"]}]
+    assert "inner (a)" in profiling.format_tree(tree)
+
+
+def test_spans_are_noops_when_disabled():
+    assert not profiling.enabled()
+    with profiling.span("ignored") as node:
+        assert node is None
+
+
+@pytest.fixture
+def vault_env(tmp_path, monkeypatch):
+    journal = tmp_path / "Journal"
+    journal.mkdir()
+    for day in range(1, 4):
+        (journal / f"2026-03-0{day} Note.md").write_text(f"---\ndate: '2026-03-0{day}'\n---\nBody.\n")
+    monkeypatch.setenv("OBSIDIAN_VAULT_PATH", str(tmp_path))
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    cli.json_mode = False
+
+
+def _names(node: dict) -> set[str]:
+    return {node["name"]}.union(*(_names(c) for c in node.get("children", ())))
+
+
+def test_cli_profile_json_adds_timings(vault_env):
+    runner = CliRunner()
+    result = runner.invoke(cli.app, ["--profile", "--json", "query", "--fields", "title"])
+    data = json.loads(result.stdout)
+    assert data["count"] == 3
+    assert {"oj query", "index.load", "vault.read_note", "frontmatter.parse"} <= _names(data["_oj_timings"])
+    assert not profiling.enabled()
+
+    # Without --profile nothing is attached.
+    result = runner.invoke(cli.app, ["--json", "query"])
+    assert "_oj_timings" not in json.loads(result.stdout)
+
+
+def test_cli_profile_prints_tree_to_stderr(vault_env):
+    result = CliRunner().invoke(cli.app, ["--profile", "organize", "frontmatter"])
+    assert result.exit_code == 0
+    assert "organize.scan_frontmatter" in result.stderr
+    assert "vault.read_note" in result.stderr
+
+
+def test_memory_report_snapshots_largest_checkpoint():
+    profiling.start_memory()
+    try:
+        held = [bytearray(1000) for _ in range(100)]
+        profiling.memory_checkpoint(len(held))
+        del held
+        profiling.memory_checkpoint(5)
+        report = profiling.memory_report()
+    finally:
+        profiling.stop_memory()
+    assert not profiling.memory_enabled()
+    assert report["notes"] == 100
+    assert report["peak_bytes"] >= report["checkpoint_bytes"] >= 100_000
+    assert report["bytes_per_note"] == round(report["peak_bytes"] / 100)
+    assert any("bytearray(1000)" in site["code"] for site in report["top"])
+    assert "bytes/note" in profiling.format_memory(report)
+
+
+def test_cli_memprofile_json_adds_memory(vault_env):
+    result = CliRunner().invoke(cli.app, ["--memprofile", "--json", "query"])
+    data = json.loads(result.stdout)
+    memory = data["_oj_memory"]
+    assert memory["notes"] == 3
+    assert memory["peak_bytes"] > 0 and memory["top"]
+    assert not profiling.memory_enabled()
+
+
+def test_cli_memprofile_prints_report_to_stderr(vault_env):
+    result = CliRunner().invoke(cli.app, ["--memprofile", "organize", "frontmatter"])
+    assert result.exit_code == 0
+    assert "peak traced memory" in result.stderr
+    assert "bytes/note" in result.stderr
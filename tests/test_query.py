@@ -1,10 +1,20 @@
+from datetime import date
 from pathlib import Path
 
 import pytest
 
 from obsidian_journal.config import Config
+from obsidian_journal.index import VaultIndex
 from obsidian_journal.models import Frontmatter, Note
-from obsidian_journal.vault import search_notes
+from obsidian_journal.query import (
+    QuerySyntaxError,
+    date_matches,
+    date_range,
+    note_matches,
+    parse,
+    resolve_date,
+)
+from obsidian_journal.vault import iter_search_notes, list_notes, search_notes
 
 
 @pytest.fixture
@@ -113,6 +123,13 @@ def test_search_no_results(search_config):
     assert notes == []
 
 
+def test_iter_search_matches_search_notes(search_config):
+    for filters in ({}, {"tags": ["work"]}, {"since": "2026-02-01", "limit": 2}, {"text": "career"}):
+        loaded = list_notes(search_config)
+        expected = [n.path for n in search_notes(search_config, notes=loaded, **filters)]
+        assert [n.path for n in iter_search_notes(search_config, **filters)] == expected
+
+
 def test_note_to_dict():
     note = Note(
         title="Test Note",
@@ -136,3 +153,124 @@ def test_note_to_dict_minimal():
     assert d["folder"] == ""
     assert d["frontmatter"] == {}
     assert d["body"] == ""
+
+
+def test_note_to_dict_projects_fields_in_order():
+    note = Note(
+        title="Test Note",
+        body="Some content",
+        frontmatter=Frontmatter(date="2026-01-15", type="meeting", tags=["work"]),
+        path="Meetings/Test Note.md",
+    )
+    d = note.to_dict(["path", "tags", "date"])
+    assert list(d) == ["path", "tags", "date"]
+    assert d == {"path": "Meetings/Test Note.md", "tags": ["work"], "date": "2026-01-15"}
+
+
+def test_search_with_fields_skips_bodies(search_config):
+    notes = search_notes(search_config, tags=["career"], fields=["path", "title"])
+    assert [n.title for n in notes] == ["2026-02-10 Team sync", "2026-02-01 Project retro"]
+    assert all(n.body == "" for n in notes)
+    assert notes[0].frontmatter.tags == ("work", "career")
+
+    with_body = search_notes(search_config, tags=["career"], fields=["title", "body"])
+    assert with_body[0].body.startswith("Discussed roadmap")
+
+
+def test_text_search_still_reads_bodies_with_fields(search_config):
+    notes = search_notes(search_config, text="roadmap", fields=["title"])
+    assert [n.title for n in notes] == ["2026-02-10 Team sync"]
+
+
+@pytest.mark.parametrize(
+    "expr, expected",
+    [
+        ('tag:work AND NOT type:meeting AND date>=2026-01 AND "roadmap"',
+         'tag:work AND NOT type:meeting AND date>=2026-01 AND roadmap'),
+        ("tag:a tag:b OR type:c", "tag:a AND tag:b OR type:c"),
+        ("NOT (tag:a OR tag:b) folder:Journal", "NOT (tag:a OR tag:b) AND folder:Journal"),
+        ('text:"data pipeline" OR date<2026-02', '"data pipeline" OR date<2026-02'),
+    ],
+)
+def test_parse_round_trips(expr, expected):
+    assert str(parse(expr)) == expected
+
+
+@pytest.mark.parametrize("expr", ["", "tag:a AND", "(tag:a", "tag:a)", "foo:bar", "tag>=x", '"open'])
+def test_parse_rejects_bad_syntax(expr):
+    with pytest.raises(QuerySyntaxError):
+        parse(expr)
+
+
+def test_partial_dates_cover_whole_periods():
+    dates = ["", "2026-01-05", "2026-01-31", "2026-02-01", "2026-03-10"]
+    for op, value in [("<=", "2026-01"), (">", "2026-01"), (":", "2026-02"), (">=", "2026-02"), ("<", "2026-02")]:
+        expected = [i for i, d in enumerate(dates) if date_matches(d, op, value)]
+        assert list(date_range(dates, op, value)) == expected
+    assert list(date_range(dates, "<=", "2026-01")) == [1, 2]
+    assert list(date_range(dates, ">", "2026-01")) == [3, 4]
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        "tag:work AND NOT type:meeting",
+        "tag:career OR type:free-form",
+        "NOT tag:work",
+        "date>=2026-02 AND date<=2026-02-10",
+        "career",
+        "(tag:work OR tag:personal) AND NOT reflection",
+        "folder:Journal AND date>2026-01 AND NOT pipeline",
+    ],
+)
+def test_index_plan_matches_per_note_evaluation(search_config, expr):
+    loaded = list_notes(search_config)
+    expected = [n.path for n in search_notes(search_config, notes=loaded, where=expr)]
+    assert [n.path for n in search_notes(search_config, where=expr)] == expected
+    node = parse(expr)
+    brute = sorted(
+        (n for n in loaded if note_matches(node, n)),
+        key=lambda n: (n.frontmatter.date, n.path),
+        reverse=True,
+    )
+    assert expected == [n.path for n in brute]
+
+
+def test_plan_runs_index_steps_before_scanning(search_config):
+    page = VaultIndex.load(search_config).search(where='tag:work AND "roadmap" AND NOT type:end-of-day')
+    assert [n.title for n in page] == ["2026-02-10 Team sync"]
+    strategies = [s.strategy for s in page.plan.steps]
+    assert strategies[-1] == "scan"
+    assert "index" in strategies
+    scan = page.plan.steps[-1]
+    # Only the two work notes that aren't end-of-day reach the body scan.
+    assert (scan.predicate, scan.rows_in, scan.rows_out) == ("roadmap", 2, 1)
+    # Keyword filters and expressions combine with AND.
+    assert search_notes(search_config, where="tag:work", note_type="meeting")[0].title == "2026-02-10 Team sync"
+
+
+def test_resolve_relative_dates():
+    today = date(2026, 3, 10)
+    assert resolve_date("today", today) == "2026-03-10"
+    assert resolve_date("yesterday", today) == "2026-03-09"
+    assert resolve_date("7d", today) == "2026-03-03"
+    assert resolve_date("2w", today) == "2026-02-24"
+    assert resolve_date("2026-01", today) == "2026-01"
+
+
+def test_date_window_walks_one_range_in_order(search_config):
+    page = VaultIndex.load(search_config).search(
+        where="tag:work", since="2026-02", until="2026-02-10", limit=1
+    )
+    assert [n.title for n in page] == ["2026-02-10 Team sync"]
+    assert page.next_cursor is not None
+    first = page.plan.steps[0]
+    assert (first.strategy, first.predicate, first.rows_out) == (
+        "range",
+        "date>=2026-02 AND date<=2026-02-10",
+        2,
+    )
+    rest = VaultIndex.load(search_config).search(
+        where="tag:work", since="2026-02", until="2026-02-10", after=page.next_cursor
+    )
+    assert [n.title for n in rest] == ["2026-02-01 Project retro"]
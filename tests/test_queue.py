@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from obsidian_journal import cli
+from obsidian_journal.config import Config
+from obsidian_journal.journal.queue import CaptureQueue
+from obsidian_journal.journal.worker import run_worker
+from obsidian_journal.models import ConversationMessage, ReflectionType
+
+
+def _response(text: str) -> MagicMock:
+    resp = MagicMock()
+    resp.content = [MagicMock(text=text)]
+    return resp
+
+
+def _client(*texts: str | Exception) -> MagicMock:
+    client = MagicMock()
+    client.messages.create.side_effect = [
+        t if isinstance(t, Exception) else _response(t) for t in texts
+    ]
+    return client
+
+
+@pytest.fixture
+def config(tmp_path: Path) -> Config:
+    vault_path = tmp_path / "vault"
+    vault_path.mkdir()
+    return Config(
+        vault_path=vault_path,
+        anthropic_api_key="test-key",
+        data_dir=tmp_path / "data",
+    )
+
+
+@pytest.fixture
+def queue(config: Config) -> CaptureQueue:
+    return CaptureQueue(config.queue_dir)
+
+
+def _enqueue(queue: CaptureQueue, text: str = "quick thought") -> None:
+    queue.enqueue(
+        ReflectionType.FREE_FORM,
+        [ConversationMessage(role="user", content=text)],
+        captured_on="2026-03-04",
+    )
+
+
+def test_enqueue_is_fifo_and_roundtrips(queue):
+    _enqueue(queue, "first")
+    _enqueue(queue, "second")
+    paths = queue.pending()
+    assert len(paths) == 2
+    job = queue.claim(paths[0])
+    assert job.messages[0].content == "first"
+    assert job.reflection_type is ReflectionType.FREE_FORM
+    assert job.captured_on == "2026-03-04"
+
+
+def test_claim_is_exclusive(queue):
+    _enqueue(queue)
+    path = queue.pending()[0]
+    assert queue.claim(path) is not None
+    assert queue.claim(path) is None
+    assert queue.pending() == []
+
+
+def test_recover_requeues_stale_claims(queue):
+    _enqueue(queue)
+    job = queue.claim(queue.pending()[0])
+    working = queue.working_dir / f"{job.id}.json"
+    old = time.time() - 3600
+    os.utime(working, (old, old))
+    assert queue.recover(stale_after=60) == 1
+    assert len(queue.pending()) == 1
+
+
+def test_recover_leaves_a_fresh_claim_of_an_old_job_alone(queue):
+    _enqueue(queue)
+    (path,) = queue.pending()
+    old = time.time() - 3600
+    os.utime(path, (old, old))  # queued an hour ago
+    job = queue.claim(path)
+    # A second worker starting now must not take the job back.
+    assert CaptureQueue(queue.root).recover() == 0
+    assert (queue.working_dir / f"{job.id}.json").exists()
+    assert queue.pending() == []
+
+
+def test_worker_quarantines_corrupt_jobs(config, queue):
+    queue.pending_dir.mkdir(parents=True)
+    (queue.pending_dir / "20260304T000000000000-bad.json").write_text("{not json")
+    (queue.pending_dir / "20260304T000000000001-bad.json").write_text('{"id": "x"}')
+    _enqueue(queue)
+    fake = _client("A body.", "Good title")
+    with patch("obsidian_journal.journal.synthesize.Anthropic", return_value=fake):
+        report = run_worker(config, concurrency=1, retry_delay=0)
+
+    assert [r.path.name for r in report.written] == ["2026-03-04 Good title.md"]
+    assert len(report.failed) == 2
+    assert all("corrupt job" in r.error for r in report.failed)
+    assert sorted(p.name for p in queue.failed_dir.iterdir()) == [
+        "20260304T000000000000-bad.json",
+        "20260304T000000000001-bad.json",
+    ]
+    assert queue.pending() == [] and list(queue.working_dir.glob("*.json")) == []
+
+
+def test_same_day_captures_with_the_same_title_both_survive(config, queue):
+    _enqueue(queue, "first")
+    _enqueue(queue, "second")
+
+    bodies = iter(["Body one.", "Body two."])
+
+    def create(**kwargs):
+        if kwargs["max_tokens"] == 50:
+            return _response("Same title")
+        return _response(next(bodies))
+
+    fake = MagicMock()
+    fake.messages.create.side_effect = create
+    with patch("obsidian_journal.journal.synthesize.Anthropic", return_value=fake):
+        report = run_worker(config, concurrency=2, retry_delay=0)
+    assert sorted(r.path.name for r in report.written) == [
+        "2026-03-04 Same title-2.md",
+        "2026-03-04 Same title.md",
+    ]
+
+
+def test_worker_synthesizes_and_writes_with_capture_date(config, queue):
+    _enqueue(queue)
+    fake = _client("A body.", "Vendor call")
+    with patch("obsidian_journal.journal.synthesize.Anthropic", return_value=fake):
+        report = run_worker(config, retry_delay=0)
+
+    assert len(report.written) == 1
+    path = report.written[0].path
+    assert path.name == "2026-03-04 Vendor call.md"
+    assert "A body." in path.read_text()
+    assert queue.pending() == []
+    assert list(queue.working_dir.glob("*.json")) == []
+
+
+def test_worker_retries_transient_failures(config, queue):
+    _enqueue(queue)
+    fake = _client(RuntimeError("overloaded"), "A body.", "Retried title")
+    with patch("obsidian_journal.journal.synthesize.Anthropic", return_value=fake):
+        report = run_worker(config, retry_delay=0)
+    assert [r.path.name for r in report.written] == ["2026-03-04 Retried title.md"]
+
+
+def test_worker_keeps_job_queued_when_retries_exhausted(config, queue):
+    _enqueue(queue)
+    fake = _client(*[RuntimeError("down")] * 2)
+    with patch("obsidian_journal.journal.synthesize.Anthropic", return_value=fake):
+        report = run_worker(config, max_attempts=2, retry_delay=0)
+
+    assert len(report.failed) == 1
+    assert "down" in report.failed[0].error
+    (path,) = queue.pending()
+    saved = json.loads(path.read_text())
+    assert saved["attempts"] == 2
+    assert saved["messages"][0]["content"] == "quick thought"
+
+
+def test_checkpointed_job_is_written_without_resynthesis(config, queue):
+    _enqueue(queue)
+    job = queue.claim(queue.pending()[0])
+    job.note = {
+        "title": "2026-03-04 Already done",
+        "body": "Saved body.",
+        "folder": "Journal",
+        "frontmatter": {"date": "2026-03-04", "type": "free-form"},
+    }
+    queue.release(job)
+
+    fake = _client()
+    with patch("obsidian_journal.journal.synthesize.Anthropic", return_value=fake):
+        first = run_worker(config, retry_delay=0)
+    assert fake.messages.create.call_count == 0
+    assert first.written[0].path.name == "2026-03-04 Already done.md"
+
+
+def test_job_written_before_its_path_was_saved_is_not_duplicated(config, queue):
+    _enqueue(queue)
+    job = queue.claim(queue.pending()[0])
+    job.note = {
+        "title": "2026-03-04 Already done",
+        "body": "Saved body.",
+        "folder": "Journal",
+        "frontmatter": {"date": "2026-03-04", "type": "free-form"},
+    }
+    queue.release(job)
+    with patch("obsidian_journal.journal.synthesize.Anthropic", return_value=_client()):
+        run_worker(config, retry_delay=0)
+    # Died after the write but before the path checkpoint / completion: re-run it.
+    job.path = ""
+    queue.release(job)
+    with patch("obsidian_journal.journal.synthesize.Anthropic", return_value=_client()):
+        report = run_worker(config, retry_delay=0)
+    assert report.written[0].path.name == "2026-03-04 Already done.md"
+    assert [p.name for p in (config.vault_path / "Journal").iterdir()] == ["2026-03-04 Already done.md"]
+
+
+def test_worker_drains_concurrently(config, queue):
+    for i in range(6):
+        _enqueue(queue, f"capture {i}")
+
+    def create(**kwargs):
+        content = kwargs["messages"][0]["content"]
+        if kwargs["max_tokens"] == 50:
+            return _response(f"Title {content.rsplit(' ', 1)[-1]}")
+        return _response("Body.")
+
+    fake = MagicMock()
+    fake.messages.create.side_effect = create
+    with patch("obsidian_journal.journal.synthesize.Anthropic", return_value=fake):
+        report = run_worker(config, concurrency=3, retry_delay=0)
+    assert len(report.written) == 6
+    assert len(list((config.vault_path / "Journal").glob("*.md"))) == 6
+
+
+def test_cli_defer_queues_without_calling_api(tmp_path, monkeypatch):
+    vault_path = tmp_path / "vault"
+    vault_path.mkdir()
+    monkeypatch.setenv("OBSIDIAN_VAULT_PATH", str(vault_path))
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setenv("OJ_DATA_DIR", str(tmp_path / "data"))
+    cli.json_mode = False
+
+    with patch("obsidian_journal.journal.synthesize.Anthropic") as anthropic:
+        result = CliRunner().invoke(
+            cli.app, ["--json", "journal", "-q", "ship it", "--defer"]
+        )
+    assert result.exit_code == 0, result.stdout
+    payload = json.loads(result.stdout)
+    assert payload["queued"] is True
+    assert anthropic.call_count == 0
+    assert len(CaptureQueue(tmp_path / "data" / "queue").pending()) == 1
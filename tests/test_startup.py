@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+
+from obsidian_journal.startup import StartupProfile, format_profile, parse_importtime, relay_stderr
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     yaml.error
+import time:      2000 |       2120 |   yaml
+import time:       300 |       2420 | frontmatter
+some real stderr line
+import time:       500 |        500 | obsidian_journal.models
+"""
+
+
+def test_parse_importtime_splits_records_and_passthrough():
+    records, rest = parse_importtime(SAMPLE)
+    assert [r.module for r in records] == [
+        "yaml.error",
+        "yaml",
+        "frontmatter",
+        "obsidian_journal.models",
+    ]
+    assert records[0].depth == 2
+    assert records[2].cumulative_us == 2420
+    assert rest == "some real stderr line\n"
+
+
+def test_relay_forwards_prompts_before_the_line_ends():
+    read_fd, write_fd = os.pipe()
+    child = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            "import sys, time\n"
+            "sys.stderr.write('import time:       120 |        120 | yaml\\n'); sys.stderr.flush()\n"
+            "sys.stderr.write('Save this note? '); sys.stderr.flush()\n"
+            "time.sleep(0.3)\n"
+            "sys.stderr.write('\\nimport time:       300 |        420 | frontmatter\\nbye\\n')",
+        ],
+        stderr=write_fd,
+    )
+    os.close(write_fd)
+
+    class Out(io.StringIO):
+        seen_prompt_at = None
+
+        def flush(self):
+            if self.seen_prompt_at is None and "Save this note? " in self.getvalue():
+                self.seen_prompt_at = time.monotonic()
+
+    out = Out()
+    imports = relay_stderr(read_fd, out)
+    finished = time.monotonic()
+    child.wait()
+    os.close(read_fd)
+
+    assert out.getvalue() == "Save this note? \nbye\n"
+    assert [r.module for r in parse_importtime(imports)[0]] == ["yaml", "frontmatter"]
+    # The prompt was passed on while the child was still running.
+    assert out.seen_prompt_at is not None and finished - out.seen_prompt_at >= 0.2
+
+
+def test_profile_groups_by_package():
+    records, _ = parse_importtime(SAMPLE)
+    profile = StartupProfile(imports=records, wall_seconds=0.05, exit_code=0)
+    assert profile.total_import_us == 2920
+    assert profile.by_package()[0] == ("yaml", 2120)
+    assert profile.slowest(1)[0].module == "frontmatter"
+    assert "frontmatter" in format_profile(profile)
+
+
+def test_cli_import_defers_heavy_dependencies():
+    probe = (
+        "import sys, obsidian_journal.cli; "
+        "heavy = ('rich.console', 'rich.markdown', 'rich.table', 'anthropic', "
+        "'frontmatter', 'dotenv', 'httpx'); "
+        "print([m for m in heavy if m in sys.modules])"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+    )
+    assert out.stdout.strip() == "[]"
+
+
+def test_startup_profile_flag_passes_output_through(tmp_path):
+    env = dict(os.environ, OBSIDIAN_VAULT_PATH=str(tmp_path), ANTHROPIC_API_KEY="test-key")
+    out = subprocess.run(
+        [sys.executable, "-m", "obsidian_journal.cli", "--startup-profile", "--json", "config", "show"],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=tmp_path,
+    )
+    assert out.returncode == 0, out.stderr
+    assert json.loads(out.stdout)["vault_path"] == str(tmp_path)
+    report = json.loads(out.stderr.strip().splitlines()[-1])["_oj_startup"]
+    assert report["import_ms"] > 0
+    assert any(p["package"] == "typer" for p in report["packages"])
@@ -5,9 +5,12 @@ import pytest
 from obsidian_journal.config import Config
 from obsidian_journal.models import Frontmatter, Note
 from obsidian_journal.vault import (
+    find_note,
+    iter_notes,
     list_notes,
     list_journal_notes,
     read_note,
+    splice_frontmatter,
     write_note,
     get_all_note_titles,
 )
@@ -48,6 +51,35 @@ def test_list_notes(config):
     assert "config" not in titles
 
 
+def test_iter_notes_matches_list_notes_in_path_order(config, tmp_vault):
+    nested = tmp_vault / "Daily Notes" / "2026"
+    nested.mkdir()
+    (nested / "a.md").write_text("Nested.\n")
+    (tmp_vault / "Daily Notes.md").write_text("Sibling of the folder.\n")
+    (tmp_vault / "Templates").mkdir()
+    (tmp_vault / "Templates" / "Daily.md").write_text("skip me")
+    (tmp_vault / ".smtcmp_cache.md").write_text("skip me")
+
+    notes = iter_notes(config)
+    assert not isinstance(notes, list)
+    paths = [n.path for n in notes]
+    assert paths == [n.path for n in list_notes(config)]
+    assert paths == sorted(paths, key=lambda p: Path(p).parts)
+    assert paths == ["Daily Notes/2026/a.md", "Daily Notes/2026-01-15.md", "Daily Notes.md", "Root Note.md"]
+
+
+def test_iter_notes_without_bodies(config):
+    notes = {n.title: n for n in iter_notes(config, load_body=False)}
+    assert list(notes["Root Note"].frontmatter.tags) == ["test"]
+    assert notes["Root Note"].body == ""
+
+
+def test_find_note_accepts_a_generator(config):
+    assert find_note(iter_notes(config), "Root Note").path == "Root Note.md"
+    assert find_note(iter_notes(config), "root").title == "Root Note"
+    assert find_note(iter_notes(config), "missing") is None
+
+
 def test_read_note(config):
     note = read_note(config, "Root Note.md")
     assert note is not None
@@ -76,6 +108,18 @@ def test_write_note(config):
     assert "date: '2026-02-26'" in content or "date: 2026-02-26" in content
 
 
+
+def test_write_note_exclusive_never_replaces(config):
+    first = Note(title="Same", body="First.", folder="Journal")
+    second = Note(title="Same", body="Second.", folder="Journal")
+    assert write_note(config, first, exclusive=True).name == "Same.md"
+    assert write_note(config, second, exclusive=True).name == "Same-2.md"
+    # Re-writing identical bytes (a retry) finds its own file instead of a new name.
+    assert write_note(config, second, exclusive=True).name == "Same-2.md"
+    journal = config.vault_path / "Journal"
+    assert "First." in (journal / "Same.md").read_text()
+    assert sorted(p.name for p in journal.iterdir()) == ["Same-2.md", "Same.md"]
+
 def test_get_all_note_titles(config):
     titles = get_all_note_titles(config)
     assert "Root Note" in titles
@@ -124,3 +168,34 @@ def test_list_journal_notes_limit(journal_config):
 def test_list_journal_notes_missing_folder(journal_config):
     notes = list_journal_notes(journal_config, folder="NonExistent")
     assert notes == []
+
+
+def test_splice_frontmatter_rewrites_only_changed_keys(config, tmp_vault):
+    path = tmp_vault / "Spliced.md"
+    original = (
+        "---\ntype: meeting\ntags: [a, b]  # keep me\ncustom:\n  nested: 1\n---\n"
+        "Body line one\r\nTags: #x\n\n\nTrailing   spaces   \n"
+    )
+    path.write_bytes(original.encode())
+    written = splice_frontmatter(config, "Spliced.md", {"type": "journal", "date": "2026-03-01"}, drop_lines=["Tags: #x"])
+    data = path.read_bytes()
+    assert written == len(data)
+    assert data == (
+        b"---\ntype: journal\ntags: [a, b]  # keep me\ncustom:\n  nested: 1\ndate: '2026-03-01'\n---\n"
+        b"Body line one\r\n\n\nTrailing   spaces   \n"
+    )
+
+
+def test_splice_frontmatter_skips_identical_output(config, tmp_vault):
+    path = tmp_vault / "Root Note.md"
+    mtime = path.stat().st_mtime_ns
+    assert splice_frontmatter(config, "Root Note.md", {}) == 0
+    assert splice_frontmatter(config, "Root Note.md", {}, drop_lines=["not in the body"]) == 0
+    assert path.stat().st_mtime_ns == mtime
+
+
+def test_splice_frontmatter_adds_a_header(config, tmp_vault):
+    assert splice_frontmatter(config, "Daily Notes/2026-01-15.md", {"type": "daily"}) > 0
+    assert (tmp_vault / "Daily Notes" / "2026-01-15.md").read_text() == "---\ntype: daily\n---\n\nToday was good.\n"
+    assert read_note(config, "Daily Notes/2026-01-15.md").frontmatter.type == "daily"
+    assert not list(tmp_vault.rglob(".*.tmp"))
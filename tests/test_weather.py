@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from obsidian_journal.plan.weather import (
+    ForecastCache,
+    fetch_forecast,
+    fetch_weather,
+    find_outdoor_windows,
+    parse_forecast,
+    score_hours,
+)
+
+LAT, LON = 41.8781, -87.6298
+
+
+def _forecast(days: list[str]) -> dict:
+    return {
+        "daily": {
+            "time": days,
+            "temperature_2m_max": [72.0] * len(days),
+            "temperature_2m_min": [55.0] * len(days),
+            "precipitation_probability_max": [10] * len(days),
+            "weathercode": [1] * len(days),
+            "wind_speed_10m_max": [8.0] * len(days),
+            "sunrise": [f"{d}T06:45" for d in days],
+            "sunset": [f"{d}T19:10" for d in days],
+        },
+        "hourly": {
+            "time": [f"{d}T{h:02d}:00" for d in days for h in range(24)],
+            "temperature_2m": [68.0] * 24 * len(days),
+            "precipitation_probability": [5] * 24 * len(days),
+            "weathercode": [1] * 24 * len(days),
+        },
+    }
+
+
+class StandIn:
+    """Local Open-Meteo stand-in: counts requests and can be told to fail."""
+
+    def __init__(self) -> None:
+        self.days = ["2026-05-01", "2026-05-02", "2026-05-03"]
+        self.hits = 0
+        self.fail = False
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stand_in.hits += 1
+                if stand_in.fail:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                body = json.dumps(_forecast(stand_in.days)).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v1/forecast"
+        threading.Thread(
+            target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        ).start()
+
+
+@pytest.fixture
+def stand_in():
+    server = StandIn()
+    yield server
+    server.server.shutdown()
+    server.server.server_close()
+
+
+def test_no_cache_dir_always_requests(stand_in):
+    fetch_forecast(LAT, LON, url=stand_in.url)
+    fetch_forecast(LAT, LON, url=stand_in.url)
+    assert stand_in.hits == 2
+
+
+def test_fresh_cache_skips_network(stand_in, tmp_path):
+    for _ in range(3):
+        data = fetch_forecast(
+            LAT, LON, cache_dir=tmp_path, url=stand_in.url, today="2026-05-01"
+        )
+        assert data["daily"]["time"][0] == "2026-05-01"
+    assert stand_in.hits == 1
+
+
+def test_nearby_coordinates_share_an_entry(stand_in, tmp_path):
+    fetch_forecast(LAT, LON, cache_dir=tmp_path, url=stand_in.url, today="2026-05-01")
+    fetch_forecast(
+        LAT + 0.001, LON - 0.001, cache_dir=tmp_path, url=stand_in.url, today="2026-05-01"
+    )
+    assert stand_in.hits == 1
+
+
+def test_stale_entry_served_then_revalidated(stand_in, tmp_path):
+    fetch_forecast(LAT, LON, cache_dir=tmp_path, url=stand_in.url, today="2026-05-01")
+    before = ForecastCache(tmp_path).get(LAT, LON, "2026-05-01")["fetched_at"]
+
+    data = fetch_forecast(
+        LAT, LON, cache_dir=tmp_path, ttl=0, url=stand_in.url, today="2026-05-01"
+    )
+    assert data is not None  # served from cache without waiting
+
+    deadline = time.time() + 5
+    while stand_in.hits < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert stand_in.hits == 2
+    while time.time() < deadline:
+        entry = ForecastCache(tmp_path).get(LAT, LON, "2026-05-01")
+        if entry and entry["fetched_at"] > before:
+            break
+        time.sleep(0.01)
+    assert ForecastCache(tmp_path).get(LAT, LON, "2026-05-01")["fetched_at"] > before
+
+
+def test_offline_falls_back_to_last_good_forecast(stand_in, tmp_path):
+    fetch_forecast(LAT, LON, cache_dir=tmp_path, url=stand_in.url, today="2026-05-01")
+    stand_in.fail = True
+
+    weather = fetch_weather(
+        LAT, LON, date_str="2026-05-02", cache_dir=tmp_path, url=stand_in.url
+    )
+    # No entry keyed for today (fetch date is "now"), so the API was tried and failed.
+    assert stand_in.hits == 2
+    assert weather is not None
+    assert weather.sunrise == "06:45"
+
+
+def test_offline_without_cache_returns_none(stand_in, tmp_path):
+    stand_in.fail = True
+    assert fetch_weather(LAT, LON, cache_dir=tmp_path, url=stand_in.url) is None
+
+
+def test_forecast_not_covering_date_returns_none(stand_in, tmp_path):
+    weather = fetch_weather(
+        LAT, LON, date_str="2026-06-01", cache_dir=tmp_path, url=stand_in.url
+    )
+    assert weather is None
+
+
+def test_cache_prunes_old_entries(tmp_path):
+    cache = ForecastCache(tmp_path)
+    for day in range(1, 11):
+        cache.put(LAT, LON, f"2026-05-{day:02d}", {"daily": {}})
+    kept = sorted(p.name for p in cache.root.glob("*.json"))
+    assert len(kept) == 7
+    assert kept[-1].endswith("2026-05-10.json")
+    assert cache.latest(LAT, LON) is not None
+
+
+def _hourly(days: list[str], **overrides: dict[int, float]) -> dict:
+    """Benign hourly forecast; `overrides` maps column -> {hour index: value}."""
+    data = _forecast(days)["hourly"]
+    data["wind_speed_10m"] = [5.0] * len(data["time"])
+    for column, values in overrides.items():
+        for i, v in values.items():
+            data[column][i] = v
+    return data
+
+
+def test_score_hours_is_nan_outside_daylight():
+    scores = score_hours(_hourly(["2026-05-01"]))
+    assert len(scores) == 24
+    assert all(s != s for s in scores[:7])  # NaN before 07:00
+    assert all(s == s for s in scores[7:20])
+    assert all(s != s for s in scores[20:])
+
+
+def test_wind_and_weather_code_lower_the_score():
+    calm = score_hours(_hourly(["2026-05-01"]))[12]
+    windy = score_hours(_hourly(["2026-05-01"], wind_speed_10m={12: 30.0}))[12]
+    stormy = score_hours(_hourly(["2026-05-01"], weathercode={12: 95}))[12]
+    assert windy < calm
+    assert stormy < windy
+
+
+def test_windows_of_arbitrary_length_avoid_bad_hours():
+    rainy = {h: 90 for h in range(7, 12)}
+    windows = find_outdoor_windows(
+        _hourly(["2026-05-01"], precipitation_probability=rainy), hours=3, top_n=2
+    )
+    best, second = windows["2026-05-01"]
+    assert best.start == "12:00" and best.end == "15:00"
+    assert second.start == "15:00" and second.end == "18:00"  # no overlap with best
+    assert best.precipitation_chance == 5
+
+
+def test_windows_cover_every_forecast_day():
+    days = [f"2026-05-{d:02d}" for d in range(1, 8)]
+    # Make the afternoon of day 3 stormy.
+    storm = {2 * 24 + h: 95 for h in range(12, 20)}
+    windows = find_outdoor_windows(_hourly(days, weathercode=storm), hours=2, top_n=3)
+    assert sorted(windows) == days
+    assert all(len(w) == 3 for w in windows.values())
+    assert all(w.end <= "12:00" for w in windows["2026-05-03"][:2])
+    assert windows["2026-05-03"][2].condition == "thunderstorm"
+
+
+def test_window_longer_than_daylight_yields_nothing():
+    assert find_outdoor_windows(_hourly(["2026-05-01"]), hours=14) == {}
+
+
+def test_best_outdoor_window_fallbacks():
+    data = _forecast(["2026-05-01"])
+    data["hourly"] = {}
+    assert parse_forecast(data, "2026-05-01").best_outdoor_window == "midday (no hourly data available)"
+    hot = {h: 20.0 for h in range(24)}
+    data["hourly"] = _hourly(["2026-05-01"], temperature_2m=hot)
+    assert parse_forecast(data, "2026-05-01").best_outdoor_window == "07:00-08:00"
+    assert parse_forecast(data, "2026-05-01", window_hours=14).best_outdoor_window == "midday"
+
+
+def test_planning_another_day_reuses_cached_forecast(stand_in, tmp_path):
+    first = fetch_weather(
+        LAT, LON, date_str="2026-05-01", cache_dir=tmp_path, url=stand_in.url
+    )
+    later = fetch_weather(
+        LAT, LON, date_str="2026-05-03", cache_dir=tmp_path, url=stand_in.url, window_hours=2
+    )
+    assert stand_in.hits == 1
+    assert first.outdoor_windows[0].date == "2026-05-01"
+    assert later.outdoor_windows[0].date == "2026-05-03"
+    assert later.best_outdoor_window == later.outdoor_windows[0].label
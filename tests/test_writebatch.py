@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import json
+import os
+
+import pytest
+from typer.testing import CliRunner
+
+from obsidian_journal import cli, writebatch
+from obsidian_journal.config import Config
+from obsidian_journal.writebatch import WriteBatch
+
+
+@pytest.fixture
+def config(tmp_path):
+    vault = tmp_path / "vault"
+    (vault / "Journal").mkdir(parents=True)
+    (vault / "Journal" / "a.md").write_text("old a\n")
+    (vault / "b.md").write_text("old b\n")
+    return Config(vault_path=vault, anthropic_api_key="test-key", data_dir=tmp_path / "data")
+
+
+def _files(root):
+    return sorted(str(p.relative_to(root)) for p in root.rglob("*") if p.is_file())
+
+
+def _snapshot(config):
+    return {p: (config.vault_path / p).read_bytes() for p in _files(config.vault_path)}
+
+
+def test_batch_commits_writes_and_moves(config):
+    with WriteBatch(config, workers=2) as batch:
+        batch.write("Journal/a.md", b"new a\n")
+        batch.write("Journal/c.md", lambda f: f.write(b"streamed c\n"))
+        batch.move("b.md", "Projects/b.md")
+    vault = config.vault_path
+    assert batch.bytes_written == len(b"new a\n") + len(b"streamed c\n")
+    assert (vault / "Journal" / "a.md").read_text() == "new a\n"
+    assert (vault / "Journal" / "c.md").read_text() == "streamed c\n"
+    assert (vault / "Projects" / "b.md").read_text() == "old b\n"
+    # No temp files, backups or manifest left behind.
+    assert _files(vault) == ["Journal/a.md", "Journal/c.md", "Projects/b.md"]
+    assert writebatch.pending(config) == []
+
+
+def test_failed_staging_leaves_the_vault_untouched(config):
+    before = _snapshot(config)
+
+    def broken(f):
+        f.write(b"partial")
+        raise OSError("disk full")
+
+    with pytest.raises(OSError, match="disk full"):
+        with WriteBatch(config) as batch:
+            batch.write("Journal/a.md", b"new a\n")
+            batch.write("b.md", broken)
+    assert _snapshot(config) == before
+    assert writebatch.pending(config) == []
+
+
+def test_move_onto_existing_note_fails_before_anything_lands(config):
+    with pytest.raises(FileExistsError):
+        with WriteBatch(config) as batch:
+            batch.write("Journal/c.md", b"new c\n")
+            batch.move("b.md", "Journal/a.md")
+    assert (config.vault_path / "b.md").read_text() == "old b\n"
+    assert not (config.vault_path / "Journal" / "c.md").exists()
+
+
+def _interrupted(config, monkeypatch):
+    """Commit a batch that dies after its first rename."""
+    real_replace = os.replace
+    calls = []
+
+    def flaky_replace(src, dst):
+        if str(dst).startswith(str(config.vault_path)):
+            if calls:
+                raise OSError("power cut")
+            calls.append(dst)
+        real_replace(src, dst)
+
+    monkeypatch.setattr(writebatch.os, "replace", flaky_replace)
+    with pytest.raises(OSError, match="power cut"):
+        with WriteBatch(config, workers=1) as batch:
+            batch.write("Journal/a.md", b"new a\n")
+            batch.write("b.md", b"new b\n")
+            batch.write("Journal/c.md", b"new c\n")
+    monkeypatch.setattr(writebatch.os, "replace", real_replace)
+    [manifest] = writebatch.pending(config)
+    return manifest
+
+
+def test_interrupted_batch_resumes(config, monkeypatch):
+    manifest = _interrupted(config, monkeypatch)
+    assert (config.vault_path / "Journal" / "a.md").read_text() == "new a\n"
+    assert (config.vault_path / "b.md").read_text() == "old b\n"
+
+    result = writebatch.recover(config, manifest)
+    assert result["action"] == "resume" and result["ops"] == 3
+    assert _snapshot(config) == {
+        "Journal/a.md": b"new a\n",
+        "Journal/c.md": b"new c\n",
+        "b.md": b"new b\n",
+    }
+    assert writebatch.pending(config) == []
+
+
+def test_interrupted_batch_rolls_back(config, monkeypatch):
+    before = _snapshot(config)
+    manifest = _interrupted(config, monkeypatch)
+    writebatch.recover(config, manifest, rollback=True)
+    assert _snapshot(config) == before
+
+
+def test_rollback_undoes_moves(config):
+    with WriteBatch(config) as batch:
+        batch.move("b.md", "Projects/b.md")
+        ops = batch.ops
+    writebatch._rollback(config, ops)
+    assert (config.vault_path / "b.md").read_text() == "old b\n"
+    assert not (config.vault_path / "Projects" / "b.md").exists()
+
+
+@pytest.mark.parametrize("policy", writebatch.FSYNC_POLICIES)
+def test_fsync_policies(config, policy):
+    with WriteBatch(config, fsync=policy) as batch:
+        batch.write("Journal/a.md", b"synced\n")
+    assert (config.vault_path / "Journal" / "a.md").read_text() == "synced\n"
+
+
+def test_unknown_fsync_policy(config):
+    with pytest.raises(ValueError):
+        WriteBatch(config, fsync="sometimes")
+
+
+def test_cli_refuses_apply_until_recovered(config, monkeypatch):
+    manifest = _interrupted(config, monkeypatch)
+    monkeypatch.setenv("OBSIDIAN_VAULT_PATH", str(config.vault_path))
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setenv("OJ_DATA_DIR", str(config.data_dir))
+    monkeypatch.setenv("OJ_METRICS", "0")
+    cli.json_mode = False
+    runner = CliRunner()
+
+    result = runner.invoke(cli.app, ["--json", "organize", "frontmatter", "--apply"])
+    assert result.exit_code == 1
+    assert "oj organize recover" in json.loads(result.stdout)["error"]
+
+    result = runner.invoke(cli.app, ["--json", "organize", "recover", "--rollback"])
+    assert json.loads(result.stdout)["batches"] == [
+        {"id": manifest.stem, "action": "rollback", "ops": 3}
+    ]
+    result = runner.invoke(cli.app, ["--json", "organize", "frontmatter", "--apply", "--fsync", "none"])
+    assert result.exit_code == 0
+
+
+def _cli(config, monkeypatch, *args):
+    monkeypatch.setenv("OBSIDIAN_VAULT_PATH", str(config.vault_path))
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setenv("OJ_DATA_DIR", str(config.data_dir))
+    monkeypatch.setenv("OJ_CACHE_DIR", str(config.data_dir / "cache"))
+    monkeypatch.setenv("OJ_METRICS", "0")
+    cli.json_mode = False
+    return CliRunner().invoke(cli.app, list(args))
+
+
+def test_cli_reports_a_move_onto_an_existing_note(config, monkeypatch):
+    vault = config.vault_path
+    (vault / "Guide.md").write_text("A setup guide on how to install things.\n")
+    (vault / "Documentation").mkdir()
+    (vault / "Documentation" / "Guide.md").write_text("already here\n")
+
+    result = _cli(config, monkeypatch, "--json", "organize", "structure", "--apply")
+    assert result.exit_code == 1
+    error = json.loads(result.stdout)["error"]
+    assert "Documentation/Guide.md already exists" in error and "no changes were made" in error
+    assert (vault / "Guide.md").exists()
+    assert (vault / "Documentation" / "Guide.md").read_text() == "already here\n"
+
+    result = _cli(config, monkeypatch, "organize", "structure", "--apply")
+    assert result.exit_code == 1
+    assert "Traceback" not in result.output and "already exists" in result.output
+
+
+def test_cli_reports_write_conflicts(config, monkeypatch):
+    def conflict(*args, **kwargs):
+        raise writebatch.WriteConflict(["Journal/a.md"])
+
+    monkeypatch.setattr("obsidian_journal.organize.frontmatter.apply_frontmatter", conflict)
+    result = _cli(config, monkeypatch, "--json", "organize", "frontmatter", "--apply")
+    assert result.exit_code == 1
+    assert "changed by another process since staging: Journal/a.md" in json.loads(result.stdout)["error"]